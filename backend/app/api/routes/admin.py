@@ -0,0 +1,78 @@
+import hmac
+import os
+
+import pandas as pd
+from fastapi import APIRouter, Header
+from pydantic import BaseModel
+from app.core.jobs import run_in_pool, submit_job
+from app.core.segments import ingest_batch, list_segments, merge_candidates, merge_segments, read_manifest
+
+router = APIRouter()
+
+# Token που απαιτείται (κεφαλίδα X-Admin-Token) για τα endpoints διαχείρισης·
+# αν δεν έχει οριστεί, η εισαγωγή μέσω API είναι απενεργοποιημένη
+ADMIN_TOKEN = os.environ.get("PARLIAMENT_ADMIN_TOKEN")
+
+# Μέγιστο πλήθος ομιλιών ανά αίτημα εισαγωγής (μεγαλύτερες παρτίδες μέσω της εντολής ingest)
+MAX_INGEST_SPEECHES = 50_000
+
+class SpeechRecord(BaseModel):
+    speech: str
+    member_name: str
+    political_party: str
+    sitting_date: str
+
+class IngestRequest(BaseModel):
+    speeches: list[SpeechRecord]
+
+def authorized(token: str | None) -> bool:
+    return bool(ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, ADMIN_TOKEN)
+
+def ingest_records(records: list[dict]) -> dict:
+    """
+    Εισαγωγή παρτίδας ως segment (εκτελείται στο process pool).
+
+    """
+    return ingest_batch(pd.DataFrame.from_records(records), workers=1)
+
+@router.post("/ingest")
+async def ingest(request: IngestRequest, x_admin_token: str | None = Header(None)):
+    """
+    Εισαγωγή νέων ομιλιών (στήλες του dataset, sitting_date ως dd/mm/yyyy) χωρίς επανεκκίνηση.
+
+    1. Κανονικοποιεί μόνο τις νέες ομιλίες και τις αποθηκεύει ως νέο αμετάβλητο segment
+    2. Το segment είναι αμέσως διαθέσιμο στην αναζήτηση, στις ομιλίες και στα timelines
+    3. Αν συσσωρευτούν αρκετά μικρά segments, υποβάλλει εργασία συγχώνευσης (merge_job)
+
+    """
+    if not authorized(x_admin_token):
+        return {"error": "Forbidden"}
+    if not request.speeches:
+        return {"error": "No speeches"}
+    if len(request.speeches) > MAX_INGEST_SPEECHES:
+        return {"error": f"At most {MAX_INGEST_SPEECHES} speeches per request"}
+
+    result = await run_in_pool(ingest_records, [s.model_dump() for s in request.speeches])
+    if "error" not in result and merge_candidates(read_manifest()):
+        result["merge_job"] = submit_job("merge_segments", merge_segments)["job_id"]
+    return result
+
+@router.get("/segments")
+async def segments(x_admin_token: str | None = Header(None)):
+    """
+    Τα ενεργά segments (ομιλίες, εύρος speech_ids, νέοι όροι) και η τρέχουσα γενιά.
+
+    """
+    if not authorized(x_admin_token):
+        return {"error": "Forbidden"}
+    return list_segments()
+
+@router.post("/merge")
+async def merge(x_admin_token: str | None = Header(None)):
+    """
+    Συγχώνευση όλων των ενεργών segments σε ένα, στο παρασκήνιο (επιστρέφει job id).
+
+    """
+    if not authorized(x_admin_token):
+        return {"error": "Forbidden"}
+    return submit_job("merge_segments", merge_segments, names=read_manifest()["segments"])
@@ -1,101 +1,176 @@
+from datetime import date
 from fastapi import APIRouter, Query
-import pandas as pd
-from collections import Counter
-from app.core.text_cleaner import normalize, remove_stopwords
-from app.core.data_loader import load_df
+from app.core.segments import get_live_corpus
+from app.core.jobs import dispatch
+from app.core.metrics import stage
+from app.core.distinctive import METHODS, MIN_COUNT, distinctive_terms as compute_distinctive_terms
+from app.core.topic_evolution import N_TOPICS, TOP_TERMS, get_topic_evolution
 
 router = APIRouter()
 
-def extract_keywords(text: str, top_n: int = 10):
+# Τελευταίο έτος που δέχονται τα φίλτρα (οι νέες συνεδριάσεις εισάγονται ως segments)
+LAST_YEAR = date.today().year
+
+def compute_topic_drift(start_year: int, end_year: int, top_n: int):
     """
-    Εξαγωγή κορυφαίων λέξεων-κλειδιών από κείμενο.
-    
-    1. Κανονικοποιεί και αφαιρεί stopwords
-    2. Φιλτράρει λέξεις με λιγότερα από 3 γράμματα
-    3. Μετράει συχνότητα κάθε λέξης
-    4. Επιστρέφει τις top_n πιο συχνές λέξεις
-    
+    Υπολογισμός του topic drift (εκτελείται στο process pool).
+
     """
-    text = remove_stopwords(normalize(text))
-    words = [w for w in text.split() if len(w) > 2]
-    return [w for w, _ in Counter(words).most_common(top_n)]
+    live = get_live_corpus()
+    cube = live.cube("party")
+    with stage("cube"):
+        groups = cube.by_year(cube.rows(start_year=start_year, end_year=end_year))
+    with stage("top_terms"):
+        timeline = [{"year": year, "topics": live.top_terms(counts, top_n)} for year, counts, _ in groups]
+    
+    return {
+        "analysis": "topic_drift",
+        "period": f"{start_year}-{end_year}",
+        "timeline": timeline
+    }
 
 @router.get("/topic-drift")
 async def topic_drift(
-    start_year: int = Query(1989, ge=1989, le=2020),
-    end_year: int = Query(2020, ge=1989, le=2020),
-    top_n: int = Query(8, ge=1, le=20)
+    start_year: int = Query(1989, ge=1989, le=LAST_YEAR),
+    end_year: int = Query(2020, ge=1989, le=LAST_YEAR),
+    top_n: int = Query(8, ge=1, le=20),
+    background: bool = Query(False)
 ):
     """
     Ανάλυση εξέλιξης θεμάτων κατά τη διάρκεια των χρόνων (Topic Drift).
     
-    1. Φορτώνει ομιλίες του κοινοβουλίου
-    2. Εξαγωγή έτους από ημερομηνία κάθε ομιλίας
-    3. Φιλτράρει ομιλίες για το χρονικό διάστημα [start_year, end_year]
-    4. Ομαδοποιεί ομιλίες ανά έτος
-    5. Για κάθε έτος: συνδυάζει όλες τις ομιλίες και εξάγει κορυφαίες λέξεις-κλειδιά
-    6. Δημιουργεί χρονολογικό πίνακα θεμάτων δείχνοντας πώς εξελίχθησαν τα θέματα
+    1. Επιλέγει τις γραμμές (έτος, κόμμα) του κύβου συχνοτήτων για το διάστημα [start_year, end_year]
+    2. Ομαδοποιεί τις γραμμές ανά έτος
+    3. Για κάθε έτος: αθροίζει τις συχνότητες όρων και εξάγει κορυφαίες λέξεις-κλειδιά (top-k)
+    4. Δημιουργεί χρονολογικό πίνακα θεμάτων δείχνοντας πώς εξελίχθησαν τα θέματα
+
+    Ο υπολογισμός εκτελείται στο process pool· με background=true επιστρέφεται
+    αμέσως job id και το αποτέλεσμα λαμβάνεται από το /api/jobs/{job_id}.
 
     """
     if start_year > end_year:
         return {"error": "start_year must be <= end_year"}
     
-    df = load_df()
-    df = df.dropna(subset=["speech", "sitting_date"]).copy()
-    
-    df["year"] = pd.to_datetime(df["sitting_date"], dayfirst=True, errors="coerce").dt.year
-    df = df[df["year"].between(start_year, end_year)]
-    
-    timeline = []
-    for year in sorted(df["year"].unique()):
-        year_data = df[df["year"] == year]
-        text = " ".join(year_data["speech"].astype(str).tolist())
-        keywords = extract_keywords(text, top_n)
-        timeline.append({"year": int(year), "topics": keywords})
-    
+    return await dispatch(
+        "topic_drift", compute_topic_drift, background,
+        start_year=start_year, end_year=end_year, top_n=top_n,
+    )
+
+@router.get("/topic-evolution")
+async def topic_evolution(
+    start_year: int = Query(1989, ge=1989, le=LAST_YEAR),
+    end_year: int = Query(2020, ge=1989, le=LAST_YEAR),
+    n_topics: int = Query(10, ge=1, le=N_TOPICS),
+    topic_id: int | None = Query(None, ge=0, lt=N_TOPICS),
+    top_terms: int = Query(10, ge=1, le=TOP_TERMS)
+):
+    """
+    Εξέλιξη των θεμάτων LSI ανά έτος από το προϋπολογισμένο χρονικά τμηματοποιημένο μοντέλο.
+
+    1. Φορτώνει τα θέματα κάθε έτους, ευθυγραμμισμένα με τα θέματα του LSI του corpus
+       (python -m app.core.build evolution)
+    2. Επιλέγει τα έτη του διαστήματος [start_year, end_year] και τα πρώτα n_topics θέματα
+       (ή μόνο το topic_id)
+    3. Για κάθε θέμα και έτος επιστρέφει την ισχύ του (ποσοστό διακύμανσης του έτους), πόσο
+       καλά αντιστοιχεί στο θέμα του corpus (alignment), την ομοιότητα με το προηγούμενο
+       έτος (drift) και τους κορυφαίους όρους
+
+    """
+    if start_year > end_year:
+        return {"error": "start_year must be <= end_year"}
+
+    with stage("topic_evolution"):
+        model = get_topic_evolution()
+        if topic_id is not None:
+            if topic_id >= model.n_topics:
+                return {"error": f"topic_id must be < {model.n_topics}"}
+            topic_ids = [topic_id]
+        else:
+            topic_ids = range(min(n_topics, model.n_topics))
+        topics = model.timeline(topic_ids, start_year, end_year, top_terms)
+
     return {
-        "analysis": "topic_drift",
+        "analysis": "topic_evolution",
         "period": f"{start_year}-{end_year}",
-        "timeline": timeline
+        "topics": topics
     }
 
+@router.get("/distinctive-terms")
+async def distinctive_terms(
+    method: str = Query("log_likelihood", pattern=f"^({'|'.join(METHODS)})$"),
+    start_year: int = Query(1989, ge=1989, le=LAST_YEAR),
+    end_year: int = Query(2020, ge=1989, le=LAST_YEAR),
+    party: str | None = Query(None, min_length=2),
+    member: str | None = Query(None, min_length=2),
+    ref_start_year: int | None = Query(None, ge=1989, le=LAST_YEAR),
+    ref_end_year: int | None = Query(None, ge=1989, le=LAST_YEAR),
+    ref_party: str | None = Query(None, min_length=2),
+    ref_member: str | None = Query(None, min_length=2),
+    top_n: int = Query(20, ge=1, le=100),
+    min_count: int = Query(MIN_COUNT, ge=1)
+):
+    """
+    Χαρακτηριστικοί όροι ενός τμήματος του corpus σε σύγκριση με ένα άλλο.
+
+    1. Το τμήμα είναι το διάστημα [start_year, end_year], προαιρετικά μόνο για ένα κόμμα
+       ή ένα μέλος· το τμήμα σύγκρισης ορίζεται με τις παραμέτρους ref_* (τα έτη του
+       είναι αυτά του τμήματος αν δεν δοθούν)
+    2. Χωρίς ref_*, η σύγκριση γίνεται με το υπόλοιπο corpus (π.χ. κόμμα έναντι των
+       υπόλοιπων κομμάτων του διαστήματος, ή ένα διάστημα έναντι των υπόλοιπων ετών)
+    3. Οι συχνότητες των τμημάτων αθροίζονται από τον κύβο συχνοτήτων και το score
+       (log_likelihood, log_odds ή tfidf) υπολογίζεται για όλο το λεξιλόγιο μαζί
+    4. Επιστρέφει τους χαρακτηριστικούς όρους κάθε πλευράς με το score και τις
+       συχνότητές τους (και ανά εκατομμύριο όρους)
+
+    Παραδείγματα: έτος με έτος (start_year=end_year=2008, ref_start_year=ref_end_year=2020),
+    κόμμα έναντι υπολοίπων (party=...), μέλος έναντι του κόμματός του (member=..., ref_party=...).
+
+    """
+    if start_year > end_year:
+        return {"error": "start_year must be <= end_year"}
+    if (party and member) or (ref_party and ref_member):
+        return {"error": "Use either party or member for each slice"}
+
+    target = {"party": party, "member": member, "start_year": start_year, "end_year": end_year}
+    reference = None
+    if any(value is not None for value in (ref_start_year, ref_end_year, ref_party, ref_member)):
+        reference = {
+            "party": ref_party,
+            "member": ref_member,
+            "start_year": start_year if ref_start_year is None else ref_start_year,
+            "end_year": end_year if ref_end_year is None else ref_end_year,
+        }
+        if reference["start_year"] > reference["end_year"]:
+            return {"error": "ref_start_year must be <= ref_end_year"}
+
+    return compute_distinctive_terms(target, reference, method, top_n, min_count)
+
 @router.get("/topic-drift-by-party")
 async def topic_drift_by_party(
     party: str = Query(..., min_length=2),
-    start_year: int = Query(1989, ge=1989, le=2020),
-    end_year: int = Query(2020, ge=1989, le=2020),
+    start_year: int = Query(1989, ge=1989, le=LAST_YEAR),
+    end_year: int = Query(2020, ge=1989, le=LAST_YEAR),
     top_n: int = Query(8, ge=1, le=20)
 ):
     """
     Ανάλυση εξέλιξης θεμάτων ενός συγκεκριμένου κόμματος κατά τη διάρκεια των χρόνων.
     
-    1. Φορτώνει ομιλίες του κοινοβουλίου
-    2. Φιλτράρει ομιλίες του συγκεκριμένου κόμματος
-    3. Εξαγωγή έτους από ημερομηνία κάθε ομιλίας
-    4. Φιλτράρει για το χρονικό διάστημα [start_year, end_year]
-    5. Ομαδοποιεί ομιλίες ανά έτος
-    6. Για κάθε έτος: εξάγει κορυφαίες λέξεις-κλειδιά του κόμματος
-    7. Δείχνει πώς μεταβλήθησε η εστίαση του κόμματος χρονικά
+    1. Επιλέγει τις γραμμές (έτος, κόμμα) του κύβου συχνοτήτων που αντιστοιχούν στο κόμμα
+    2. Φιλτράρει για το χρονικό διάστημα [start_year, end_year]
+    3. Ομαδοποιεί τις γραμμές ανά έτος
+    4. Για κάθε έτος: εξάγει κορυφαίες λέξεις-κλειδιά του κόμματος
+    5. Δείχνει πώς μεταβλήθησε η εστίαση του κόμματος χρονικά
 
     """
     if start_year > end_year:
         return {"error": "start_year must be <= end_year"}
     
-    df = load_df()
-    df = df.dropna(subset=["speech", "political_party", "sitting_date"]).copy()
-    
-    mask = df["political_party"].astype(str).str.contains(party, case=False, na=False)
-    df = df[mask].copy()
-    
-    df["year"] = pd.to_datetime(df["sitting_date"], dayfirst=True, errors="coerce").dt.year
-    df = df[df["year"].between(start_year, end_year)]
-    
-    timeline = []
-    for year in sorted(df["year"].unique()):
-        year_data = df[df["year"] == year]
-        text = " ".join(year_data["speech"].astype(str).tolist())
-        keywords = extract_keywords(text, top_n)
-        timeline.append({"year": int(year), "topics": keywords})
+    live = get_live_corpus()
+    cube = live.cube("party")
+    with stage("cube"):
+        groups = cube.by_year(cube.rows(cube.match(party), start_year, end_year))
+    with stage("top_terms"):
+        timeline = [{"year": year, "topics": live.top_terms(counts, top_n)} for year, counts, _ in groups]
     
     return {
         "analysis": "party_topic_drift",
@@ -106,36 +181,35 @@ async def topic_drift_by_party(
 
 @router.get("/topic-comparison")
 async def topic_comparison(
-    year1: int = Query(2008, ge=1989, le=2020),
-    year2: int = Query(2020, ge=1989, le=2020),
+    year1: int = Query(2008, ge=1989, le=LAST_YEAR),
+    year2: int = Query(2020, ge=1989, le=LAST_YEAR),
     top_n: int = Query(10, ge=1, le=20)
 ):
     """
     Σύγκριση θεμάτων ανάμεσα σε δύο διαφορετικά έτη.
     
     Διαδικασία:
-    1. Φορτώνει ομιλίες του κοινοβουλίου
-    2. Για κάθε ένα από τα δύο έτη:
-       - Φιλτράρει ομιλίες του έτους
-       - Συνδυάζει όλες τις ομιλίες
+    1. Για κάθε ένα από τα δύο έτη:
+       - Αθροίζει τις γραμμές του κύβου συχνοτήτων για το έτος
        - Εξάγει κορυφαίες λέξεις-κλειδιά
        - Καταγράφει το αριθμό ομιλιών του έτους
-    3. Δείχνει πώς διαφέρουν τα θέματα ανάμεσα στα δύο έτη
+    2. Δείχνει πώς διαφέρουν τα θέματα ανάμεσα στα δύο έτη
 
     """
-    df = load_df()
-    df = df.dropna(subset=["speech", "sitting_date"]).copy()
-    
-    df["year"] = pd.to_datetime(df["sitting_date"], dayfirst=True, errors="coerce").dt.year
+    live = get_live_corpus()
+    cube = live.cube("party")
     
     results = {}
     for year in [year1, year2]:
-        year_data = df[df["year"] == year]
-        if len(year_data) > 0:
-            text = " ".join(year_data["speech"].astype(str).tolist())
+        with stage("cube"):
+            timeline = cube.by_year(cube.rows(start_year=year, end_year=year))
+        if timeline:
+            _, counts, speech_count = timeline[0]
+            with stage("top_terms"):
+                topics = live.top_terms(counts, top_n)
             results[year] = {
-                "topics": extract_keywords(text, top_n),
-                "speech_count": len(year_data)
+                "topics": topics,
+                "speech_count": speech_count
             }
         else:
             results[year] = {"error": "No data for this year"}
@@ -1,50 +1,41 @@
 from fastapi import APIRouter, Query
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import TfidfTransformer
 from sklearn.cluster import KMeans
-from app.core.text_cleaner import normalize, remove_stopwords
-from app.core.data_loader import load_df
+from app.core.data_loader import speech_results
+from app.core.token_store import get_token_store
+from app.core.clusters import get_clusters
+from app.core.doc_store import get_doc_store
+from app.core.jobs import dispatch
+from app.core.sampling import ALLOCATIONS, STRATIFICATIONS, draw_sample, sample_params_error
+from app.core.metrics import stage
 
 router = APIRouter()
 
-def preprocess(text: str) -> str:
-    """
-    Προ-επεξεργασία κειμένου για ομαδοποίηση (clustering).
-    
-    1. Κανονικοποιεί το κείμενο (πεζά γράμματα, αφαίρεση διακριτικών)
-    2. Αφαιρεί stopwords
-    
-    """
-    return remove_stopwords(normalize(text))
+# Πλήθος ομάδων του K-Means στο δείγμα όταν δεν δίνεται n_clusters
+SAMPLE_CLUSTERS = 5
 
-@router.get("/groups")
-async def cluster_speeches(
-    sample_size: int = Query(500, ge=100, le=2000),
-    n_clusters: int = Query(5, ge=2, le=20),
-    top_terms: int = Query(8, ge=3, le=20)
-):
+def compute_clusters(sample_size: int, n_clusters: int, top_terms: int, seed: int | None = None,
+                     stratify_by: str | None = None, year_range: str | None = None,
+                     party: str | None = None, allocation: str | None = None):
     """
-    Ομαδοποίηση ομιλιών χρησιμοποιώντας K-Means clustering αλγόριθμο.
-    
-    1. Φόρτωση δεδομένων και δημιουργία δείγματος ομιλιών
-    2. Προ-επεξεργασία κειμένων (κανονικοποίηση, αφαίρεση stopwords)
-    3. TF-IDF Vectorization: Μετατροπή κειμένων σε αριθμητικά διανύσματα
-    4. K-Means: Ομαδοποίηση σε n_clusters ομάδες με βάσει τη συνάφεια περιεχομένου
-    5. Εξαγωγή κορυφαίων όρων για κάθε ομάδα
+    Υπολογισμός ομάδων K-Means (εκτελείται στο process pool).
 
     """
-    df = load_df()
-    df = df.dropna(subset=["speech"])
-    df = df.head(sample_size)
-
-    docs = df["speech"].astype(str).apply(preprocess).tolist()
+    store = get_token_store()
+    with stage("sample"):
+        doc_ids, sample = draw_sample(sample_size, seed, stratify_by, year_range, party, allocation)
+    if len(doc_ids) <= n_clusters:
+        return {"error": "Not enough speeches match the sample filters", "sample": sample}
 
-    vectorizer = TfidfVectorizer()
-    X = vectorizer.fit_transform(docs)
+    with stage("tfidf"):
+        counts, term_ids = store.count_matrix(doc_ids)
+        X = TfidfTransformer().fit_transform(counts)
 
-    kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto")
-    labels = kmeans.fit_predict(X)
+    with stage("kmeans"):
+        kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init="auto")
+        labels = kmeans.fit_predict(X)
 
-    terms = vectorizer.get_feature_names_out()
+    terms = [store.vocab[j] for j in term_ids]
     cluster_terms = []
     for i in range(n_clusters):
         center = kmeans.cluster_centers_[i]
@@ -57,6 +48,129 @@ async def cluster_speeches(
 
     return {
         "sample_size": sample_size,
+        "sample": sample,
         "n_clusters": n_clusters,
         "clusters": cluster_terms
-    }
\ No newline at end of file
+    }
+
+@router.get("/groups")
+async def cluster_speeches(
+    sample_size: int | None = Query(None, ge=100, le=2000),
+    n_clusters: int | None = Query(None, ge=2, le=20),
+    top_terms: int = Query(8, ge=3, le=20),
+    seed: int | None = Query(None, ge=0),
+    stratify_by: str | None = Query(None, pattern=f"^({'|'.join(STRATIFICATIONS)})$"),
+    allocation: str | None = Query(None, pattern=f"^({'|'.join(ALLOCATIONS)})$"),
+    year_range: str | None = Query(None, pattern=r"^\d{4}(-\d{4})?$"),
+    party: str | None = Query(None, min_length=2),
+    background: bool = Query(False)
+):
+    """
+    Ομαδοποίηση ομιλιών χρησιμοποιώντας K-Means clustering αλγόριθμο.
+
+    Χωρίς sample_size, οι ομάδες προέρχονται από την προϋπολογισμένη ομαδοποίηση
+    ολόκληρου του corpus (MiniBatch K-Means, σταθερό πλήθος ομάδων· διαφορετικό n_clusters
+    και οι παράμετροι του δείγματος απορρίπτονται). Με sample_size (n_clusters, προεπιλογή 5):
+    
+    1. Δείγμα sample_size ομιλιών από το ευρετήριο δειγματοληψίας (στρώματα έτος × κόμμα):
+       τυχαίο με το seed (ίδιο seed, ίδιο δείγμα), με προαιρετικά φίλτρα year_range
+       ("2000-2010") και party, στρωματοποιημένο κατά stratify_by (year, party, year_party)
+       με κατανομή ανάλογη του μεγέθους των στρωμάτων ή ίση (allocation=equal)
+    2. Ανάγνωση των ήδη προ-επεξεργασμένων όρων από το tokenized corpus
+    3. TF-IDF: Μετατροπή των συχνοτήτων όρων σε αριθμητικά διανύσματα
+    4. K-Means: Ομαδοποίηση σε n_clusters ομάδες με βάσει τη συνάφεια περιεχομένου
+    5. Εξαγωγή κορυφαίων όρων για κάθε ομάδα
+
+    Ο υπολογισμός στο δείγμα εκτελείται στο process pool· με background=true επιστρέφεται
+    αμέσως job id και το αποτέλεσμα λαμβάνεται από το /api/jobs/{job_id}.
+
+    """
+    error = sample_params_error(sample_size, seed, stratify_by, allocation, year_range, party)
+    if error:
+        return {"error": error}
+
+    if sample_size is None:
+        model = get_clusters()
+        if n_clusters is not None and n_clusters != model.n_clusters:
+            return {"error": f"The precomputed clustering has {model.n_clusters} clusters; use sample_size for a different n_clusters"}
+        with stage("clusters"):
+            clusters = model.clusters(top_terms)
+        return {
+            "sample_size": None,
+            "n_docs": model.n_docs,
+            "n_clusters": model.n_clusters,
+            "clusters": clusters
+        }
+
+    return await dispatch(
+        "cluster_speeches", compute_clusters, background,
+        sample_size=sample_size, n_clusters=n_clusters or SAMPLE_CLUSTERS, top_terms=top_terms,
+        seed=seed, stratify_by=stratify_by, year_range=year_range, party=party, allocation=allocation,
+    )
+
+@router.get("/timeline")
+async def cluster_timeline(
+    start_year: int | None = Query(None),
+    end_year: int | None = Query(None)
+):
+    """
+    Μέγεθος κάθε ομάδας της ομαδοποίησης του corpus ανά έτος.
+
+    Απαντάται από τους προϋπολογισμένους πίνακες (πλήθος ομιλιών ανά έτος και ομάδα),
+    χωρίς ανάγνωση των ομιλιών.
+
+    """
+    with stage("clusters"):
+        model = get_clusters()
+        years, year_sizes = model.timeline(start_year, end_year)
+    return {
+        "n_clusters": model.n_clusters,
+        "timeline": [
+            {"year": int(year), "n_docs": int(sizes.sum()), "sizes": sizes.tolist()}
+            for year, sizes in zip(years, year_sizes)
+        ]
+    }
+
+@router.get("/speech/{speech_id}")
+async def speech_cluster(
+    speech_id: int,
+    top_terms: int = Query(8, ge=3, le=20)
+):
+    """
+    Η ομάδα στην οποία ανήκει μια ομιλία, η cosine similarity με το κέντρο της και οι κορυφαίοι όροι της ομάδας.
+
+    """
+    model = get_clusters()
+    doc_id = int(get_doc_store().doc_ids([speech_id])[0])
+    if doc_id < 0:
+        return {"error": "Speech not found"}
+
+    cluster_id = int(model.labels[doc_id])
+    return {
+        "speech_id": speech_id,
+        "cluster_id": cluster_id,
+        "similarity": round(float(model.similarities[doc_id]), 4),
+        "terms": model.terms(cluster_id, top_terms)
+    }
+
+@router.get("/groups/{cluster_id}/speeches")
+async def cluster_members(
+    cluster_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """
+    Οι ομιλίες μιας ομάδας, ταξινομημένες κατά similarity με το κέντρο (οι πιο αντιπροσωπευτικές πρώτες).
+
+    """
+    model = get_clusters()
+    if cluster_id >= model.n_clusters or cluster_id < 0:
+        return {"error": "Cluster not found"}
+
+    doc_ids, similarities = model.members(cluster_id, offset, limit)
+    return {
+        "cluster_id": cluster_id,
+        "size": int(model.sizes()[cluster_id]),
+        "offset": offset,
+        "results": speech_results(doc_ids, similarities)
+    }
@@ -0,0 +1,94 @@
+from fastapi import APIRouter, Query
+from app.core.data_loader import speech_results
+from app.core.duplicates import DUPLICATE_THRESHOLD, LSH_THRESHOLD, document_signature, get_duplicate_index
+from app.core.segments import get_live_corpus
+from app.core.metrics import stage
+
+router = APIRouter()
+
+@router.get("/speech/{speech_id}")
+async def speech_duplicates(
+    speech_id: int,
+    limit: int = Query(10, ge=1, le=100),
+    min_similarity: float = Query(DUPLICATE_THRESHOLD, ge=LSH_THRESHOLD, le=1.0)
+):
+    """
+    Σχεδόν διπλότυπα μιας ομιλίας (MinHash / LSH).
+
+    1. Υπολογίζει την υπογραφή MinHash της ομιλίας από τα shingles της ροής όρων της
+    2. Βρίσκει στους κάδους LSH τις ομιλίες που μοιράζονται τουλάχιστον μία ζώνη
+    3. Επιστρέφει όσες έχουν εκτιμώμενη ομοιότητα Jaccard τουλάχιστον min_similarity,
+       κατά φθίνουσα ομοιότητα (οι ομιλίες των segments συγκρίνονται με το βασικό corpus)
+
+    Το min_similarity δεν μπορεί να είναι κάτω από το κατώφλι του LSH (≈ 0.77): πιο χαμηλά
+    οι κάδοι βρίσκουν μόνο ένα τυχαίο μέρος των ζευγών. Κοντά στο κατώφλι η ανάκληση είναι
+    επίσης μικρότερη από ό,τι πάνω από 0.8.
+
+    """
+    live = get_live_corpus()
+    doc_id = int(live.doc_ids([speech_id])[0])
+    if doc_id < 0:
+        return {"error": "Speech not found"}
+
+    index = get_duplicate_index()
+    with stage("minhash"):
+        signature = document_signature(live.doc_tokens(doc_id))
+        doc_ids, similarities = index.similar(signature, limit, min_similarity, exclude=doc_id)
+
+    cluster_id = int(index.cluster_of[doc_id]) if doc_id < len(index.cluster_of) else -1
+    results = speech_results(doc_ids, similarities)
+    for result in results:
+        result["similarity"] = result.pop("score")
+    return {
+        **live.metadata(doc_id),
+        "cluster_id": cluster_id,
+        "cluster_size": int(index.sizes()[cluster_id]) if cluster_id >= 0 else 1,
+        "duplicates": results,
+    }
+
+@router.get("/clusters")
+async def duplicate_clusters(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100)
+):
+    """
+    Οι ομάδες διπλοτύπων όλου του corpus, κατά φθίνον μέγεθος, με την αντιπροσωπευτική ομιλία τους (την πρώτη στο dataset).
+
+    """
+    index = get_duplicate_index()
+    sizes = index.sizes()
+    cluster_ids = range(offset, min(offset + limit, index.n_clusters))
+    representatives = [int(index.cluster_docs[index.cluster_offsets[c]]) for c in cluster_ids]
+    results = speech_results(representatives)
+    return {
+        "n_clusters": index.n_clusters,
+        "n_redundant": len(index.redundant),
+        "offset": offset,
+        "clusters": [
+            {"cluster_id": c, "size": int(sizes[c]), "representative": r}
+            for c, r in zip(cluster_ids, results)
+        ],
+    }
+
+@router.get("/clusters/{cluster_id}/speeches")
+async def duplicate_cluster_speeches(
+    cluster_id: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=100)
+):
+    """
+    Οι ομιλίες μιας ομάδας διπλοτύπων, με τη σειρά του dataset (πρώτος ο αντιπρόσωπος).
+
+    """
+    index = get_duplicate_index()
+    if cluster_id >= index.n_clusters or cluster_id < 0:
+        return {"error": "Cluster not found"}
+
+    doc_ids = index.members(cluster_id, offset, limit)
+    results = speech_results(doc_ids)
+    return {
+        "cluster_id": cluster_id,
+        "size": int(index.sizes()[cluster_id]),
+        "offset": offset,
+        "results": results,
+    }
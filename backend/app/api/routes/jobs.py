@@ -0,0 +1,34 @@
+from fastapi import APIRouter
+from app.core.jobs import cancel_job as cancel, get_job, list_jobs
+
+router = APIRouter()
+
+@router.get("/")
+async def jobs():
+    """
+    Λίστα των εργασιών (σε αναμονή, σε εκτέλεση και πρόσφατα ολοκληρωμένων), χωρίς τα αποτελέσματα.
+
+    """
+    return {"jobs": list_jobs()}
+
+@router.get("/{job_id}")
+async def job_status(job_id: str):
+    """
+    Κατάσταση μίας εργασίας (queued, running, done, failed, cancelled) και το αποτέλεσμά της όταν ολοκληρωθεί.
+
+    """
+    job = get_job(job_id)
+    if job is None:
+        return {"error": "Job not found"}
+    return job
+
+@router.delete("/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Ακύρωση εργασίας που δεν έχει ξεκινήσει ακόμα να εκτελείται.
+
+    """
+    job = cancel(job_id)
+    if job is None:
+        return {"error": "Job not found"}
+    return job
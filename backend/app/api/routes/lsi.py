@@ -1,60 +1,147 @@
+import asyncio
 from fastapi import APIRouter, Query
-from sklearn.feature_extraction.text import TfidfVectorizer
+from pydantic import BaseModel
+from sklearn.feature_extraction.text import TfidfTransformer
 from sklearn.decomposition import TruncatedSVD
-from app.core.text_cleaner import normalize, remove_stopwords
-from app.core.data_loader import load_df
+from app.core.data_loader import speech_results
+from app.core.text_cleaner import tokenize
+from app.core.token_store import get_token_store
+from app.core.lsi_model import get_lsi_model
+from app.core.jobs import dispatch
+from app.core.sampling import ALLOCATIONS, STRATIFICATIONS, draw_sample, sample_params_error
+from app.core.metrics import stage
 
 router = APIRouter()
 
-def preprocess(text: str) -> str:
+# Μέγιστο top_k της σημασιολογικής αναζήτησης
+MAX_TOP_K = 100
+
+class SemanticSearchRequest(BaseModel):
+    query: str
+    top_k: int = 5
+
+def compute_lsi_topics(sample_size: int, n_topics: int, top_terms: int, seed: int | None = None,
+                       stratify_by: str | None = None, year_range: str | None = None,
+                       party: str | None = None, allocation: str | None = None):
     """
-    Προ-επεξεργασία κειμένου για αναζήτηση LSI.
-    
-    1. Κανονικοποιεί το κείμενο (πεζά γράμματα, αφαίρεση διακριτικών)
-    2. Αφαιρεί stopwords
+    Υπολογισμός θεμάτων LSI (εκτελείται στο process pool).
 
     """
-    return remove_stopwords(normalize(text))
+    store = get_token_store()
+    with stage("sample"):
+        doc_ids, sample = draw_sample(sample_size, seed, stratify_by, year_range, party, allocation)
+    if len(doc_ids) <= n_topics:
+        return {"error": "Not enough speeches match the sample filters", "sample": sample}
+
+    with stage("tfidf"):
+        counts, term_ids = store.count_matrix(doc_ids)
+        X = TfidfTransformer().fit_transform(counts)
+
+    with stage("svd"):
+        svd = TruncatedSVD(n_components=n_topics, random_state=42)
+        svd.fit(X)
+
+    terms = [store.vocab[j] for j in term_ids]
+    topics = []
+    for i, comp in enumerate(svd.components_):
+        top_idx = comp.argsort()[-top_terms:][::-1]
+        topics.append({
+            "topic_id": i,
+            "terms": [terms[j] for j in top_idx]
+        })
+
+    return {
+        "sample_size": sample_size,
+        "sample": sample,
+        "n_topics": n_topics,
+        "topics": topics
+    }
 
 @router.get("/topics")
 async def lsi_topics(
-    sample_size: int = Query(500, ge=100, le=2000),
+    sample_size: int | None = Query(None, ge=100, le=2000),
     n_topics: int = Query(5, ge=2, le=20),
-    top_terms: int = Query(10, ge=5, le=30)
+    top_terms: int = Query(10, ge=5, le=30),
+    seed: int | None = Query(None, ge=0),
+    stratify_by: str | None = Query(None, pattern=f"^({'|'.join(STRATIFICATIONS)})$"),
+    allocation: str | None = Query(None, pattern=f"^({'|'.join(ALLOCATIONS)})$"),
+    year_range: str | None = Query(None, pattern=r"^\d{4}(-\d{4})?$"),
+    party: str | None = Query(None, min_length=2),
+    background: bool = Query(False)
 ):
     """
     Εξαγωγή λανθάνουσων σημασιολογικών θεμάτων χρησιμοποιώντας Latent Semantic Indexing (LSI).
+
+    Χωρίς sample_size, τα θέματα προέρχονται από το προϋπολογισμένο μοντέλο LSI
+    ολόκληρου του corpus (χωρίς κόστος εκπαίδευσης ανά αίτημα· οι παράμετροι του δείγματος
+    απορρίπτονται). Με sample_size:
     
-    1. Φόρτωση δεδομένων και δημιουργία δείγματος ομιλιών
-    2. Προ-επεξεργασία κειμένων (κανονικοποίηση, αφαίρεση stopwords)
-    3. TF-IDF Vectorization: Μετατροπή κειμένων σε αριθμητικά διανύσματα
+    1. Δείγμα sample_size ομιλιών από το ευρετήριο δειγματοληψίας (στρώματα έτος × κόμμα):
+       τυχαίο με το seed (ίδιο seed, ίδιο δείγμα), με προαιρετικά φίλτρα year_range
+       ("2000-2010") και party, στρωματοποιημένο κατά stratify_by (year, party, year_party)
+       με κατανομή ανάλογη του μεγέθους των στρωμάτων ή ίση (allocation=equal)
+    2. Ανάγνωση των ήδη προ-επεξεργασμένων όρων από το tokenized corpus
+    3. TF-IDF: Μετατροπή των συχνοτήτων όρων σε αριθμητικά διανύσματα
     4. Truncated SVD: Μείωση διαστάσεων για εξαγωγή λανθάνουσων σημασιολογικών διαστάσεων
     5. Εξαγωγή κορυφαίων όρων για κάθε θέμα (topic)
+
+    Ο υπολογισμός στο δείγμα εκτελείται στο process pool· με background=true επιστρέφεται
+    αμέσως job id και το αποτέλεσμα λαμβάνεται από το /api/jobs/{job_id}.
     
     """
-    df = load_df()
-    df = df.dropna(subset=["speech"])
-    df = df.head(sample_size)
+    error = sample_params_error(sample_size, seed, stratify_by, allocation, year_range, party)
+    if error:
+        return {"error": error}
 
-    docs = df["speech"].astype(str).apply(preprocess).tolist()
+    if sample_size is None:
+        with stage("lsi_model"):
+            model = get_lsi_model()
+            topics = model.topics(n_topics, top_terms)
+        return {
+            "sample_size": None,
+            "n_docs": model.meta["n_docs"],
+            "n_topics": n_topics,
+            "topics": topics
+        }
 
-    vectorizer = TfidfVectorizer()
-    X = vectorizer.fit_transform(docs)
+    return await dispatch(
+        "lsi_topics", compute_lsi_topics, background,
+        sample_size=sample_size, n_topics=n_topics, top_terms=top_terms,
+        seed=seed, stratify_by=stratify_by, year_range=year_range, party=party, allocation=allocation,
+    )
 
-    svd = TruncatedSVD(n_components=n_topics, random_state=42)
-    svd.fit(X)
+def semantic_results(terms: list[str], top_k: int) -> list[dict]:
+    """
+    Κατάταξη όλων των ομιλιών στον λανθάνοντα χώρο και αποτελέσματα (εκτελείται σε thread,
+    ώστε το γινόμενο με όλα τα διανύσματα ομιλιών να μη μπλοκάρει το event loop).
 
-    terms = vectorizer.get_feature_names_out()
-    topics = []
-    for i, comp in enumerate(svd.components_):
-        top_idx = comp.argsort()[-top_terms:][::-1]
-        topics.append({
-            "topic_id": i,
-            "terms": [terms[j] for j in top_idx]
-        })
+    """
+    doc_ids, scores = get_lsi_model().search(terms, top_k)
+    return speech_results(doc_ids, scores)
 
+@router.post("/search")
+async def semantic_search(request: SemanticSearchRequest):
+    """
+    Σημασιολογική αναζήτηση ομιλιών στον λανθάνοντα χώρο του μοντέλου LSI.
+
+    1. Κανονικοποιεί το query και αφαιρεί stopwords
+    2. Μετατρέπει το query σε διάνυσμα TF-IDF στον κοινό χώρο χαρακτηριστικών
+    3. Το προβάλλει (folding-in) στον λανθάνοντα χώρο του μοντέλου
+    4. Κατατάσσει τις ομιλίες κατά cosine similarity (σε thread) και επιστρέφει τις top_k (έως 100)
+
+    Βρίσκει ομιλίες σχετικές με το θέμα του query ακόμα κι αν δεν περιέχουν ακριβώς τους όρους του.
+
+    """
+    if not 1 <= request.top_k <= MAX_TOP_K:
+        return {"error": f"top_k must be between 1 and {MAX_TOP_K}"}
+    with stage("tokenize"):
+        terms = tokenize(request.query)
+    if not terms:
+        return {"query": request.query, "results": []}
+
+    with stage("lsi_search"):
+        results = await asyncio.to_thread(semantic_results, terms, request.top_k)
     return {
-        "sample_size": sample_size,
-        "n_topics": n_topics,
-        "topics": topics
-    }
\ No newline at end of file
+        "query": request.query,
+        "results": results
+    }
@@ -1,65 +1,137 @@
-from fastapi import APIRouter
+import asyncio
+import json
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import pandas as pd
-from app.core.text_cleaner import normalize, remove_stopwords
-from app.core.data_loader import load_df
+from app.core.pruning import ScorerCache
+from app.core.search_engine import decode_cursor, execute_search, iter_export, iter_search_batch, search_batch as run_search_batch
+from app.core.snippets import SNIPPET_LENGTH
+from app.core.segments import get_live_corpus
+from app.core.metrics import stage
 
 router = APIRouter()
 
+# Μέγιστο πλήθος ερωτημάτων ανά αίτημα batch
+MAX_BATCH_QUERIES = 1000
+
 class SearchRequest(BaseModel):
     query: str
     top_k: int = 5
     party: str | None = None
     member: str | None = None
+    exhaustive: bool = False
+    collapse_duplicates: bool = False
+
+class BatchSearchRequest(BaseModel):
+    queries: list[SearchRequest]
+    stream: bool = False
+
+class ExportRequest(BaseModel):
+    query: str
+    party: str | None = None
+    member: str | None = None
+    collapse_duplicates: bool = False
+    cursor: str | None = None
+    limit: int | None = None
+    snippet_length: int = SNIPPET_LENGTH
 
 @router.post("/")
 async def search(request: SearchRequest):
     """
     Ολοκληρωμένη αναζήτηση κατά πλήρες κείμενο (full-text search) στα ομιλητήρια του Ελληνικού Κοινοβουλίου.
-    
+
     1. Κανονικοποιεί και αφαιρεί stopwords από το query
-    2. Διαιρεί το query σε μεμονωμένους όρους
-    3. Υπολογίζει score ανά ομιλία βάσει συχνότητας εμφάνισης των όρων
-    4. Εφαρμόζει φίλτρα κόμματος/μέλους αν επιλεγούν
-    5. Ταξινομεί αποτελέσματα κατά score σε φθίνουσα σειρά
-    6. Επιστρέφει τα κορυφαία top_k αποτελέσματα με snippet (απόσπασμα 300 χαρακτήρων)
-    
+    2. Διαιρεί το query σε όρους, φράσεις σε εισαγωγικά ("κοινωνική ασφάλιση") και
+       τελεστές εγγύτητας (οικονομία NEAR/5 ανάπτυξη)
+    3. Υπολογίζει τα top_k κατά BM25 στο ανεστραμμένο ευρετήριο (και στα segments νέων
+       συνεδριάσεων) με κλάδεμα MaxScore: οι λίστες όρων με μικρό άνω φράγμα διαβάζονται μόνο
+       για τις υποψήφιες ομιλίες. Με exhaustive=true (και για φράσεις / NEAR) βαθμολογούνται
+       όλες οι ομιλίες· το evaluation αναφέρει πόσες ομιλίες βαθμολογήθηκαν και πόσα postings παραλείφθηκαν
+    4. Κρατάει μόνο τις ομιλίες όπου οι φράσεις και οι τελεστές NEAR ικανοποιούνται
+       (συγχώνευση θέσεων από το ευρετήριο θέσεων)
+    5. Εφαρμόζει φίλτρα κόμματος/μέλους αν επιλεγούν: το όνομα επιλύεται στο ευρετήριο facets
+       και οι ομιλίες που ταιριάζουν τέμνονται με τις ομιλίες του μέλους/κόμματος
+       και, με collapse_duplicates, παραλείπει τα σχεδόν διπλότυπα (μένει ο αντιπρόσωπος κάθε ομάδας)
+    6. Επιλέγει τα top_k αποτελέσματα κατά score σε φθίνουσα σειρά
+    7. Επιστρέφει τα κορυφαία top_k αποτελέσματα με snippet (απόσπασμα 300 χαρακτήρων)
+
     """
-    query_norm = remove_stopwords(normalize(request.query))
-    if not query_norm:
-        return {"query": request.query, "results": []}
+    return execute_search(request.model_dump())
 
-    terms = query_norm.split()
+@router.post("/batch")
+async def search_batch(request: BatchSearchRequest):
+    """
+    Εκτέλεση πολλών ερωτημάτων αναζήτησης μαζί (π.χ. αναφορές ανά θέμα).
 
-    df = load_df()
-    df = df.dropna(subset=["speech", "member_name", "political_party", "sitting_date"])
+    1. Όλα τα ερωτήματα εκτελούνται στο ίδιο στιγμιότυπο του corpus με κοινή cache όρων:
+       η λίστα postings κάθε διακριτού όρου βαθμολογείται το πολύ μία φορά για όλο το batch
+    2. Τα ερωτήματα μοιράζονται σε threads (όσοι και οι πυρήνες του worker)
+    3. Επιστρέφει τα αποτελέσματα κάθε ερωτήματος με τη σειρά του αιτήματος και στατιστικά
+       της cache· με stream=true επιστρέφει NDJSON, μία γραμμή ανά ερώτημα (με το index του)
+       μόλις ολοκληρωθεί, και τελική γραμμή με τα στατιστικά
 
-    speech_norm = df["speech"].astype(str).apply(normalize)
-    member_norm = df["member_name"].astype(str).apply(normalize)
-    party_norm = df["political_party"].astype(str).apply(normalize)
+    """
+    if len(request.queries) > MAX_BATCH_QUERIES:
+        return {"error": f"At most {MAX_BATCH_QUERIES} queries per request"}
 
-    scores = pd.Series(0, index=df.index)
-    for term in terms:
-        scores += speech_norm.str.count(rf"\b{term}\b")
+    queries = [query.model_dump() for query in request.queries]
+    cache = ScorerCache()
 
-    df["score"] = scores
-    df = df[df["score"] > 0]
+    if request.stream:
+        def lines():
+            for position, result in iter_search_batch(queries, cache):
+                yield json.dumps({"index": position, **result}, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "queries": len(queries), "cache": cache.stats()}) + "\n"
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
 
-    if request.party:
-        party_q = normalize(request.party)
-        df = df[party_norm.str.contains(party_q, na=False)]
-    if request.member:
-        member_q = normalize(request.member)
-        df = df[member_norm.str.contains(member_q, na=False)]
+    with stage("batch"):
+        results = await asyncio.to_thread(run_search_batch, queries, cache)
+    return {"results": results, "cache": cache.stats()}
 
-    df = df.sort_values("score", ascending=False)
+@router.post("/export")
+async def search_export(request: ExportRequest):
+    """
+    Εξαγωγή όλων των αποτελεσμάτων ενός ερωτήματος σε NDJSON (μία γραμμή ανά ομιλία), με ροή.
+
+    1. Τα αποτελέσματα στέλνονται με τη σειρά κατάταξης (φθίνον BM25) καθώς υπολογίζονται·
+       το πρώτο τμήμα κατατάσσεται χωρίς ταξινόμηση όλων
+    2. Κάθε γραμμή έχει rank, μεταδεδομένα, score και snippet γύρω από τους όρους του
+       ερωτήματος, με τις θέσεις [αρχή, τέλος) των όρων μέσα στο snippet (highlights)
+    3. Με limit στέλνονται το πολύ limit ομιλίες· η τελευταία γραμμή έχει το next_cursor,
+       που δίνεται ως cursor για την επόμενη σελίδα (null όταν δεν υπάρχουν άλλες)
+
+    Τα κείμενα διαβάζονται από την αποθήκη ομιλιών μόνο για τις γραμμές που στέλνονται.
+
+    """
+    cursor = None
+    if request.cursor:
+        cursor = decode_cursor(request.cursor)
+        if cursor is None:
+            return {"error": "Invalid cursor"}
+    if request.limit is not None and request.limit < 1:
+        return {"error": "limit must be at least 1"}
+    if not 50 <= request.snippet_length <= 2000:
+        return {"error": "snippet_length must be between 50 and 2000"}
 
-    results_df = df.head(request.top_k)[
-        ["sitting_date", "member_name", "political_party", "speech", "score"]
-    ]
-    results_df["snippet"] = results_df["speech"].astype(str).str.slice(0, 300)
+    def lines():
+        for row in iter_export(request.model_dump(), cursor, request.limit, request.snippet_length):
+            yield json.dumps(row, ensure_ascii=False) + "\n"
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
-    return {
-        "query": request.query,
-        "results": results_df[["sitting_date", "member_name", "political_party", "snippet", "score"]].to_dict(orient="records")
-    }
\ No newline at end of file
+@router.get("/autocomplete")
+async def autocomplete(
+    field: str = Query(..., pattern="^(member|party)$"),
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Προτάσεις ονομάτων μελών ή κομμάτων για τα φίλτρα (autocomplete).
+
+    1. Κανονικοποιεί το q (πεζά, χωρίς τόνους) όπως και τα ονόματα του ευρετηρίου facets
+    2. Βρίσκει τα ονόματα που περιέχουν το q (μόνο στις διακριτές τιμές)
+    3. Επιστρέφει πρώτα όσα ξεκινούν με το q, κατά πλήθος ομιλιών
+
+    """
+    with stage("facets"):
+        suggestions = get_live_corpus().complete(field, q, limit)
+    return {"field": field, "query": q, "suggestions": suggestions}
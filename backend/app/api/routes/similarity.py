@@ -1,64 +1,146 @@
 from fastapi import APIRouter, Query
-from collections import Counter
-from app.core.text_cleaner import normalize, remove_stopwords
-from app.core.data_loader import load_df
+from pydantic import BaseModel
+from app.core.ann_index import DEFAULT_NPROBE, MAX_LISTS, get_ann_index, recall_at_k, speech_vectors
+from app.core.data_loader import speech_results
+from app.core.member_similarity import get_member_neighbours, NEIGHBOURS
+from app.core.segments import get_live_corpus
+from app.core.metrics import stage
 
 router = APIRouter()
 
-def extract_keywords(text: str, top_n: int = 20):
-    text = remove_stopwords(normalize(text))
-    words = [w for w in text.split() if len(w) > 2]
-    return [w for w, _ in Counter(words).most_common(top_n)]
+# Μέγιστο πλήθος ομιλιών ανά αίτημα batch
+MAX_BATCH_IDS = 100
+MAX_TOP_K = 100
 
-def jaccard(a: set, b: set) -> float:
+class SpeechBatchRequest(BaseModel):
+    ids: list[int]
+    top_k: int = 10
+    nprobe: int = DEFAULT_NPROBE
+    exact: bool = False
+
+def similar_speeches(doc_ids: list[int], top_k: int, nprobe: int, exact: bool):
     """
-    Υπολογισμός Jaccard Similarity ανάμεσα σε δύο σύνολα λέξεων.
-    
-    Τύπος: |A ∩ B| / |A ∪ B|
+    Οι top_k πιο όμοιες ομιλίες για κάθε μία από τις δοσμένες (doc ids), μαζί με στατιστικά.
+
+    Με exact=true η αναζήτηση είναι ακριβής και τα στατιστικά περιέχουν την ανάκληση (recall)
+    που θα είχε το ευρετήριο IVF με το ίδιο nprobe.
 
     """
-    if not a and not b:
-        return 0.0
-    return len(a & b) / len(a | b)
+    live = get_live_corpus()
+    index = get_ann_index()
+    with stage("vectors"):
+        queries = speech_vectors(doc_ids, live)
+        exclude = [doc_id if doc_id < index.n_docs else -1 for doc_id in doc_ids]
+    with stage("ann"):
+        results, evaluation = index.search(queries, top_k, nprobe, exclude)
+        if exact:
+            approximate = results
+            results, evaluation = index.exact(queries, top_k, exclude)
+            evaluation["nprobe"] = max(1, min(nprobe, index.n_lists))
+            evaluation["recall"] = round(sum(recall_at_k(a, e) for a, e in zip(approximate, results)) / max(len(results), 1), 4)
+    speeches = []
+    for doc_id, (ids, scores) in zip(doc_ids, results):
+        similar = speech_results(ids, scores)
+        for result in similar:
+            result["similarity"] = result.pop("score")
+        speeches.append({**live.metadata(doc_id), "similar": similar})
+    return speeches, evaluation
 
 @router.get("/top-pairs")
 async def top_pairs(
-    limit_members: int = Query(50, ge=5, le=300),
-    top_terms: int = Query(20, ge=5, le=50),
-    top_k: int = Query(5, ge=1, le=100)
+    metric: str = Query("jaccard", pattern="^(jaccard|cosine)$"),
+    top_k: int = Query(5, ge=1, le=NEIGHBOURS)
 ):
     """
     Εύρεση των πιο ομοίων ζευγών μελών του κοινοβουλίου βάσει των θεμάτων τους.
-    
-    1. Επιλέγει τα πρώτα limit_members μέλη από το dataset
-    2. Ομαδοποιεί ομιλίες ανά μέλος και συνδυάζει το κείμενό τους
-    3. Εξάγει τις κορυφαίες top_terms λέξεις-κλειδιά για κάθε μέλος
-    4. Υπολογίζει Jaccard Similarity ανάμεσα σε όλα τα ζεύγη μελών
-    5. Επιστρέφει τα top_k ζεύγη με τη μεγαλύτερη ομοιότητα
-    
+
+    1. Ομαδοποιεί τις συχνότητες όρων ανά μέλος (πίνακας μελών × όρων, για όλα τα μέλη)
+    2. jaccard: ομοιότητα Jaccard των κορυφαίων λέξεων-κλειδιών κάθε μέλους,
+       cosine: cosine similarity των διανυσμάτων TF-IDF των μελών
+    3. Επιστρέφει τα top_k ζεύγη με τη μεγαλύτερη ομοιότητα
+
+    Οι ομοιότητες υπολογίζονται ως βήμα build (python -m app.core.build members)
+    και το endpoint διαβάζει τον αποθηκευμένο πίνακα πλησιέστερων μελών.
+
+    """
+    with stage("neighbours"):
+        pairs = get_member_neighbours().top_pairs(metric, top_k)
+    return {"metric": metric, "top_k": top_k, "pairs": pairs}
+
+@router.get("/member/{name}")
+async def member_peers(
+    name: str,
+    metric: str = Query("jaccard", pattern="^(jaccard|cosine)$"),
+    top_k: int = Query(10, ge=1, le=NEIGHBOURS)
+):
+    """
+    Τα top_k πιο όμοια μέλη με ένα μέλος, από τον προϋπολογισμένο πίνακα πλησιέστερων.
+
+    Το name ταιριάζει ακριβώς (χωρίς διάκριση πεζών/κεφαλαίων) ή ως μέρος του ονόματος,
+    αρκεί να αντιστοιχεί σε ένα μόνο μέλος.
+
     """
-    df = load_df()
-    df = df.dropna(subset=["speech", "member_name"])
-
-    members = df["member_name"].unique()[:limit_members]
-    df = df[df["member_name"].isin(members)]
-
-    grouped = df.groupby("member_name")["speech"].apply(lambda x: " ".join(x)).reset_index()
-
-    member_keywords = {}
-    for _, row in grouped.iterrows():
-        member = row["member_name"]
-        kw = set(extract_keywords(row["speech"], top_terms))
-        member_keywords[member] = kw
-
-    pairs = []
-    members_list = list(member_keywords.keys())
-    for i in range(len(members_list)):
-        for j in range(i + 1, len(members_list)):
-            m1 = members_list[i]
-            m2 = members_list[j]
-            sim = jaccard(member_keywords[m1], member_keywords[m2])
-            pairs.append({"member_1": m1, "member_2": m2, "similarity": sim})
-
-    pairs = sorted(pairs, key=lambda x: x["similarity"], reverse=True)[:top_k]
-    return {"limit_members": limit_members, "top_k": top_k, "pairs": pairs}
\ No newline at end of file
+    with stage("neighbours"):
+        table = get_member_neighbours()
+        matches = table.find(name)
+    if not matches:
+        return {"error": "Member not found"}
+    if len(matches) > 1:
+        return {"error": "Ambiguous member name", "matches": [table.labels[i] for i in matches[:20]]}
+
+    member = matches[0]
+    return {
+        "member_name": table.labels[member],
+        "metric": metric,
+        "peers": table.peers(member, metric, top_k)
+    }
+
+@router.get("/speech/{speech_id}")
+async def speech_peers(
+    speech_id: int,
+    top_k: int = Query(10, ge=1, le=MAX_TOP_K),
+    nprobe: int = Query(DEFAULT_NPROBE, ge=1, le=MAX_LISTS),
+    exact: bool = False
+):
+    """
+    Οι top_k πιο όμοιες ομιλίες με μια ομιλία («more like this»).
+
+    1. Παίρνει το διάνυσμα LSI της ομιλίας (για ομιλίες segments, προβολή των όρων της)
+    2. Βρίσκει τις nprobe λίστες του ευρετηρίου IVF με τα πλησιέστερα κέντρα
+    3. Επιστρέφει τις ομιλίες των λιστών αυτών με τη μεγαλύτερη cosine similarity
+
+    Μεγαλύτερο nprobe δίνει μεγαλύτερη ανάκληση με μεγαλύτερο χρόνο. Με exact=true
+    σαρώνονται όλες οι ομιλίες και το evaluation αναφέρει την ανάκληση του IVF.
+
+    """
+    live = get_live_corpus()
+    doc_id = int(live.doc_ids([speech_id])[0])
+    if doc_id < 0:
+        return {"error": "Speech not found"}
+
+    results, evaluation = similar_speeches([doc_id], top_k, nprobe, exact)
+    return {**results[0], "evaluation": evaluation}
+
+@router.post("/speeches")
+async def speeches_peers(request: SpeechBatchRequest):
+    """
+    Οι top_k πιο όμοιες ομιλίες για πολλές ομιλίες μαζί (batch): κάθε λίστα του ευρετηρίου
+    διαβάζεται μία φορά για όλα τα ερωτήματα που την εξετάζουν.
+
+    Τα speech_ids που δεν υπάρχουν επιστρέφονται στο missing.
+
+    """
+    if len(request.ids) > MAX_BATCH_IDS:
+        return {"error": f"At most {MAX_BATCH_IDS} ids per request"}
+    if not 1 <= request.top_k <= MAX_TOP_K or request.nprobe < 1:
+        return {"error": f"top_k must be between 1 and {MAX_TOP_K} and nprobe at least 1"}
+
+    live = get_live_corpus()
+    doc_ids = live.doc_ids(request.ids)
+    found = [int(doc_id) for doc_id in doc_ids if doc_id >= 0]
+    missing = [speech_id for speech_id, doc_id in zip(request.ids, doc_ids) if doc_id < 0]
+    if not found:
+        return {"results": [], "missing": missing}
+
+    results, evaluation = similar_speeches(found, request.top_k, request.nprobe, request.exact)
+    return {"results": results, "missing": missing, "evaluation": evaluation}
@@ -1,8 +1,50 @@
 from fastapi import APIRouter, Query
+from pydantic import BaseModel
 from app.core.data_loader import load_speeches
+from app.core.segments import get_live_corpus
+from app.core.metrics import stage
 
 router = APIRouter()
 
+# Μέγιστο πλήθος ομιλιών ανά αίτημα batch
+MAX_BATCH_IDS = 1000
+
+class BatchRequest(BaseModel):
+    ids: list[int]
+
 @router.get("/")
 async def speeches(limit: int = Query(10, ge=1, le=100)):
-    return load_speeches(limit)
\ No newline at end of file
+    return load_speeches(limit)
+
+@router.post("/batch")
+async def speeches_batch(request: BatchRequest):
+    """
+    Πλήρες κείμενο και μεταδεδομένα πολλών ομιλιών κατά speech_id, με τη σειρά του αιτήματος.
+
+    Τα speech_ids που δεν υπάρχουν επιστρέφονται στο missing.
+
+    """
+    if len(request.ids) > MAX_BATCH_IDS:
+        return {"error": f"At most {MAX_BATCH_IDS} ids per request"}
+
+    with stage("doc_store"):
+        live = get_live_corpus()
+        doc_ids = live.doc_ids(request.ids)
+        speeches = [live.get(int(doc_id)) for doc_id in doc_ids if doc_id >= 0]
+    missing = [speech_id for speech_id, doc_id in zip(request.ids, doc_ids) if doc_id < 0]
+    return {"speeches": speeches, "missing": missing}
+
+@router.get("/{speech_id}")
+async def speech_by_id(speech_id: int):
+    """
+    Πλήρες κείμενο και μεταδεδομένα μίας ομιλίας από την αποθήκη ομιλιών.
+
+    Το speech_id είναι σταθερό (αριθμός γραμμής στο dataset) και επιστρέφεται σε κάθε αποτέλεσμα αναζήτησης.
+
+    """
+    with stage("doc_store"):
+        live = get_live_corpus()
+        doc_id = int(live.doc_ids([speech_id])[0])
+        if doc_id < 0:
+            return {"error": "Speech not found"}
+        return live.get(doc_id)
@@ -0,0 +1,291 @@
+"""
+Ευρετήριο προσεγγιστικών πλησιέστερων γειτόνων (IVF) πάνω στα διανύσματα LSI των ομιλιών.
+
+Τα διανύσματα ομιλιών του LSI (TF-IDF προβεβλημένο με SVD, float32, μοναδιαίου μήκους)
+χωρίζονται σε λίστες (inverted lists) γύρω από κέντρα σφαιρικού K-Means:
+- centroids: τα κέντρα των λιστών (n_lists × n_components, μοναδιαία)
+- order / offsets: οι ομιλίες ταξινομημένες ανά λίστα· τα μέλη της λίστας l είναι
+  order[offsets[l]:offsets[l + 1]]
+- vectors: τα διανύσματα με τη σειρά του order (memory-mapped), ώστε κάθε λίστα να διαβάζεται
+  ως ένα συνεχές μπλοκ
+
+Ένα ερώτημα συγκρίνεται με τα κέντρα και βαθμολογούνται μόνο οι ομιλίες των nprobe πλησιέστερων
+λιστών· μεγαλύτερο nprobe σημαίνει μεγαλύτερη ανάκληση (recall) και μεγαλύτερο χρόνο.
+Η ακριβής (brute-force) αναζήτηση σαρώνει όλα τα διανύσματα, για έλεγχο της ανάκλησης.
+
+"""
+
+import numpy as np
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import DATA_DIR
+from app.core.lsi_model import get_lsi_model
+
+# Φάκελος αποθήκευσης του ευρετηρίου
+ANN_DIR = DATA_DIR / "ann"
+
+# Πλήθος λιστών ≈ LISTS_PER_SQRT_DOCS × √n_docs
+LISTS_PER_SQRT_DOCS = 4
+MAX_LISTS = 16_384
+
+# Εκπαίδευση του σφαιρικού K-Means σε δείγμα TRAIN_PER_LIST ομιλιών ανά λίστα
+TRAIN_PER_LIST = 32
+TRAIN_ITERATIONS = 10
+RANDOM_STATE = 42
+
+# Προεπιλεγμένο πλήθος λιστών που εξετάζονται ανά ερώτημα
+DEFAULT_NPROBE = 16
+
+# Πλήθος διανυσμάτων ανά τμήμα (η μνήμη εξαρτάται από αυτό και όχι από το μέγεθος του corpus)
+BUILD_CHUNK_DOCS = 20_000
+
+ANN_CACHE = None
+
+def iter_ranges(n: int, chunk_size: int = BUILD_CHUNK_DOCS):
+    for start in range(0, n, chunk_size):
+        yield start, min(start + chunk_size, n)
+
+def nearest_centroids(vectors, centroids):
+    """
+    Η πλησιέστερη (κατά cosine similarity) λίστα κάθε διανύσματος, τμηματικά.
+
+    """
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start, end in iter_ranges(len(vectors)):
+        labels[start:end] = np.argmax(np.asarray(vectors[start:end]) @ centroids.T, axis=1)
+    return labels
+
+def spherical_kmeans(vectors, n_lists: int, rng):
+    """
+    Σφαιρικός K-Means (cosine similarity) σε δείγμα των διανυσμάτων.
+
+    1. Αρχικά κέντρα: τυχαίες ομιλίες του δείγματος
+    2. Σε κάθε επανάληψη κάθε ομιλία ανατίθεται στο κέντρο με το μέγιστο εσωτερικό γινόμενο
+       και κάθε κέντρο γίνεται το κανονικοποιημένο άθροισμα των μελών του
+    3. Κενές λίστες παίρνουν ως κέντρο μια τυχαία ομιλία του δείγματος
+
+    """
+    n_train = min(len(vectors), TRAIN_PER_LIST * n_lists)
+    sample = np.sort(rng.choice(len(vectors), n_train, replace=False))
+    train = np.asarray(vectors[sample], dtype=np.float32)
+    centroids = train[rng.choice(n_train, n_lists, replace=False)].copy()
+    for _ in range(TRAIN_ITERATIONS):
+        labels = nearest_centroids(train, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, train)
+        norms = np.linalg.norm(sums, axis=1)
+        empty = norms == 0
+        centroids[~empty] = sums[~empty] / norms[~empty, None]
+        centroids[empty] = train[rng.choice(n_train, int(empty.sum()))]
+    return centroids
+
+def top_k_columns(ids, scores, k: int):
+    """
+    Τα k μεγαλύτερα scores κάθε στήλης (ερωτήματος) ενός μπλοκ scores (n × m).
+
+    """
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1, axis=0)[:k]
+        return ids[top], np.take_along_axis(scores, top, axis=0)
+    return np.repeat(ids[:, None], scores.shape[1], axis=1), scores
+
+def rank(ids, scores, k: int):
+    """
+    Τα top-k (ids, scores) κατά φθίνον score, με ισοβαθμίες κατά doc id.
+
+    """
+    order = np.lexsort((ids, -scores))[:k]
+    return ids[order], scores[order]
+
+class AnnIndex:
+    """
+    Ευρετήριο IVF των διανυσμάτων ομιλιών (βλ. περιγραφή του module).
+
+    """
+
+    def __init__(self, centroids, order, offsets, vectors, meta=None):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+        self.vectors = vectors
+        self.meta = meta or {}
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.order)
+
+    def search(self, queries, k: int, nprobe: int = DEFAULT_NPROBE, exclude=None):
+        """
+        Προσεγγιστικά οι k πλησιέστερες ομιλίες κάθε ερωτήματος (queries: m × n_components).
+
+        1. Επιλέγει για κάθε ερώτημα τις nprobe λίστες με τα πλησιέστερα κέντρα
+        2. Ομαδοποιεί τα ζεύγη (ερώτημα, λίστα) ανά λίστα, ώστε κάθε λίστα να διαβάζεται μία
+           φορά και να βαθμολογείται για όλα τα ερωτήματά της με ένα γινόμενο πινάκων
+        3. Κρατάει τα top-k κάθε μπλοκ και στο τέλος τα top-k κάθε ερωτήματος
+
+        Το exclude (ένα doc id ανά ερώτημα, -1 για κανένα) αφαιρεί π.χ. την ίδια την ομιλία.
+        Επιστρέφει λίστα (doc ids, scores) ανά ερώτημα και στατιστικά.
+
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        exclude = np.full(len(queries), -1) if exclude is None else np.asarray(exclude)
+        nprobe = max(1, min(nprobe, self.n_lists))
+        keep = k + 1
+
+        centroid_scores = queries @ self.centroids.T
+        if nprobe < self.n_lists:
+            probes = np.argpartition(-centroid_scores, nprobe - 1, axis=1)[:, :nprobe]
+        else:
+            probes = np.broadcast_to(np.arange(self.n_lists), (len(queries), self.n_lists))
+        pair_queries = np.repeat(np.arange(len(queries)), nprobe)
+        pair_lists = probes.ravel()
+        by_list = np.argsort(pair_lists, kind="stable")
+        pair_queries, pair_lists = pair_queries[by_list], pair_lists[by_list]
+        starts = np.flatnonzero(np.r_[True, pair_lists[1:] != pair_lists[:-1]])
+        ends = np.r_[starts[1:], len(pair_lists)]
+
+        candidates = [[] for _ in range(len(queries))]
+        scanned = 0
+        for first, last in zip(starts, ends):
+            lst = pair_lists[first]
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if start == end:
+                continue
+            members = pair_queries[first:last]
+            scores = np.asarray(self.vectors[start:end]) @ queries[members].T
+            ids, scores = top_k_columns(np.asarray(self.order[start:end], dtype=np.int64), scores, keep)
+            for column, q in enumerate(members):
+                candidates[q].append((ids[:, column], scores[:, column]))
+            scanned += (end - start) * len(members)
+
+        results = []
+        for q, parts in enumerate(candidates):
+            ids = np.concatenate([p[0] for p in parts]) if parts else np.empty(0, dtype=np.int64)
+            scores = np.concatenate([p[1] for p in parts]) if parts else np.empty(0, dtype=np.float32)
+            mask = ids != exclude[q]
+            results.append(rank(ids[mask], scores[mask], k))
+        stats = {"mode": "ivf", "n_lists": self.n_lists, "nprobe": nprobe, "scanned": int(scanned)}
+        return results, stats
+
+    def exact(self, queries, k: int, exclude=None):
+        """
+        Ακριβώς οι k πλησιέστερες ομιλίες κάθε ερωτήματος, με σάρωση όλων των διανυσμάτων.
+
+        Τα διανύσματα διαβάζονται σε τμήματα και για κάθε ερώτημα κρατιούνται τα top-k.
+
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        exclude = np.full(len(queries), -1) if exclude is None else np.asarray(exclude)
+        keep = k + 1
+
+        best_ids = np.empty((0, len(queries)), dtype=np.int64)
+        best_scores = np.empty((0, len(queries)), dtype=np.float32)
+        for start, end in iter_ranges(self.n_docs):
+            scores = np.asarray(self.vectors[start:end]) @ queries.T
+            ids = np.asarray(self.order[start:end], dtype=np.int64)
+            chunk_ids, chunk_scores = top_k_columns(ids, scores, keep)
+            best_ids = np.concatenate((best_ids, chunk_ids))
+            best_scores = np.concatenate((best_scores, chunk_scores))
+            if len(best_ids) > keep:
+                top = np.argpartition(-best_scores, keep - 1, axis=0)[:keep]
+                best_ids = np.take_along_axis(best_ids, top, axis=0)
+                best_scores = np.take_along_axis(best_scores, top, axis=0)
+
+        results = []
+        for q in range(len(queries)):
+            mask = best_ids[:, q] != exclude[q]
+            results.append(rank(best_ids[mask, q], best_scores[mask, q], k))
+        stats = {"mode": "exact", "n_lists": self.n_lists, "scanned": self.n_docs * len(queries)}
+        return results, stats
+
+def speech_vectors(doc_ids, live, model=None):
+    """
+    Τα διανύσματα ερωτήματος των δοσμένων ομιλιών (doc ids του LiveCorpus).
+
+    Οι ομιλίες του βασικού corpus έχουν αποθηκευμένο διάνυσμα στο μοντέλο LSI· οι ομιλίες των
+    segments (που δεν ανήκουν ακόμα στο μοντέλο) προβάλλονται από τους όρους τους (folding-in).
+
+    """
+    if model is None:
+        model = get_lsi_model()
+    n_base = len(model.doc_vectors)
+    return np.array([
+        model.doc_vectors[doc_id] if doc_id < n_base else model.fold_tokens(live.doc_tokens(doc_id))
+        for doc_id in doc_ids
+    ], dtype=np.float32).reshape(len(doc_ids), model.n_components)
+
+def recall_at_k(approximate, exact) -> float:
+    """
+    Ανάκληση των προσεγγιστικών top-k ως προς τα ακριβή: το ποσοστό τους που θα ήταν στα ακριβή
+    top-k (score τουλάχιστον το k-οστό ακριβές score, ώστε οι ισοβαθμίες να μη μετρούν ως λάθη).
+
+    """
+    _, approximate_scores = approximate
+    _, exact_scores = exact
+    if len(exact_scores) == 0:
+        return 1.0
+    found = np.sum(approximate_scores >= exact_scores[-1] - 1e-6)
+    return float(min(found, len(exact_scores)) / len(exact_scores))
+
+def build_ann_index(path=ANN_DIR, model=None):
+    """
+    Δημιουργία και αποθήκευση του ευρετηρίου IVF (βήμα build, μετά το LSI).
+
+    1. Σφαιρικός K-Means σε δείγμα των διανυσμάτων LSI → κέντρα λιστών
+    2. Ανάθεση κάθε ομιλίας στην πλησιέστερη λίστα, τμηματικά
+    3. Αντιγραφή των διανυσμάτων με τη σειρά των λιστών σε memory-mapped αρχείο
+
+    """
+    if model is None:
+        model = get_lsi_model()
+    doc_vectors = model.doc_vectors
+    n_docs, n_components = doc_vectors.shape
+
+    rng = np.random.default_rng(RANDOM_STATE)
+    n_lists = int(np.clip(LISTS_PER_SQRT_DOCS * np.sqrt(n_docs), 1, min(MAX_LISTS, n_docs)))
+    centroids = spherical_kmeans(doc_vectors, n_lists, rng)
+    labels = nearest_centroids(doc_vectors, centroids)
+    order = np.argsort(labels, kind="stable").astype(np.int32)
+    offsets = np.zeros(n_lists + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(labels, minlength=n_lists))
+
+    meta = {"n_lists": n_lists, "n_docs": n_docs, "n_components": n_components}
+    with artifact_writer(path, meta) as tmp:
+        np.save(tmp / "centroids.npy", centroids)
+        np.save(tmp / "order.npy", order)
+        np.save(tmp / "offsets.npy", offsets)
+        vectors = np.lib.format.open_memmap(
+            tmp / "vectors.npy", mode="w+", dtype=np.float32, shape=(n_docs, n_components)
+        )
+        for start, end in iter_ranges(n_docs):
+            vectors[start:end] = doc_vectors[order[start:end]]
+        vectors.flush()
+        del vectors
+    return path
+
+def load_ann_index(path=ANN_DIR):
+    loaded = read_artifact(path, ["centroids", "order", "offsets", "vectors"])
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return AnnIndex(
+        centroids=np.asarray(arrays["centroids"]),
+        order=arrays["order"],
+        offsets=np.asarray(arrays["offsets"]),
+        vectors=arrays["vectors"],
+        meta=meta,
+    )
+
+def get_ann_index() -> AnnIndex:
+    global ANN_CACHE
+    if ANN_CACHE is None:
+        index = load_ann_index()
+        if index is None:
+            build_ann_index()
+            index = load_ann_index()
+        ANN_CACHE = index
+    return ANN_CACHE
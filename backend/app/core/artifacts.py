@@ -0,0 +1,76 @@
+"""
+Αποθήκευση / φόρτωση παραγόμενων αρχείων (ευρετήρια, μοντέλα) στον φάκελο δεδομένων.
+
+Κάθε artifact είναι ένας φάκελος με πίνακες numpy (.npy), προαιρετικό λεξιλόγιο
+(vocab.txt, ένας όρος ανά γραμμή) και meta.json με το fingerprint του dataset.
+Οι πίνακες φορτώνονται με memory-mapping, οπότε μοιράζονται μέσω του page cache.
+
+"""
+
+import json
+import shutil
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.core.data_loader import dataset_fingerprint
+
+@contextmanager
+def artifact_writer(path, meta: dict | None = None, vocab: list[str] | None = None):
+    """
+    Δημιουργία artifact σε προσωρινό φάκελο, που μετονομάζεται στο τέλος.
+
+    Έτσι δεν μένει ποτέ μισογραμμένο artifact. Ο καλών λαμβάνει τον προσωρινό
+    φάκελο και μπορεί να γράψει μεγάλους πίνακες τμηματικά (π.χ. με open_memmap)·
+    το meta μπορεί να συμπληρωθεί μέχρι το τέλος του with.
+
+    """
+    meta = {} if meta is None else meta
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir(parents=True)
+
+    yield tmp
+
+    if vocab is not None:
+        (tmp / "vocab.txt").write_text("\n".join(vocab), encoding="utf-8")
+    meta = {"fingerprint": dataset_fingerprint(), **meta}
+    (tmp / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+    shutil.rmtree(path, ignore_errors=True)
+    tmp.rename(path)
+
+def write_artifact(path, arrays: dict, meta: dict | None = None, vocab: list[str] | None = None):
+    """
+    Αποθήκευση artifact (πίνακες που βρίσκονται ήδη στη μνήμη) στον δίσκο.
+
+    """
+    with artifact_writer(path, meta, vocab) as tmp:
+        for name, values in arrays.items():
+            np.save(tmp / f"{name}.npy", values)
+    return path
+
+def read_meta(path):
+    meta_path = path / "meta.json"
+    if not meta_path.exists():
+        return None
+    return json.loads(meta_path.read_text(encoding="utf-8"))
+
+def read_artifact(path, names: list[str], mmap: bool = True):
+    """
+    Φόρτωση artifact (πίνακες, meta, λεξιλόγιο).
+
+    Επιστρέφει None αν το artifact λείπει ή δημιουργήθηκε από διαφορετικό dataset.
+
+    """
+    meta = read_meta(path)
+    if meta is None or meta.get("fingerprint") != dataset_fingerprint():
+        return None
+
+    arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r" if mmap else None) for name in names}
+    vocab = None
+    vocab_path = path / "vocab.txt"
+    if vocab_path.exists():
+        text = vocab_path.read_text(encoding="utf-8")
+        vocab = text.split("\n") if text else []
+    return arrays, meta, vocab
@@ -0,0 +1,82 @@
+"""
+Εντολή γραμμής για τη δημιουργία των παραγόμενων αρχείων από το dataset.
+
+Χρήση (από τον φάκελο backend):
+    python -m app.core.build snapshot docs facets sampling tokens index positions cube members tfidf lsi ann evolution clusters duplicates
+
+"""
+
+import argparse
+import time
+
+from app.core.data_loader import write_snapshot
+from app.core.token_store import build_token_store, save_token_store
+from app.core.inverted_index import build_index, save_index
+from app.core.positions import build_positional_index
+from app.core.term_cube import build_term_cube, save_term_cube
+from app.core.member_similarity import build_member_neighbours, save_member_neighbours
+from app.core.tfidf import build_tfidf_space, save_tfidf_space
+from app.core.lsi_model import build_lsi_model
+from app.core.ann_index import build_ann_index
+from app.core.topic_evolution import build_topic_evolution
+from app.core.doc_store import build_doc_store
+from app.core.facets import build_facets, save_facets
+from app.core.sampling import build_sampling_index, save_sampling_index
+from app.core.clusters import build_clusters
+from app.core.duplicates import build_duplicate_index
+
+def build_tokens():
+    return save_token_store(build_token_store())
+
+def build_inverted_index():
+    return save_index(build_index())
+
+def build_cube():
+    return save_term_cube(build_term_cube())
+
+def build_members():
+    return save_member_neighbours(build_member_neighbours())
+
+def build_facet_index():
+    return save_facets(build_facets())
+
+def build_sampling():
+    return save_sampling_index(build_sampling_index())
+
+def build_tfidf():
+    return save_tfidf_space(build_tfidf_space())
+
+TARGETS = {
+    "snapshot": write_snapshot,
+    "docs": build_doc_store,
+    "facets": build_facet_index,
+    "sampling": build_sampling,
+    "tokens": build_tokens,
+    "index": build_inverted_index,
+    "positions": build_positional_index,
+    "cube": build_cube,
+    "members": build_members,
+    "tfidf": build_tfidf,
+    "lsi": build_lsi_model,
+    "ann": build_ann_index,
+    "evolution": build_topic_evolution,
+    "clusters": build_clusters,
+    "duplicates": build_duplicate_index,
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Δημιουργία ευρετηρίων του Greek Parliament IR")
+    parser.add_argument("targets", nargs="*", help=f"ένα ή περισσότερα από: {', '.join(TARGETS)} (προεπιλογή: όλα)")
+    args = parser.parse_args(argv)
+
+    unknown = [t for t in args.targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"άγνωστοι στόχοι: {', '.join(unknown)}")
+
+    for target in args.targets or list(TARGETS):
+        start = time.perf_counter()
+        path = TARGETS[target]()
+        print(f"{target}: {path} ({time.perf_counter() - start:.1f}s)")
+
+if __name__ == "__main__":
+    main()
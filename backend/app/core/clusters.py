@@ -0,0 +1,197 @@
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import DATA_DIR, load_df
+from app.core.tfidf import get_tfidf_space
+from app.core.token_store import get_token_store
+
+# Φάκελος αποθήκευσης του μοντέλου ομαδοποίησης
+CLUSTERS_DIR = DATA_DIR / "clusters"
+
+# Παράμετροι του MiniBatch K-Means
+N_CLUSTERS = 20
+BATCH_SIZE = 2048
+N_EPOCHS = 3
+RANDOM_STATE = 42
+
+# Πλήθος ομιλιών ανά τμήμα (η μνήμη εξαρτάται από αυτό και όχι από το μέγεθος του corpus)
+BUILD_CHUNK_DOCS = 20_000
+
+CLUSTERS_CACHE = None
+
+def iter_chunks(doc_ids, chunk_size: int = BUILD_CHUNK_DOCS):
+    for start in range(0, len(doc_ids), chunk_size):
+        yield doc_ids[start:start + chunk_size]
+
+class ClusterModel:
+    """
+    Ομαδοποίηση ολόκληρου του corpus (MiniBatch K-Means στον κοινό χώρο TF-IDF).
+
+    - centroids: κέντρα ομάδων (n_clusters × n_features)
+    - labels / similarities: ομάδα κάθε ομιλίας και cosine similarity με το κέντρο της
+    - order / offsets: οι ομιλίες ταξινομημένες ανά ομάδα (και φθίνουσα similarity)·
+      τα μέλη της ομάδας c είναι order[offsets[c]:offsets[c + 1]]
+    - years / year_sizes: μέγεθος κάθε ομάδας ανά έτος (n_years × n_clusters)
+
+    """
+
+    def __init__(self, centroids, labels, similarities, order, offsets, years, year_sizes, space, meta=None):
+        self.centroids = centroids
+        self.labels = labels
+        self.similarities = similarities
+        self.order = order
+        self.offsets = offsets
+        self.years = years
+        self.year_sizes = year_sizes
+        self.space = space
+        self.meta = meta or {}
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.labels)
+
+    def sizes(self):
+        return np.diff(self.offsets)
+
+    def terms(self, cluster_id: int, top_terms: int, store=None) -> list[str]:
+        if store is None:
+            store = get_token_store()
+        top_idx = np.argsort(-self.centroids[cluster_id], kind="stable")[:top_terms]
+        return [store.vocab[self.space.feature_ids[j]] for j in top_idx]
+
+    def clusters(self, top_terms: int) -> list[dict]:
+        sizes = self.sizes()
+        return [
+            {"cluster_id": i, "terms": self.terms(i, top_terms), "size": int(sizes[i])}
+            for i in range(self.n_clusters)
+        ]
+
+    def members(self, cluster_id: int, offset: int = 0, limit: int = 10):
+        """
+        Ομιλίες της ομάδας (οι πιο αντιπροσωπευτικές πρώτες) και η similarity τους με το κέντρο.
+
+        """
+        start = self.offsets[cluster_id] + offset
+        end = min(start + limit, self.offsets[cluster_id + 1])
+        doc_ids = np.asarray(self.order[start:end])
+        return doc_ids, self.similarities[doc_ids]
+
+    def timeline(self, start_year=None, end_year=None):
+        keep = np.ones(len(self.years), dtype=bool)
+        if start_year is not None:
+            keep &= self.years >= start_year
+        if end_year is not None:
+            keep &= self.years <= end_year
+        return self.years[keep], self.year_sizes[keep]
+
+def fit_centroids(space, store, n_clusters: int):
+    """
+    Εκπαίδευση MiniBatch K-Means σε όλο το corpus με φραγμένη μνήμη.
+
+    Σε κάθε εποχή οι ομιλίες ανακατεύονται (το corpus είναι ταξινομημένο χρονολογικά),
+    μετατρέπονται σε TF-IDF ανά τμήμα και τροφοδοτούνται στο partial_fit σε mini-batches.
+
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters, batch_size=BATCH_SIZE, n_init=3, random_state=RANDOM_STATE
+    )
+    for _ in range(N_EPOCHS):
+        for doc_ids in iter_chunks(rng.permutation(store.n_docs)):
+            X = space.transform(doc_ids, store)
+            for start in range(0, X.shape[0], BATCH_SIZE):
+                batch = X[start:start + BATCH_SIZE]
+                # Η αρχικοποίηση (k-means++) χρειάζεται τουλάχιστον n_clusters ομιλίες
+                if batch.shape[0] >= n_clusters or hasattr(kmeans, "cluster_centers_"):
+                    kmeans.partial_fit(batch)
+    return kmeans.cluster_centers_.astype(np.float32)
+
+def build_clusters(path=CLUSTERS_DIR, space=None, store=None):
+    """
+    Δημιουργία και αποθήκευση της ομαδοποίησης ολόκληρου του corpus (βήμα build).
+
+    1. MiniBatch K-Means σε τμήματα ομιλιών (φραγμένη μνήμη)
+    2. Ανάθεση κάθε ομιλίας στο πλησιέστερο κέντρο, τμηματικά, απευθείας σε memory-mapped αρχεία
+    3. Ταξινόμηση των ομιλιών ανά ομάδα και υπολογισμός μεγέθους ομάδων ανά έτος
+
+    """
+    if space is None:
+        space = get_tfidf_space()
+    if store is None:
+        store = get_token_store()
+
+    n_clusters = min(N_CLUSTERS, store.n_docs)
+    centroids = fit_centroids(space, store, n_clusters)
+    # Οι ομιλίες έχουν μοναδιαίο μήκος, οπότε cosine similarity = X · c / |c|
+    norms = np.linalg.norm(centroids, axis=1)
+    norms[norms == 0] = 1
+    unit_centroids = (centroids / norms[:, None]).T
+
+    meta = {"n_clusters": n_clusters, "n_docs": store.n_docs}
+    with artifact_writer(path, meta) as tmp:
+        np.save(tmp / "centroids.npy", centroids)
+        labels = np.lib.format.open_memmap(tmp / "labels.npy", mode="w+", dtype=np.int16, shape=(store.n_docs,))
+        similarities = np.lib.format.open_memmap(
+            tmp / "similarities.npy", mode="w+", dtype=np.float32, shape=(store.n_docs,)
+        )
+        for doc_ids in iter_chunks(np.arange(store.n_docs)):
+            # Ο K-Means ελαχιστοποιεί την ευκλείδεια απόσταση· για μοναδιαία διανύσματα
+            # η ανάθεση γίνεται στο κέντρο με το μέγιστο X · c - |c|² / 2
+            X = space.transform(doc_ids, store)
+            products = np.asarray(X @ centroids.T)
+            chunk_labels = np.argmax(products - 0.5 * (centroids ** 2).sum(axis=1), axis=1)
+            labels[doc_ids] = chunk_labels
+            similarities[doc_ids] = products[np.arange(len(doc_ids)), chunk_labels] / norms[chunk_labels]
+
+        order = np.lexsort((-similarities, labels)).astype(np.int32)
+        offsets = np.zeros(n_clusters + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(labels, minlength=n_clusters))
+        np.save(tmp / "order.npy", order)
+        np.save(tmp / "offsets.npy", offsets)
+
+        doc_years = load_df()["year"].to_numpy()
+        years, year_codes = np.unique(doc_years, return_inverse=True)
+        year_sizes = np.bincount(
+            year_codes * n_clusters + labels, minlength=len(years) * n_clusters
+        ).reshape(len(years), n_clusters)
+        np.save(tmp / "years.npy", years.astype(np.int16))
+        np.save(tmp / "year_sizes.npy", year_sizes.astype(np.int64))
+
+        labels.flush()
+        similarities.flush()
+        del labels, similarities
+    return path
+
+def load_clusters(path=CLUSTERS_DIR):
+    loaded = read_artifact(
+        path, ["centroids", "labels", "similarities", "order", "offsets", "years", "year_sizes"]
+    )
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return ClusterModel(
+        centroids=np.asarray(arrays["centroids"]),
+        labels=arrays["labels"],
+        similarities=arrays["similarities"],
+        order=arrays["order"],
+        offsets=np.asarray(arrays["offsets"]),
+        years=np.asarray(arrays["years"]),
+        year_sizes=np.asarray(arrays["year_sizes"]),
+        space=get_tfidf_space(),
+        meta=meta,
+    )
+
+def get_clusters() -> ClusterModel:
+    global CLUSTERS_CACHE
+    if CLUSTERS_CACHE is None:
+        model = load_clusters()
+        if model is None:
+            build_clusters()
+            model = load_clusters()
+        CLUSTERS_CACHE = model
+    return CLUSTERS_CACHE
@@ -1,33 +1,176 @@
+import hashlib
+import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
 from pathlib import Path
+from app.core.metrics import stage
+
+# Φάκελος δεδομένων (dataset και παραγόμενα αρχεία ευρετηρίων)·
+# το PARLIAMENT_DATA_DIR επιτρέπει άλλον φάκελο (π.χ. συνθετικό corpus για benchmarks)
+DATA_DIR = Path(os.environ.get("PARLIAMENT_DATA_DIR") or Path(__file__).resolve().parents[2] / "data")
 
 # Διαδρομή προς το αρχείο dataset του Ελληνικού Κοινοβουλίου
-DATASET_PATH = Path(__file__).resolve().parents[2] / "data" / "Greek_Parliament_Proceedings_1989_2020.csv"
+DATASET_PATH = DATA_DIR / "Greek_Parliament_Proceedings_1989_2020.csv"
+
+# Columnar binary snapshot (Arrow IPC / Feather v2) του dataset
+SNAPSHOT_PATH = DATA_DIR / "Greek_Parliament_Proceedings_1989_2020.arrow"
+
+# Έκδοση της μορφής του DataFrame (αλλάζει όταν αλλάζει η προ-επεξεργασία των γραμμών)
+FRAME_VERSION = 3
+
+COLUMNS = ["speech", "member_name", "political_party", "sitting_date"]
+
+DATE_FORMAT = "%d/%m/%Y"
 
 DF_CACHE = None
 
+def read_csv(path=DATASET_PATH) -> pd.DataFrame:
+    return pd.read_csv(
+        path,
+        encoding="utf-8",
+        usecols=COLUMNS,
+        dtype={
+            "speech": "string",
+            "member_name": "string",
+            "political_party": "string",
+            "sitting_date": "string",
+        },
+    )
+
+def prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Προ-επεξεργασία των γραμμών του dataset σε ενιαία μορφή.
+
+    1. Αφαιρεί γραμμές με κενά πεδία (speech, member_name, political_party, sitting_date)
+    2. Μετατρέπει το sitting_date σε ημερομηνία και προσθέτει στήλη year (int16)
+    3. Αφαιρεί γραμμές με μη έγκυρη ημερομηνία
+    4. Κωδικοποιεί τα member_name / political_party ως categorical
+    5. Αποθηκεύει τις ομιλίες σε Arrow string στήλη (χωρίς Python αντικείμενα ανά ομιλία)
+    6. Κρατάει ως speech_id τον αριθμό γραμμής στο CSV: σταθερό αναγνωριστικό, που δεν
+       αλλάζει όταν αλλάζει ο χειρισμός των κενών/μη έγκυρων γραμμών
+
+    """
+    df = df.dropna(subset=COLUMNS)
+    dates = pd.to_datetime(df["sitting_date"], dayfirst=True, errors="coerce")
+    df = df[dates.notna()]
+    dates = dates[dates.notna()]
+
+    return pd.DataFrame({
+        "speech_id": df.index.to_numpy(dtype="int64"),
+        "speech": df["speech"].astype("string[pyarrow]"),
+        "member_name": df["member_name"].astype("category"),
+        "political_party": df["political_party"].astype("category"),
+        "sitting_date": dates.dt.normalize(),
+        "year": dates.dt.year.astype("int16"),
+    }).reset_index(drop=True)
+
+def csv_fingerprint() -> str:
+    stat = DATASET_PATH.stat()
+    key = f"{DATASET_PATH.name}:{stat.st_size}:{stat.st_mtime_ns}:{FRAME_VERSION}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def snapshot_fingerprint():
+    if not SNAPSHOT_PATH.exists():
+        return None
+    metadata = feather.read_table(SNAPSHOT_PATH, columns=[], memory_map=True).schema.metadata or {}
+    fingerprint = metadata.get(b"fingerprint")
+    return fingerprint.decode("utf-8") if fingerprint else None
+
+def dataset_fingerprint() -> str:
+    """
+    Αποτύπωμα (fingerprint) του dataset για έλεγχο εγκυρότητας παραγόμενων αρχείων.
+
+    Βασίζεται στο μέγεθος και στον χρόνο τροποποίησης του CSV,
+    ώστε να μη χρειάζεται ανάγνωση ολόκληρου του αρχείου. Αν υπάρχει μόνο
+    το snapshot, χρησιμοποιείται το fingerprint που είναι αποθηκευμένο σε αυτό.
+
+    """
+    if DATASET_PATH.exists():
+        return csv_fingerprint()
+    return snapshot_fingerprint()
+
+def write_snapshot(path=SNAPSHOT_PATH):
+    """
+    Μετατροπή του CSV σε columnar binary snapshot (εκτελείται μία φορά).
+
+    1. Διαβάζει το CSV και εφαρμόζει την προ-επεξεργασία του prepare_frame
+    2. Γράφει Arrow IPC αρχείο χωρίς συμπίεση, ώστε να φορτώνεται με memory-mapping
+    3. Καταγράφει το fingerprint του CSV στα μεταδεδομένα του schema
+
+    """
+    table = pa.Table.from_pandas(prepare_frame(read_csv()), preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b"fingerprint": csv_fingerprint().encode("utf-8"),
+    })
+    tmp = path.with_name(path.name + ".tmp")
+    feather.write_feather(table, tmp, compression="uncompressed")
+    tmp.replace(path)
+    return path
+
+def read_snapshot(path=SNAPSHOT_PATH) -> pd.DataFrame:
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(
+        types_mapper={pa.string(): pd.StringDtype("pyarrow"), pa.large_string(): pd.StringDtype("pyarrow")}.get
+    )
+
+def snapshot_is_fresh() -> bool:
+    fingerprint = snapshot_fingerprint()
+    if fingerprint is None:
+        return False
+    return not DATASET_PATH.exists() or fingerprint == csv_fingerprint()
+
 def load_df():
     global DF_CACHE
     if DF_CACHE is None:
-        DF_CACHE = pd.read_csv(
-            DATASET_PATH,
-            encoding="utf-8",
-            usecols=["speech", "member_name", "political_party", "sitting_date"],
-            dtype={
-                "speech": "string",
-                "member_name": "string",
-                "political_party": "string",
-                "sitting_date": "string",
-            },
-        )
+        if snapshot_is_fresh():
+            with stage("read_snapshot"):
+                DF_CACHE = read_snapshot()
+        else:
+            with stage("read_csv"):
+                df = read_csv()
+            with stage("prepare_frame"):
+                DF_CACHE = prepare_frame(df)
     return DF_CACHE
 
+def to_records(df: pd.DataFrame) -> list[dict]:
+    """
+    Μετατροπή γραμμών σε λίστα λεξικών για JSON απόκριση (ημερομηνίες ως dd/mm/yyyy).
+
+    """
+    df = df.copy()
+    if "sitting_date" in df:
+        df["sitting_date"] = df["sitting_date"].dt.strftime(DATE_FORMAT)
+    for column in ("member_name", "political_party"):
+        if column in df:
+            df[column] = df[column].astype(str)
+    return df.to_dict(orient="records")
+
+def speech_results(doc_ids, scores=None, snippet_length: int = 300, df=None) -> list[dict]:
+    """
+    Αποτελέσματα αναζήτησης (speech_id, ημερομηνία, μέλος, κόμμα, snippet, score) για τις δοσμένες ομιλίες, με τη σειρά τους.
+
+    Το df είναι το DataFrame στο οποίο αντιστοιχούν τα doc ids (προεπιλογή: load_df()).
+    Χωρίς scores (π.χ. λίστες ομιλιών μιας ομάδας) τα αποτελέσματα δεν έχουν score.
+
+    """
+    if df is None:
+        df = load_df()
+    columns = ["speech_id", "sitting_date", "member_name", "political_party", "snippet"]
+    with stage("results"):
+        results_df = df.iloc[doc_ids][["speech_id", "sitting_date", "member_name", "political_party", "speech"]].copy()
+        if scores is not None:
+            results_df["score"] = [round(float(score), 4) for score in scores]
+            columns.append("score")
+        results_df["snippet"] = results_df["speech"].astype(str).str.slice(0, snippet_length)
+        return to_records(results_df[columns])
+
 def load_sample(n: int = 5):
     df = load_df()
-    return df.head(n).to_dict(orient="records")
+    return to_records(df.head(n)[["speech", "member_name", "political_party", "sitting_date"]])
 
 def load_speeches(n: int = 10):
     df = load_df()
-    df = df.dropna(subset=["speech", "member_name", "political_party", "sitting_date"])
     sample = df.head(n)[["sitting_date", "member_name", "political_party", "speech"]]
-    return sample.to_dict(orient="records")
\ No newline at end of file
+    return to_records(sample)
@@ -0,0 +1,181 @@
+"""
+Χαρακτηριστικοί όροι ενός τμήματος του corpus σε σύγκριση με ένα άλλο (distinctive terms).
+
+Κάθε τμήμα (διάστημα ετών, προαιρετικά με κόμμα ή μέλος) είναι ένα διάνυσμα συχνοτήτων
+όρων από τον κύβο συχνοτήτων (άθροισμα λίγων γραμμών). Η σύγκριση δύο τμημάτων γίνεται με
+πράξεις πινάκων σε ολόκληρο το λεξιλόγιο:
+- log_likelihood: Dunning G² (με πρόσημο: θετικό όταν ο όρος είναι συχνότερος στο τμήμα)
+- log_odds: weighted log-odds ratio με Dirichlet prior από τις συχνότητες όλου του corpus
+  (Monroe et al.), ως z-score
+- tfidf: διαφορά των σχετικών συχνοτήτων (ανά 1000 όρους) × idf από τα document
+  frequencies όλου του corpus
+
+Οι γενικοί όροι της Βουλής, που κυριαρχούν στις απλές συχνότητες, έχουν παρόμοια σχετική
+συχνότητα στα δύο τμήματα και άρα μικρό score.
+
+"""
+
+import numpy as np
+from scipy.special import xlogy
+
+from app.core.metrics import stage
+from app.core.segments import get_live_corpus
+
+METHODS = ("log_likelihood", "log_odds", "tfidf")
+
+# Ελάχιστη συνολική συχνότητα (στα δύο τμήματα) για να εξεταστεί ένας όρος
+MIN_COUNT = 5
+
+# Συνολικό βάρος (ψευδο-εμφανίσεις) του prior στο log-odds
+LOG_ODDS_PRIOR = 10_000
+
+def log_likelihood(target, reference, **_):
+    """
+    Dunning log-likelihood (G²) ανά όρο, με το πρόσημο της διαφοράς των σχετικών συχνοτήτων.
+
+    """
+    target_total, reference_total = target.sum(), reference.sum()
+    combined = target + reference
+    expected_target = target_total * combined / (target_total + reference_total)
+    expected_reference = reference_total * combined / (target_total + reference_total)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        g2 = 2 * (xlogy(target, target / expected_target) + xlogy(reference, reference / expected_reference))
+    sign = np.sign(target * reference_total - reference * target_total)
+    return np.nan_to_num(g2) * sign
+
+def log_odds(target, reference, background, **_):
+    """
+    Weighted log-odds ratio με informative Dirichlet prior (z-score ανά όρο).
+
+    Ο prior κάθε όρου είναι ανάλογος της συχνότητάς του σε όλο το corpus, με συνολικό
+    βάρος LOG_ODDS_PRIOR· έτσι οι σπάνιοι όροι δεν έχουν ακραίες τιμές.
+
+    """
+    alpha = LOG_ODDS_PRIOR * background / max(background.sum(), 1)
+    target_total, reference_total = target.sum(), reference.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (
+            np.log(target + alpha) - np.log(target_total + LOG_ODDS_PRIOR - target - alpha)
+            - np.log(reference + alpha) + np.log(reference_total + LOG_ODDS_PRIOR - reference - alpha)
+        )
+        variance = 1 / (target + alpha) + 1 / (reference + alpha)
+        return np.nan_to_num(delta / np.sqrt(variance), posinf=0, neginf=0)
+
+def tfidf_contrast(target, reference, doc_freqs, n_docs: int, **_):
+    """
+    Διαφορά σχετικών συχνοτήτων (ανά 1000 όρους) σταθμισμένη με το idf του όρου.
+
+    """
+    idf = np.log((1 + n_docs) / (1 + doc_freqs)) + 1
+    rate = 1000 * (target / max(target.sum(), 1) - reference / max(reference.sum(), 1))
+    return rate * idf
+
+SCORERS = {"log_likelihood": log_likelihood, "log_odds": log_odds, "tfidf": tfidf_contrast}
+
+def top_scores(scores, eligible, top_n: int):
+    """
+    Οι top_n όροι με το μεγαλύτερο θετικό score (argpartition, χωρίς πλήρη ταξινόμηση).
+
+    """
+    scores = np.where(eligible & (scores > 0), scores, 0)
+    top_n = min(top_n, int(np.count_nonzero(scores)))
+    if top_n <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-scores, top_n - 1)[:top_n]
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+def slice_counts(live, party: str | None = None, member: str | None = None, start_year=None, end_year=None):
+    """
+    Διάνυσμα συχνοτήτων και πλήθος ομιλιών ενός τμήματος, από τις γραμμές του κύβου.
+
+    """
+    facet, name = ("member", member) if member else ("party", party)
+    cube = live.cube(facet)
+    mask = cube.match(name) if name else None
+    counts, n_docs = cube.totals(cube.rows(mask, start_year, end_year))
+    return np.asarray(counts, dtype=np.float64), n_docs
+
+def describe(party, member, start_year, end_year, counts, n_docs) -> dict:
+    return {
+        "party": party,
+        "member": member,
+        "period": f"{start_year}-{end_year}",
+        "n_docs": n_docs,
+        "n_tokens": int(counts.sum()),
+    }
+
+def term_rows(live, term_ids, scores, target, reference) -> list[dict]:
+    target_total, reference_total = max(target.sum(), 1), max(reference.sum(), 1)
+    return [
+        {
+            "term": live.vocab[t],
+            "score": round(float(scores[t]), 3),
+            "count": int(target[t]),
+            "reference_count": int(reference[t]),
+            "per_million": round(float(target[t] * 1e6 / target_total), 1),
+            "reference_per_million": round(float(reference[t] * 1e6 / reference_total), 1),
+        }
+        for t in term_ids
+    ]
+
+def distinctive_terms(target: dict, reference: dict | None = None, method: str = "log_likelihood",
+                      top_n: int = 20, min_count: int = MIN_COUNT) -> dict:
+    """
+    Χαρακτηριστικοί όροι του τμήματος target σε σύγκριση με το reference.
+
+    1. Διανύσματα συχνοτήτων των δύο τμημάτων από τον κύβο συχνοτήτων (target / reference:
+       party ή member και start_year / end_year)
+    2. Χωρίς reference, η σύγκριση γίνεται με το υπόλοιπο corpus: με κόμμα ή μέλος, με τις
+       υπόλοιπες ομιλίες του ίδιου διαστήματος· χωρίς αυτά, με τα υπόλοιπα έτη
+    3. Score για όλο το λεξιλόγιο με τη μέθοδο (log_likelihood, log_odds, tfidf)
+    4. Επιστρέφει τους top_n όρους με το μεγαλύτερο score για κάθε πλευρά (λέξεις-κλειδιά,
+       με τουλάχιστον min_count εμφανίσεις στα δύο τμήματα)· οι όροι του reference έχουν
+       αρνητικό score
+
+    Αν κάποιο από τα δύο τμήματα δεν έχει όρους, επιστρέφει σφάλμα αντί για κενή λίστα.
+
+    """
+    live = get_live_corpus()
+    with stage("cube"):
+        target_counts, target_docs = slice_counts(live, **target)
+        period_only = not (target["party"] or target["member"])
+        # Συχνότητες όλου του corpus: prior του log-odds και υπόλοιπο corpus για ένα διάστημα ετών
+        corpus_counts, corpus_docs = None, None
+        if method == "log_odds" or (reference is None and period_only):
+            corpus_counts, corpus_docs = slice_counts(live)
+        if reference is None:
+            if period_only:
+                period_counts, period_docs = corpus_counts, corpus_docs
+            else:
+                period_counts, period_docs = slice_counts(live, start_year=target["start_year"], end_year=target["end_year"])
+            reference_counts, reference_docs = period_counts - target_counts, period_docs - target_docs
+        else:
+            reference_counts, reference_docs = slice_counts(live, **reference)
+
+    # Κενό τμήμα (π.χ. όλα τα έτη χωρίς κόμμα ή μέλος έναντι του «υπόλοιπου» corpus): καμία σύγκριση
+    if not target_counts.any():
+        return {"error": "Target slice is empty"}
+    if not reference_counts.any():
+        return {"error": "Reference slice is empty"}
+
+    with stage("contrast"):
+        doc_freqs = live.doc_freqs() if method == "tfidf" else None
+        scores = SCORERS[method](
+            target_counts, reference_counts,
+            background=corpus_counts, doc_freqs=doc_freqs, n_docs=live.n_docs,
+        )
+        eligible = live.keyword_mask & (target_counts + reference_counts >= min_count)
+        target_terms = top_scores(scores, eligible, top_n)
+        reference_terms = top_scores(-scores, eligible, top_n)
+
+    return {
+        "analysis": "distinctive_terms",
+        "method": method,
+        "target": describe(**target, counts=target_counts, n_docs=target_docs),
+        "reference": (
+            describe(**reference, counts=reference_counts, n_docs=reference_docs) if reference is not None
+            else {"rest": True, "n_docs": reference_docs, "n_tokens": int(reference_counts.sum())}
+        ),
+        "terms": term_rows(live, target_terms, scores, target_counts, reference_counts),
+        "reference_terms": term_rows(live, reference_terms, scores, target_counts, reference_counts),
+    }
@@ -0,0 +1,170 @@
+"""
+Αποθήκη ομιλιών (document store) με ανάκτηση κατά σταθερό speech_id.
+
+Τα κείμενα αποθηκεύονται συμπιεσμένα (zlib) σε μπλοκ BLOCK_DOCS ομιλιών μέσα σε ένα
+αρχείο (texts.bin) που φορτώνεται με memory-mapping, οπότε δεν κρατιούνται στη μνήμη
+της Python. Για κάθε ομιλία d:
+- d // block_docs: το μπλοκ της και text_starts[d] / text_lengths[d]: η θέση της (bytes UTF-8)
+  μέσα στο αποσυμπιεσμένο μπλοκ
+- block_offsets[b]: η θέση του μπλοκ b στο texts.bin
+- speech_ids, dates, member_codes, party_codes: μεταδεδομένα σε στήλες σταθερού πλάτους
+
+Το speech_id είναι ο αριθμός γραμμής στο CSV (αύξουσα σειρά)· η αντιστοίχιση σε doc id
+γίνεται με δυαδική αναζήτηση. Η ανάκτηση μιας ομιλίας αποσυμπιέζει ένα μπλοκ (με μικρό
+LRU cache για διαδοχικές αναγνώσεις).
+
+"""
+
+import mmap
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import DATA_DIR, DATE_FORMAT, load_df
+
+# Φάκελος αποθήκευσης της αποθήκης ομιλιών
+DOCS_DIR = DATA_DIR / "docs"
+
+# Πλήθος ομιλιών ανά συμπιεσμένο μπλοκ (μεγαλύτερα μπλοκ: καλύτερη συμπίεση, πιο αργή ανάκτηση)
+BLOCK_DOCS = 32
+
+COMPRESSION_LEVEL = 6
+
+# Πλήθος αποσυμπιεσμένων μπλοκ που κρατούνται στη μνήμη
+BLOCK_CACHE_SIZE = 256
+
+DOCS_CACHE = None
+
+class DocStore:
+    """
+    Ανάκτηση κειμένου και μεταδεδομένων ομιλιών κατά doc id ή σταθερό speech_id.
+
+    """
+
+    def __init__(self, texts, block_offsets, block_docs, text_starts, text_lengths,
+                 speech_ids, dates, member_codes, party_codes, members, parties):
+        self.texts = texts
+        self.block_offsets = block_offsets
+        self.block_docs = block_docs
+        self.text_starts = text_starts
+        self.text_lengths = text_lengths
+        self.speech_ids = speech_ids
+        self.dates = dates
+        self.member_codes = member_codes
+        self.party_codes = party_codes
+        self.members = members
+        self.parties = parties
+        self.block = lru_cache(maxsize=BLOCK_CACHE_SIZE)(self.decompress_block)
+
+    @property
+    def n_docs(self) -> int:
+        return len(self.speech_ids)
+
+    def decompress_block(self, block: int) -> bytes:
+        start, end = int(self.block_offsets[block]), int(self.block_offsets[block + 1])
+        return zlib.decompress(self.texts[start:end])
+
+    def doc_ids(self, speech_ids):
+        """
+        Doc ids των δοσμένων speech_ids (-1 για όσα δεν υπάρχουν), με δυαδική αναζήτηση.
+
+        """
+        speech_ids = np.asarray(speech_ids, dtype=np.int64)
+        positions = np.searchsorted(self.speech_ids, speech_ids)
+        positions = np.minimum(positions, max(self.n_docs - 1, 0))
+        found = (self.n_docs > 0) & (np.asarray(self.speech_ids[positions]) == speech_ids)
+        return np.where(found, positions, -1)
+
+    def text(self, doc_id: int) -> str:
+        start = int(self.text_starts[doc_id])
+        data = self.block(doc_id // self.block_docs)
+        return data[start:start + int(self.text_lengths[doc_id])].decode("utf-8")
+
+    def metadata(self, doc_id: int) -> dict:
+        return {
+            "speech_id": int(self.speech_ids[doc_id]),
+            "sitting_date": (np.datetime64(int(self.dates[doc_id]), "D").astype(object)).strftime(DATE_FORMAT),
+            "member_name": self.members[self.member_codes[doc_id]],
+            "political_party": self.parties[self.party_codes[doc_id]],
+        }
+
+    def get(self, doc_id: int) -> dict:
+        return {**self.metadata(doc_id), "speech": self.text(doc_id)}
+
+    def get_by_speech_id(self, speech_id: int):
+        doc_id = int(self.doc_ids([speech_id])[0])
+        return None if doc_id < 0 else self.get(doc_id)
+
+def build_doc_store(path=DOCS_DIR, df=None):
+    """
+    Δημιουργία της αποθήκης ομιλιών (βήμα build).
+
+    1. Κωδικοποιεί κάθε ομιλία σε UTF-8 και τις ομαδοποιεί σε μπλοκ BLOCK_DOCS ομιλιών
+    2. Συμπιέζει κάθε μπλοκ και το γράφει διαδοχικά στο texts.bin
+    3. Αποθηκεύει πίνακα θέσεων μπλοκ/ομιλιών και στήλες μεταδεδομένων σταθερού πλάτους
+
+    """
+    if df is None:
+        df = load_df()
+
+    n_docs = len(df)
+    n_blocks = (n_docs + BLOCK_DOCS - 1) // BLOCK_DOCS
+    block_offsets = np.zeros(n_blocks + 1, dtype=np.int64)
+    text_starts = np.zeros(n_docs, dtype=np.uint32)
+    text_lengths = np.zeros(n_docs, dtype=np.uint32)
+    speeches = df["speech"]
+
+    meta = {
+        "n_docs": n_docs,
+        "block_docs": BLOCK_DOCS,
+        "members": [str(m) for m in df["member_name"].cat.categories],
+        "parties": [str(p) for p in df["political_party"].cat.categories],
+    }
+    with artifact_writer(path, meta) as tmp:
+        with open(tmp / "texts.bin", "wb") as f:
+            for block in range(n_blocks):
+                start = block * BLOCK_DOCS
+                encoded = [s.encode("utf-8") for s in speeches.iloc[start:start + BLOCK_DOCS].tolist()]
+                lengths = np.array([len(e) for e in encoded], dtype=np.int64)
+                text_lengths[start:start + len(encoded)] = lengths
+                text_starts[start:start + len(encoded)] = np.cumsum(lengths) - lengths
+                compressed = zlib.compress(b"".join(encoded), COMPRESSION_LEVEL)
+                f.write(compressed)
+                block_offsets[block + 1] = block_offsets[block] + len(compressed)
+
+        np.save(tmp / "block_offsets.npy", block_offsets)
+        np.save(tmp / "text_starts.npy", text_starts)
+        np.save(tmp / "text_lengths.npy", text_lengths)
+        np.save(tmp / "speech_ids.npy", df["speech_id"].to_numpy(dtype=np.int64))
+        np.save(tmp / "dates.npy", df["sitting_date"].to_numpy().astype("datetime64[D]").astype(np.int32))
+        np.save(tmp / "member_codes.npy", df["member_name"].cat.codes.to_numpy().astype(np.int32))
+        np.save(tmp / "party_codes.npy", df["political_party"].cat.codes.to_numpy().astype(np.int32))
+    return path
+
+def load_doc_store(path=DOCS_DIR):
+    names = ["block_offsets", "text_starts", "text_lengths", "speech_ids", "dates", "member_codes", "party_codes"]
+    loaded = read_artifact(path, names)
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    with open(path / "texts.bin", "rb") as f:
+        texts = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if arrays["block_offsets"][-1] else b""
+    return DocStore(
+        texts=texts,
+        block_docs=meta["block_docs"],
+        members=meta["members"],
+        parties=meta["parties"],
+        **arrays,
+    )
+
+def get_doc_store() -> DocStore:
+    global DOCS_CACHE
+    if DOCS_CACHE is None:
+        store = load_doc_store()
+        if store is None:
+            build_doc_store()
+            store = load_doc_store()
+        DOCS_CACHE = store
+    return DOCS_CACHE
@@ -0,0 +1,332 @@
+"""
+Εντοπισμός σχεδόν διπλότυπων ομιλιών (MinHash / LSH).
+
+Ανακοινώσεις διαδικασίας και τροπολογίες που διαβάζονται αυτούσιες επαναλαμβάνονται σε πολλές
+συνεδριάσεις. Η σύγκριση όλων των ζευγών είναι αδύνατη, οπότε:
+- κάθε ομιλία γίνεται σύνολο shingles (διαδοχικές SHINGLE_SIZE λέξεις της ροής όρων του TokenStore)
+- η υπογραφή MinHash (NUM_PERM ελάχιστα τιμών κατακερματισμού) εκτιμά την ομοιότητα Jaccard
+  δύο ομιλιών ως το ποσοστό των θέσεων όπου οι υπογραφές τους συμπίπτουν
+- με LSH banding (BANDS ζώνες των ROWS τιμών) ομιλίες με ίδια ζώνη γίνονται υποψήφια ζεύγη,
+  οπότε συγκρίνονται μόνο ομιλίες με μεγάλη πιθανότητα ομοιότητας
+- οι ομάδες διπλοτύπων είναι οι συνεκτικές συνιστώσες των επιβεβαιωμένων ζευγών· σε κάθε
+  κάδο ζώνης ελέγχονται μόνο γραμμικά πολλά ζεύγη (κάθε ομιλία με την πρώτη και την προηγούμενη)
+
+Ο χρόνος δημιουργίας είναι γραμμικός στο μέγεθος του corpus και οι υπογραφές υπολογίζονται
+παράλληλα σε τμήματα ομιλιών. Ως αντιπρόσωπος κάθε ομάδας κρατιέται η πρώτη της ομιλία στο dataset·
+οι υπόλοιπες (redundant) παραλείπονται όταν ζητείται σύμπτυξη διπλοτύπων.
+
+"""
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import DATA_DIR, load_df
+from app.core.text_cleaner import map_batches
+from app.core.token_store import get_token_store
+
+# Φάκελος αποθήκευσης του ευρετηρίου διπλοτύπων
+DUPLICATES_DIR = DATA_DIR / "duplicates"
+
+# Μήκος shingle (διαδοχικοί όροι)· ομιλίες με λιγότερους όρους δεν ευρετηριάζονται
+SHINGLE_SIZE = 5
+
+# Υπογραφή MinHash: BANDS ζώνες των ROWS τιμών (κατώφλι LSH ≈ (1 / BANDS) ** (1 / ROWS) ≈ 0.77)
+BANDS = 8
+ROWS = 8
+NUM_PERM = BANDS * ROWS
+
+# Κατώφλι του LSH banding: κάτω από αυτή την ομοιότητα τα ζεύγη σπάνια γίνονται υποψήφια,
+# οπότε είναι και το ελάχιστο min_similarity που δέχονται τα endpoints
+LSH_THRESHOLD = round((1 / BANDS) ** (1 / ROWS), 2)
+
+# Ελάχιστη εκτιμώμενη ομοιότητα Jaccard για να θεωρηθούν δύο ομιλίες διπλότυπες
+DUPLICATE_THRESHOLD = 0.8
+
+# Πλήθος ομιλιών ανά τμήμα υπογραφών / ζευγών ανά τμήμα επιβεβαίωσης (φραγμένη μνήμη)
+BUILD_CHUNK_DOCS = 20_000
+VERIFY_CHUNK_PAIRS = 1_000_000
+
+# Παράμετροι κατακερματισμού (σταθεροί, ώστε οι υπογραφές να είναι συγκρίσιμες μεταξύ builds)
+HASH_SEED = 1989
+HASH_PRIME = np.uint64(0x9E3779B97F4A7C15)
+HASH_A = np.random.default_rng(HASH_SEED).integers(1, 2 ** 63, NUM_PERM, dtype=np.uint64) | np.uint64(1)
+HASH_B = np.random.default_rng(HASH_SEED + 1).integers(0, 2 ** 63, NUM_PERM, dtype=np.uint64)
+
+# Υπογραφή ομιλίας χωρίς shingles
+EMPTY = np.iinfo(np.uint32).max
+
+DUPLICATES_CACHE = None
+
+def shingle_hashes(tokens, offsets):
+    """
+    Τιμές κατακερματισμού όλων των shingles διαδοχικών ομιλιών.
+
+    Το offsets είναι τοπικό (offsets[0] = 0) στο tokens. Επιστρέφει (hashes, πλήθος shingles ανά ομιλία),
+    με τα shingles κάθε ομιλίας συνεχόμενα.
+
+    """
+    tokens = np.asarray(tokens, dtype=np.uint64) + np.uint64(1)
+    lengths = np.diff(offsets)
+    counts = np.maximum(lengths - SHINGLE_SIZE + 1, 0)
+    n = len(tokens) - SHINGLE_SIZE + 1
+    if n <= 0 or not counts.any():
+        return np.empty(0, dtype=np.uint64), counts
+
+    hashes = np.zeros(n, dtype=np.uint64)
+    for j in range(SHINGLE_SIZE):
+        hashes = hashes * HASH_PRIME + tokens[j:j + n]
+    doc_of = np.repeat(np.arange(len(lengths)), lengths)[:n]
+    position = np.arange(n) - np.asarray(offsets[:-1])[doc_of]
+    return hashes[position < counts[doc_of]], counts
+
+def minhash(hashes, counts):
+    """
+    Υπογραφές MinHash (ομιλίες × NUM_PERM, uint32) από τα shingles του shingle_hashes.
+
+    """
+    signatures = np.full((len(counts), NUM_PERM), EMPTY, dtype=np.uint32)
+    has_shingles = counts > 0
+    if not has_shingles.any():
+        return signatures
+    starts = (np.cumsum(counts) - counts)[has_shingles]
+    for p in range(NUM_PERM):
+        values = ((hashes * HASH_A[p] + HASH_B[p]) >> np.uint64(32)).astype(np.uint32)
+        signatures[has_shingles, p] = np.minimum.reduceat(values, starts)
+    return signatures
+
+def document_signature(tokens):
+    """
+    Υπογραφή MinHash μίας ομιλίας από τα term ids της.
+
+    """
+    return minhash(*shingle_hashes(tokens, np.array([0, len(tokens)])))[0]
+
+def band_keys(signatures):
+    """
+    Κλειδί (uint64) κάθε ζώνης της υπογραφής: πίνακας ομιλίες × BANDS.
+
+    """
+    values = np.asarray(signatures).astype(np.uint64).reshape(len(signatures), BANDS, ROWS)
+    keys = np.zeros((len(signatures), BANDS), dtype=np.uint64)
+    for r in range(ROWS):
+        keys = (keys ^ values[:, :, r]) * HASH_PRIME
+    return keys
+
+def similarities(signature, signatures):
+    """
+    Εκτιμώμενη ομοιότητα Jaccard μιας υπογραφής με πολλές (ποσοστό ίδιων θέσεων).
+
+    """
+    return (np.asarray(signatures) == signature).mean(axis=1)
+
+def signature_chunk(starts: list):
+    """
+    Υπογραφές των ομιλιών [start, start + BUILD_CHUNK_DOCS) (εκτελείται στο process pool).
+
+    """
+    store = get_token_store()
+    start = starts[0]
+    end = min(start + BUILD_CHUNK_DOCS, store.n_docs)
+    offsets = np.asarray(store.offsets[start:end + 1], dtype=np.int64)
+    tokens = store.tokens[offsets[0]:offsets[-1]]
+    return minhash(*shingle_hashes(tokens, offsets - offsets[0]))
+
+class DuplicateIndex:
+    """
+    Υπογραφές MinHash, κάδοι LSH και ομάδες διπλοτύπων του βασικού corpus.
+
+    - keys[b] / docs[b]: τα κλειδιά της ζώνης b ταξινομημένα και οι αντίστοιχες ομιλίες
+    - cluster_of: ομάδα κάθε ομιλίας (-1 αν δεν έχει διπλότυπα)· οι ομάδες είναι ταξινομημένες
+      κατά μέγεθος και τα μέλη της ομάδας c είναι cluster_docs[cluster_offsets[c]:cluster_offsets[c + 1]]
+      (κατά doc id, με πρώτο τον αντιπρόσωπο)
+    - redundant: ταξινομημένα doc ids όλων των μελών ομάδων εκτός των αντιπροσώπων
+
+    """
+
+    def __init__(self, signatures, keys, docs, cluster_of, cluster_offsets, cluster_docs, redundant, meta=None):
+        self.signatures = signatures
+        self.keys = keys
+        self.docs = docs
+        self.cluster_of = cluster_of
+        self.cluster_offsets = cluster_offsets
+        self.cluster_docs = cluster_docs
+        self.redundant = redundant
+        self.meta = meta or {}
+
+    @property
+    def n_clusters(self) -> int:
+        return len(self.cluster_offsets) - 1
+
+    def sizes(self):
+        return np.diff(self.cluster_offsets)
+
+    def duplicate_count(self, doc_id: int) -> int:
+        """
+        Πλήθος των υπόλοιπων ομιλιών της ομάδας διπλοτύπων της ομιλίας (0 εκτός ομάδων και για τα segments).
+
+        """
+        if doc_id >= len(self.cluster_of) or self.cluster_of[doc_id] < 0:
+            return 0
+        return int(self.sizes()[self.cluster_of[doc_id]]) - 1
+
+    def members(self, cluster_id: int, offset: int = 0, limit: int = 10):
+        start = self.cluster_offsets[cluster_id]
+        return np.asarray(self.cluster_docs[start + offset:min(start + offset + limit, self.cluster_offsets[cluster_id + 1])])
+
+    def similar(self, signature, limit: int = 10, min_similarity: float = DUPLICATE_THRESHOLD, exclude: int = -1):
+        """
+        Ομιλίες με εκτιμώμενη ομοιότητα τουλάχιστον min_similarity με την υπογραφή.
+
+        1. Υποψήφιες είναι οι ομιλίες που μοιράζονται τουλάχιστον μία ζώνη (δυαδική αναζήτηση ανά ζώνη)
+        2. Για τις υποψήφιες υπολογίζεται η εκτιμώμενη ομοιότητα από τις υπογραφές
+        3. Επιστρέφονται (doc ids, ομοιότητες) κατά φθίνουσα ομοιότητα
+
+        """
+        if (signature == EMPTY).all():
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        query_keys = band_keys(signature[None, :])[0]
+        parts = []
+        for b in range(BANDS):
+            lo = np.searchsorted(self.keys[b], query_keys[b], side="left")
+            hi = np.searchsorted(self.keys[b], query_keys[b], side="right")
+            parts.append(np.asarray(self.docs[b][lo:hi], dtype=np.int64))
+        candidates = np.unique(np.concatenate(parts))
+        candidates = candidates[candidates != exclude]
+
+        scores = similarities(signature, self.signatures[candidates])
+        keep = scores >= min_similarity
+        candidates, scores = candidates[keep], scores[keep]
+        order = np.lexsort((candidates, -scores))[:limit]
+        return candidates[order], scores[order]
+
+def candidate_pairs(keys, docs):
+    """
+    Υποψήφια ζεύγη μιας ζώνης: σε κάθε κάδο, κάθε ομιλία με την πρώτη και με την προηγούμενη του κάδου.
+
+    """
+    same = np.concatenate(([False], keys[1:] == keys[:-1]))
+    first = np.maximum.accumulate(np.where(same, 0, np.arange(len(keys))))
+    rows = np.flatnonzero(same)
+    return np.concatenate((docs[rows], docs[rows])), np.concatenate((docs[first[rows]], docs[rows - 1]))
+
+def build_duplicate_index(path=DUPLICATES_DIR, store=None, workers: int | None = None):
+    """
+    Δημιουργία και αποθήκευση του ευρετηρίου διπλοτύπων (βήμα build).
+
+    1. Υπογραφές MinHash σε τμήματα ομιλιών, παράλληλα, απευθείας σε memory-mapped αρχείο
+    2. Για κάθε ζώνη: ταξινόμηση των ομιλιών κατά κλειδί (κάδοι LSH) και υποψήφια ζεύγη
+    3. Επιβεβαίωση των ζευγών με την εκτιμώμενη ομοιότητα (DUPLICATE_THRESHOLD)
+    4. Ομάδες διπλοτύπων ως συνεκτικές συνιστώσες των επιβεβαιωμένων ζευγών
+
+    """
+    if store is None:
+        store = get_token_store()
+    n_docs = store.n_docs
+
+    meta = {"n_docs": n_docs, "shingle_size": SHINGLE_SIZE, "bands": BANDS, "rows": ROWS, "threshold": DUPLICATE_THRESHOLD}
+    with artifact_writer(path, meta) as tmp:
+        signatures = np.lib.format.open_memmap(tmp / "signatures.npy", mode="w+", dtype=np.uint32, shape=(n_docs, NUM_PERM))
+        starts = range(0, n_docs, BUILD_CHUNK_DOCS)
+        for start, chunk in zip(starts, map_batches(signature_chunk, starts, chunk_size=1, workers=workers)):
+            signatures[start:start + len(chunk)] = chunk
+
+        indexed = np.flatnonzero(np.diff(store.offsets) >= SHINGLE_SIZE)
+        keys = np.empty((len(indexed), BANDS), dtype=np.uint64)
+        for i in range(0, len(indexed), BUILD_CHUNK_DOCS):
+            keys[i:i + BUILD_CHUNK_DOCS] = band_keys(signatures[indexed[i:i + BUILD_CHUNK_DOCS]])
+
+        band_keys_sorted = np.empty((BANDS, len(indexed)), dtype=np.uint64)
+        band_docs = np.empty((BANDS, len(indexed)), dtype=np.int32)
+        sources, targets = [], []
+        for b in range(BANDS):
+            order = np.argsort(keys[:, b], kind="stable")
+            band_keys_sorted[b] = keys[order, b]
+            band_docs[b] = indexed[order]
+            u, v = candidate_pairs(band_keys_sorted[b], band_docs[b])
+            sources.append(u)
+            targets.append(v)
+        del keys
+
+        pairs = np.unique(np.concatenate(sources).astype(np.int64) * n_docs + np.concatenate(targets)) if sources else np.empty(0, dtype=np.int64)
+        confirmed = []
+        for i in range(0, len(pairs), VERIFY_CHUNK_PAIRS):
+            chunk = pairs[i:i + VERIFY_CHUNK_PAIRS]
+            u, v = chunk // n_docs, chunk % n_docs
+            agreement = (signatures[u] == signatures[v]).mean(axis=1)
+            confirmed.append(chunk[agreement >= DUPLICATE_THRESHOLD])
+        confirmed = np.concatenate(confirmed) if confirmed else np.empty(0, dtype=np.int64)
+
+        graph = sparse.coo_matrix(
+            (np.ones(len(confirmed), dtype=np.int8), (confirmed // n_docs, confirmed % n_docs)), shape=(n_docs, n_docs)
+        )
+        _, components = connected_components(graph, directed=False)
+        component_sizes = np.bincount(components)
+        in_cluster = component_sizes[components] > 1
+
+        # Ομάδες κατά φθίνον μέγεθος (ισοβαθμίες: κατά την πρώτη ομιλία τους)
+        members = np.flatnonzero(in_cluster)
+        cluster_components, first_members = np.unique(components[members], return_index=True)
+        ranking = np.lexsort((members[first_members], -component_sizes[cluster_components]))
+        rank_of = np.full(len(component_sizes), -1, dtype=np.int32)
+        rank_of[cluster_components[ranking]] = np.arange(len(ranking))
+        cluster_of = rank_of[components].astype(np.int32)
+
+        cluster_docs = members[np.lexsort((members, cluster_of[members]))].astype(np.int32)
+        cluster_offsets = np.zeros(len(ranking) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cluster_of[members], minlength=len(ranking)), out=cluster_offsets[1:])
+        representatives = np.zeros(len(cluster_docs), dtype=bool)
+        representatives[cluster_offsets[:-1]] = True
+
+        meta.update(n_clusters=len(ranking), n_redundant=int(len(cluster_docs) - len(ranking)))
+        np.save(tmp / "keys.npy", band_keys_sorted)
+        np.save(tmp / "docs.npy", band_docs)
+        np.save(tmp / "cluster_of.npy", cluster_of)
+        np.save(tmp / "cluster_offsets.npy", cluster_offsets)
+        np.save(tmp / "cluster_docs.npy", cluster_docs)
+        np.save(tmp / "redundant.npy", np.sort(cluster_docs[~representatives]))
+        signatures.flush()
+        del signatures
+    return path
+
+def load_duplicate_index(path=DUPLICATES_DIR):
+    names = ["signatures", "keys", "docs", "cluster_of", "cluster_offsets", "cluster_docs", "redundant"]
+    loaded = read_artifact(path, names)
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return DuplicateIndex(meta=meta, **arrays)
+
+def get_duplicate_index() -> DuplicateIndex:
+    global DUPLICATES_CACHE
+    if DUPLICATES_CACHE is None:
+        index = load_duplicate_index()
+        if index is None:
+            build_duplicate_index()
+            index = load_duplicate_index()
+        DUPLICATES_CACHE = index
+    return DUPLICATES_CACHE
+
+def collapse_timeline(groups: list, doc_ids) -> list:
+    """
+    Χρονολογική σειρά συχνοτήτων (year, counts, n_docs) χωρίς τα διπλότυπα (εκτός αντιπροσώπων).
+
+    Από κάθε έτος αφαιρούνται οι συχνότητες όρων των redundant ομιλιών του doc_ids (ταξινομημένα
+    doc ids του μέλους / κόμματος), που είναι συνήθως λίγες.
+
+    """
+    duplicates = np.intersect1d(doc_ids, get_duplicate_index().redundant)
+    if len(duplicates) == 0:
+        return groups
+    store = get_token_store()
+    years = load_df()["year"].to_numpy()[duplicates]
+    collapsed = []
+    for year, counts, n_docs in groups:
+        year_docs = duplicates[years == year]
+        if len(year_docs):
+            counts = counts.copy()
+            counts[:store.n_terms] -= np.bincount(store.gather(year_docs), minlength=store.n_terms)
+            n_docs -= len(year_docs)
+        collapsed.append((year, counts, n_docs))
+    return collapsed
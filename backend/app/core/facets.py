@@ -0,0 +1,153 @@
+"""
+Ευρετήριο facets (μέλος, κόμμα) για φίλτρα αναζήτησης, επίλυση ονομάτων και autocomplete.
+
+Για κάθε facet κρατάει τις διακριτές τιμές (λίγες χιλιάδες ονόματα) και, ανά τιμή, τις ομιλίες
+της ως ταξινομημένο πίνακα doc ids (μορφή CSR: rows[offsets[v]:offsets[v + 1]]). Έτσι:
+- η επίλυση ενός ονόματος (NameMatcher) ελέγχει μόνο τα κανονικοποιημένα διακριτά ονόματα
+- ένα φίλτρο γίνεται σύνολο doc ids και εφαρμόζεται με τομή ταξινομημένων πινάκων,
+  χωρίς σάρωση στηλών κειμένου ανά αίτημα
+
+"""
+
+import numpy as np
+
+from app.core.artifacts import read_artifact, write_artifact
+from app.core.data_loader import DATA_DIR, load_df
+from app.core.text_cleaner import normalize
+
+# Φάκελος αποθήκευσης του ευρετηρίου facets
+FACETS_DIR = DATA_DIR / "facets"
+
+# Facets: όνομα → στήλη του DataFrame (κοινά με τις διαστάσεις του κύβου συχνοτήτων)
+FACETS = {"party": "political_party", "member": "member_name"}
+
+FACETS_CACHE = None
+
+class NameMatcher:
+    """
+    Αναζήτηση σε λίστα ονομάτων χωρίς διάκριση πεζών/κεφαλαίων και τόνων.
+
+    Τα ονόματα κανονικοποιούνται μία φορά (normalize), οπότε κάθε αναζήτηση είναι
+    ένας έλεγχος υποσυμβολοσειράς στα λίγα διακριτά ονόματα.
+
+    """
+
+    def __init__(self, labels):
+        self.labels = list(labels)
+        self.normalized = [normalize(str(label)) for label in self.labels]
+
+    def match(self, text: str) -> np.ndarray:
+        """
+        Κωδικοί (θέσεις στο labels) των ονομάτων που περιέχουν το text.
+
+        """
+        query = normalize(text)
+        if not query:
+            return np.empty(0, dtype=np.int64)
+        return np.array([i for i, name in enumerate(self.normalized) if query in name], dtype=np.int64)
+
+def isin_sorted(doc_ids, sorted_ids):
+    """
+    Μάσκα των doc_ids που ανήκουν στον ταξινομημένο πίνακα sorted_ids (τομή με δυαδική αναζήτηση).
+
+    """
+    if len(sorted_ids) == 0:
+        return np.zeros(len(doc_ids), dtype=bool)
+    positions = np.minimum(np.searchsorted(sorted_ids, doc_ids), len(sorted_ids) - 1)
+    return sorted_ids[positions] == doc_ids
+
+def rank_suggestions(text: str, counts: dict, limit: int) -> list[dict]:
+    """
+    Ταξινόμηση προτάσεων ονομάτων: πρώτα όσα ξεκινούν με το text, μετά τα υπόλοιπα, κατά πλήθος ομιλιών.
+
+    """
+    query = normalize(text)
+    ranked = sorted(counts.items(), key=lambda item: (not normalize(item[0]).startswith(query), -item[1], item[0]))
+    return [{"name": name, "count": count} for name, count in ranked[:limit]]
+
+class Facet:
+    """
+    Ομιλίες ανά τιμή ενός facet: rows[offsets[v]:offsets[v + 1]] είναι τα (ταξινομημένα) doc ids της τιμής v.
+
+    """
+
+    def __init__(self, labels, rows, offsets):
+        self.matcher = NameMatcher(labels)
+        self.rows = rows
+        self.offsets = offsets
+
+    @property
+    def labels(self) -> list[str]:
+        return self.matcher.labels
+
+    def counts(self):
+        return np.diff(self.offsets)
+
+    def doc_ids(self, codes):
+        """
+        Ταξινομημένα doc ids όλων των ομιλιών των δοσμένων τιμών.
+
+        """
+        parts = [self.rows[self.offsets[c]:self.offsets[c + 1]] for c in codes]
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts).astype(np.int64))
+
+    def filter(self, text: str):
+        return self.doc_ids(self.matcher.match(text))
+
+    def suggestions(self, text: str) -> dict:
+        """
+        Όλα τα ονόματα που περιέχουν το text, με το πλήθος ομιλιών τους.
+
+        """
+        counts = self.counts()
+        return {self.labels[c]: int(counts[c]) for c in self.matcher.match(text)}
+
+    def complete(self, text: str, limit: int = 10) -> list[dict]:
+        return rank_suggestions(text, self.suggestions(text), limit)
+
+def build_facet(values) -> Facet:
+    """
+    Facet από categorical στήλη: ομαδοποίηση των doc ids ανά κωδικό (σταθερή ταξινόμηση, οπότε ταξινομημένα ανά τιμή).
+
+    """
+    labels = [str(label) for label in values.cat.categories]
+    codes = values.cat.codes.to_numpy()
+    offsets = np.zeros(len(labels) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(labels)), out=offsets[1:])
+    return Facet(labels, np.argsort(codes, kind="stable").astype(np.int32), offsets)
+
+def build_facets(df=None) -> dict:
+    if df is None:
+        df = load_df()
+    return {name: build_facet(df[column]) for name, column in FACETS.items()}
+
+def save_facets(facets: dict, path=FACETS_DIR):
+    arrays = {}
+    meta = {}
+    for name, facet in facets.items():
+        arrays[f"{name}_rows"] = facet.rows
+        arrays[f"{name}_offsets"] = facet.offsets
+        meta[f"{name}_labels"] = facet.labels
+    return write_artifact(path, arrays, meta=meta)
+
+def load_facets(path=FACETS_DIR):
+    loaded = read_artifact(path, [f"{name}_{field}" for name in FACETS for field in ("rows", "offsets")])
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return {
+        name: Facet(meta[f"{name}_labels"], arrays[f"{name}_rows"], arrays[f"{name}_offsets"])
+        for name in FACETS
+    }
+
+def get_facets() -> dict:
+    global FACETS_CACHE
+    if FACETS_CACHE is None:
+        facets = load_facets()
+        if facets is None:
+            save_facets(build_facets())
+            facets = load_facets()
+        FACETS_CACHE = facets
+    return FACETS_CACHE
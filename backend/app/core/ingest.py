@@ -0,0 +1,41 @@
+"""
+Εντολή γραμμής για την εισαγωγή νέων συνεδριάσεων ως segments (χωρίς πλήρη δημιουργία ευρετηρίων).
+
+Χρήση (από τον φάκελο backend):
+    python -m app.core.ingest new_sittings.csv            # CSV με τις στήλες του dataset
+    python -m app.core.ingest --merge                     # συγχώνευση όλων των segments σε ένα
+
+Ο server (αν τρέχει) βλέπει τα νέα segments στο επόμενο αίτημα.
+
+"""
+
+import argparse
+import json
+import time
+
+from app.core.data_loader import read_csv
+from app.core.segments import ingest_batch, merge_candidates, merge_segments, read_manifest
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Εισαγωγή νέων ομιλιών ως segments")
+    parser.add_argument("paths", nargs="*", help="αρχεία CSV με τις στήλες του dataset")
+    parser.add_argument("--merge", action="store_true", help="συγχώνευση όλων των segments σε ένα")
+    parser.add_argument("--workers", type=int, default=None, help="διεργασίες για το tokenization")
+    args = parser.parse_args(argv)
+
+    if not args.paths and not args.merge:
+        parser.error("δώσε τουλάχιστον ένα αρχείο CSV ή --merge")
+
+    for path in args.paths:
+        start = time.perf_counter()
+        result = ingest_batch(read_csv(path), workers=args.workers)
+        print(f"{path}: {json.dumps(result, ensure_ascii=False)} ({time.perf_counter() - start:.1f}s)")
+
+    names = read_manifest()["segments"] if args.merge else merge_candidates(read_manifest())
+    if len(names) > 1:
+        start = time.perf_counter()
+        result = merge_segments(names)
+        print(f"merge: {json.dumps(result, ensure_ascii=False)} ({time.perf_counter() - start:.1f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+import math
+from collections import Counter
+
+import numpy as np
+
+from app.core.artifacts import read_artifact, write_artifact
+from app.core.data_loader import DATA_DIR
+from app.core.token_store import get_token_store
+
+# Φάκελος αποθήκευσης του ανεστραμμένου ευρετηρίου
+INDEX_DIR = DATA_DIR / "index"
+
+# Παράμετροι BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Πλήθος ομιλιών ανά τμήμα κατά τη δημιουργία του ευρετηρίου (φραγμένη μνήμη)
+BUILD_CHUNK_DOCS = 50_000
+
+# Πλήθος όρων ανά τμήμα κατά τον υπολογισμό των άνω φραγμάτων BM25
+BUILD_CHUNK_TERMS = 100_000
+
+INDEX_CACHE = None
+
+def bm25_idf(n_docs: int, doc_freq: int) -> float:
+    return math.log(1 + (n_docs - doc_freq + 0.5) / (doc_freq + 0.5))
+
+def bm25_weights(tfs, doc_lengths, avgdl: float):
+    """
+    Συνεισφορά BM25 (χωρίς τον παράγοντα idf) για postings με συχνότητες tfs σε ομιλίες μήκους doc_lengths.
+
+    """
+    tfs = tfs.astype(np.float32)
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / avgdl)
+    return tfs * (BM25_K1 + 1) / (tfs + norm)
+
+def bm25_term_scores(weight: float, tfs, doc_lengths, avgdl: float):
+    """
+    Συνεισφορά BM25 ενός όρου ερωτήματος (weight = qtf × idf) στα postings του, σε float32.
+
+    Είναι η κοινή συνάρτηση της εξαντλητικής αξιολόγησης και του κλαδέματος MaxScore: οι
+    συνεισφορές αθροίζονται σε float64 (ακριβώς, για τα λίγα float32 ενός ερωτήματος) και το
+    άθροισμα στρογγυλοποιείται σε float32, οπότε οι δύο δρόμοι δίνουν ίδια scores και ισοβαθμίες.
+
+    """
+    return (weight * bm25_weights(tfs, doc_lengths, avgdl)).astype(np.float32)
+
+def combine_scores(all_docs: list, all_scores: list):
+    """
+    Συγχώνευση των scores πολλών λιστών postings, αθροίζοντας ανά ομιλία (float64, αποτέλεσμα float32).
+
+    """
+    if not all_docs:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+    docs = np.concatenate(all_docs)
+    scores = np.concatenate(all_scores)
+    if len(all_docs) == 1:
+        return docs, scores.astype(np.float32)
+    unique_docs, inverse = np.unique(docs, return_inverse=True)
+    return unique_docs, np.bincount(inverse, weights=scores).astype(np.float32)
+
+class InvertedIndex:
+    """
+    Ανεστραμμένο ευρετήριο (term → postings) σε συμπαγείς πίνακες numpy.
+
+    Τα postings όλων των όρων αποθηκεύονται συνεχόμενα (μορφή CSR):
+    οι εγγραφές του όρου t βρίσκονται στο διάστημα
+    [term_offsets[t], term_offsets[t + 1]) των πινάκων doc_ids / term_freqs,
+    ταξινομημένες κατά doc id. Το doc id είναι η θέση της ομιλίας στο load_df()
+    και τα term ids είναι αυτά του κοινού λεξιλογίου του TokenStore.
+    Το max_weights[t] είναι το μέγιστο βάρος BM25 (χωρίς idf) του όρου t σε οποιαδήποτε
+    ομιλία, δηλαδή το άνω φράγμα που χρησιμοποιεί το κλάδεμα MaxScore.
+
+    """
+
+    def __init__(self, term_index, term_offsets, doc_ids, term_freqs, doc_lengths, max_weights, meta):
+        self.term_index = term_index
+        self.term_offsets = term_offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+        self.max_weights = max_weights
+        self.meta = meta
+        self.n_docs = int(meta["n_docs"])
+        self.avgdl = float(meta["avgdl"]) or 1.0
+
+    def term_id(self, term: str):
+        return self.term_index.get(term)
+
+    def doc_freq(self, term_id: int) -> int:
+        return int(self.term_offsets[term_id + 1] - self.term_offsets[term_id])
+
+    def postings(self, term_id: int):
+        start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+        return self.doc_ids[start:end], self.term_freqs[start:end]
+
+    def idf(self, term_id: int) -> float:
+        return bm25_idf(self.n_docs, self.doc_freq(term_id))
+
+    def bm25(self, terms: list[str]):
+        """
+        Βαθμολόγηση BM25 των ομιλιών που περιέχουν τουλάχιστον έναν όρο.
+
+        1. Αντιστοιχίζει τους όρους του ερωτήματος σε term ids (αγνοεί άγνωστους όρους)
+        2. Για κάθε όρο υπολογίζει τη συνεισφορά BM25 πάνω στα postings του
+        3. Συγχωνεύει τα postings όλων των όρων αθροίζοντας τα scores ανά ομιλία
+
+        Επιστρέφει (doc_ids, scores) μόνο για τις ομιλίες που ταιριάζουν,
+        οπότε το κόστος εξαρτάται από το πλήθος των postings και όχι από το μέγεθος του corpus.
+
+        """
+        query_tf = Counter(t for t in terms if t in self.term_index)
+
+        all_docs = []
+        all_scores = []
+        for term, qtf in query_tf.items():
+            term_id = self.term_index[term]
+            docs, tfs = self.postings(term_id)
+            all_docs.append(docs)
+            all_scores.append(bm25_term_scores(qtf * self.idf(term_id), tfs, self.doc_lengths[docs], self.avgdl))
+        return combine_scores(all_docs, all_scores)
+
+def term_max_weights(term_offsets, doc_ids, term_freqs, doc_lengths, avgdl: float):
+    """
+    Μέγιστο βάρος BM25 ανά όρο (0 για όρους χωρίς postings), σε τμήματα postings.
+
+    """
+    n_terms = len(term_offsets) - 1
+    max_weights = np.zeros(n_terms, dtype=np.float32)
+    nonempty = np.flatnonzero(np.diff(term_offsets))
+    for i in range(0, len(nonempty), BUILD_CHUNK_TERMS):
+        terms = nonempty[i:i + BUILD_CHUNK_TERMS]
+        start, end = term_offsets[terms[0]], term_offsets[terms[-1] + 1]
+        docs = doc_ids[start:end]
+        weights = bm25_weights(term_freqs[start:end], doc_lengths[docs], avgdl)
+        max_weights[terms] = np.maximum.reduceat(weights, term_offsets[terms] - start)
+    return max_weights
+
+def build_index(store=None) -> InvertedIndex:
+    """
+    Δημιουργία ανεστραμμένου ευρετηρίου από το tokenized corpus.
+
+    1. Διαβάζει τα term ids κάθε ομιλίας από το TokenStore (χωρίς επανακανονικοποίηση)
+    2. Μετράει τη συχνότητα (tf) κάθε όρου ανά ομιλία, σε τμήματα ομιλιών (chunks)
+    3. Ταξινομεί τις εγγραφές κατά όρο και δημιουργεί τους πίνακες postings (CSR)
+    4. Καταγράφει το μήκος κάθε ομιλίας για την κανονικοποίηση του BM25
+    5. Υπολογίζει το μέγιστο βάρος BM25 κάθε όρου (άνω φράγματα για το κλάδεμα)
+
+    """
+    if store is None:
+        store = get_token_store()
+
+    n_terms = store.n_terms
+    post_terms, post_docs, post_tfs = [], [], []
+    for start in range(0, store.n_docs, BUILD_CHUNK_DOCS):
+        doc_ids = np.arange(start, min(start + BUILD_CHUNK_DOCS, store.n_docs))
+        lengths = np.diff(store.offsets[doc_ids[0]:doc_ids[-1] + 2])
+        keys = np.repeat(doc_ids.astype(np.int64), lengths) * n_terms + store.gather(doc_ids)
+        keys, tfs = np.unique(keys, return_counts=True)
+        post_docs.append((keys // n_terms).astype(np.int32))
+        post_terms.append((keys % n_terms).astype(np.int32))
+        post_tfs.append(tfs.astype(np.int32))
+
+    post_terms = np.concatenate(post_terms) if post_terms else np.empty(0, dtype=np.int32)
+    order = np.argsort(post_terms, kind="stable")
+    term_offsets = np.zeros(n_terms + 1, dtype=np.int64)
+    np.cumsum(np.bincount(post_terms, minlength=n_terms), out=term_offsets[1:])
+
+    doc_lengths = store.doc_lengths()
+    n_docs = store.n_docs
+    meta = {
+        "n_docs": n_docs,
+        "avgdl": float(doc_lengths.sum() / n_docs) if n_docs else 0.0,
+    }
+    doc_ids = np.concatenate(post_docs)[order] if post_docs else np.empty(0, dtype=np.int32)
+    term_freqs = np.concatenate(post_tfs)[order] if post_tfs else np.empty(0, dtype=np.int32)
+    return InvertedIndex(
+        term_index=store.term_index,
+        term_offsets=term_offsets,
+        doc_ids=doc_ids,
+        term_freqs=term_freqs,
+        doc_lengths=doc_lengths,
+        max_weights=term_max_weights(term_offsets, doc_ids, term_freqs, doc_lengths, meta["avgdl"] or 1.0),
+        meta=meta,
+    )
+
+def save_index(index: InvertedIndex, path=INDEX_DIR):
+    return write_artifact(
+        path,
+        {
+            "term_offsets": index.term_offsets,
+            "doc_ids": index.doc_ids,
+            "term_freqs": index.term_freqs,
+            "doc_lengths": index.doc_lengths,
+            "max_weights": index.max_weights,
+        },
+        meta=index.meta,
+    )
+
+def load_index(path=INDEX_DIR):
+    """
+    Φόρτωση αποθηκευμένου ευρετηρίου με memory-mapping των πινάκων postings.
+
+    Επιστρέφει None αν το ευρετήριο λείπει ή δημιουργήθηκε από διαφορετικό dataset.
+
+    """
+    if not (path / "max_weights.npy").exists():
+        # Ευρετήριο παλαιότερης έκδοσης (χωρίς άνω φράγματα): δημιουργείται ξανά
+        return None
+    loaded = read_artifact(path, ["term_offsets", "doc_ids", "term_freqs", "doc_lengths", "max_weights"])
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return InvertedIndex(term_index=get_token_store().term_index, meta=meta, **arrays)
+
+def get_index() -> InvertedIndex:
+    global INDEX_CACHE
+    if INDEX_CACHE is None:
+        index = load_index()
+        if index is None:
+            save_index(build_index())
+            index = load_index()
+        INDEX_CACHE = index
+    return INDEX_CACHE
@@ -0,0 +1,217 @@
+"""
+Εκτέλεση βαριών υπολογισμών εκτός του event loop, σε process pool.
+
+Οι υπολογισμοί (LSI, clustering, topic drift κ.λπ.) είναι CPU-bound και αν τρέξουν
+μέσα στο async route παγώνουν όλο τον server. Εδώ:
+- το run_in_pool εκτελεί μια συνάρτηση σε άλλη διεργασία και περιμένει (await) το αποτέλεσμα
+- το submit_job υποβάλλει μακροχρόνια εργασία και επιστρέφει αμέσως job id,
+  ώστε ο client να ρωτάει την κατάσταση μέσω του /api/jobs/{job_id}
+
+Η κατάσταση και το αποτέλεσμα κάθε εργασίας αποθηκεύονται σε αρχεία στο data/jobs/, ώστε
+με πολλούς workers του uvicorn το polling να απαντάται από όποιον worker κι αν το δεχτεί.
+
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+
+from app.core.data_loader import DATA_DIR
+from app.core.metrics import stage
+
+# Πλήθος διεργασιών του pool: οι πυρήνες μοιράζονται στους workers του uvicorn (WEB_CONCURRENCY)
+MAX_WORKERS = max(1, (os.cpu_count() or 1) // max(1, int(os.environ.get("WEB_CONCURRENCY") or 1)))
+
+# Φάκελος με την κατάσταση (<id>.json) και το αποτέλεσμα (<id>.result.json) κάθε εργασίας
+JOBS_DIR = DATA_DIR / "jobs"
+
+# Πλήθος ολοκληρωμένων εργασιών που κρατούνται για polling
+MAX_FINISHED_JOBS = 200
+
+FINISHED_STATES = {"done", "failed", "cancelled"}
+
+EXECUTOR = None
+
+# Τα futures των εργασιών που υπέβαλε αυτός ο worker (για ακύρωση πριν ξεκινήσουν)
+FUTURES = {}
+
+def get_executor() -> ProcessPoolExecutor:
+    global EXECUTOR
+    if EXECUTOR is None:
+        EXECUTOR = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return EXECUTOR
+
+def reset_executor():
+    """
+    Απόρριψη του pool (π.χ. αν κάποια διεργασία τερματίστηκε απότομα λόγω μνήμης).
+
+    """
+    global EXECUTOR
+    if EXECUTOR is not None:
+        EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        EXECUTOR = None
+
+def shutdown_executor():
+    global EXECUTOR
+    if EXECUTOR is not None:
+        EXECUTOR.shutdown(wait=True, cancel_futures=True)
+        EXECUTOR = None
+
+async def run_in_pool(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    try:
+        with stage("pool"):
+            return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+    except BrokenProcessPool:
+        reset_executor()
+        raise
+
+def write_json(path, data):
+    """
+    Ατομική εγγραφή JSON (μοναδικό προσωρινό αρχείο και os.replace, ασφαλές μεταξύ διεργασιών).
+
+    """
+    JOBS_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=JOBS_DIR, prefix=f"{path.name}.", suffix=".tmp",
+                                     delete=False, encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, default=str)
+    os.replace(f.name, path)
+
+def read_json(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def job_path(job_id: str, suffix: str = ".json"):
+    return JOBS_DIR / f"{job_id}{suffix}"
+
+def update_job(job_id: str, **fields):
+    record = read_json(job_path(job_id))
+    if record is not None:
+        write_json(job_path(job_id), {**record, **fields})
+
+def finish_job(job_id: str, status: str, error: str | None = None):
+    fields = {"status": status, "finished_at": time.time()}
+    if error is not None:
+        fields["error"] = error
+    update_job(job_id, **fields)
+
+def run_job(job_id: str, fn, params: dict):
+    """
+    Εκτέλεση εργασίας στο process pool: η διεργασία καταγράφει η ίδια την κατάσταση και το αποτέλεσμα.
+
+    Μια εργασία που ακυρώθηκε από άλλον worker (αρχείο <id>.cancel) δεν εκτελείται.
+
+    """
+    if job_path(job_id, ".cancel").exists():
+        finish_job(job_id, "cancelled")
+        return
+    update_job(job_id, status="running")
+    try:
+        result = fn(**params)
+    except Exception as exc:
+        finish_job(job_id, "failed", repr(exc))
+        return
+    write_json(job_path(job_id, ".result.json"), result)
+    finish_job(job_id, "done")
+
+def job_finished(job_id: str, future):
+    """
+    Callback του future: καταγράφει όσα δεν μπορεί να καταγράψει η διεργασία (ακύρωση, σφάλμα του pool).
+
+    """
+    FUTURES.pop(job_id, None)
+    if future.cancelled():
+        finish_job(job_id, "cancelled")
+    elif future.exception() is not None:
+        finish_job(job_id, "failed", repr(future.exception()))
+        if isinstance(future.exception(), BrokenProcessPool):
+            reset_executor()
+
+def job_records() -> list[dict]:
+    """
+    Οι εγγραφές όλων των εργασιών (χωρίς τα αποτελέσματα), κατά σειρά υποβολής.
+
+    """
+    paths = [path for path in JOBS_DIR.glob("*.json") if "." not in path.stem]
+    records = [record for record in map(read_json, paths) if record is not None]
+    return sorted(records, key=lambda r: r["submitted_at"])
+
+def prune_jobs():
+    records = job_records()
+    finished = [r for r in records if r["status"] in FINISHED_STATES]
+    for record in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+        for suffix in (".json", ".result.json", ".cancel"):
+            job_path(record["job_id"], suffix).unlink(missing_ok=True)
+
+def submit_job(kind: str, fn, **params) -> dict:
+    """
+    Υποβολή εργασίας στο process pool: η εγγραφή της (job_id, κατάσταση queued).
+
+    """
+    job_id = uuid.uuid4().hex
+    record = {
+        "job_id": job_id,
+        "kind": kind,
+        "status": "queued",
+        "params": params,
+        "submitted_at": time.time(),
+        "finished_at": None,
+    }
+    write_json(job_path(job_id), record)
+    future = get_executor().submit(run_job, job_id, fn, params)
+    FUTURES[job_id] = future
+    future.add_done_callback(lambda f: job_finished(job_id, f))
+    prune_jobs()
+    return record
+
+def get_job(job_id: str, include_result: bool = True):
+    """
+    Η κατάσταση μίας εργασίας (από οποιονδήποτε worker), με το αποτέλεσμα όταν ολοκληρωθεί.
+
+    """
+    if not job_id.isalnum():
+        return None
+    record = read_json(job_path(job_id))
+    if record is not None and include_result and record["status"] == "done":
+        record["result"] = read_json(job_path(job_id, ".result.json"))
+    return record
+
+def list_jobs() -> list[dict]:
+    return job_records()
+
+def cancel_job(job_id: str):
+    """
+    Ακύρωση εργασίας που δεν έχει ξεκινήσει ακόμα να εκτελείται.
+
+    Στον worker που την υπέβαλε ακυρώνεται το future· αλλιώς (άλλος worker, ή future που
+    έχει ήδη περάσει στην ουρά του pool) γράφεται το αρχείο <id>.cancel, που ελέγχεται
+    πριν από την εκτέλεση.
+
+    """
+    record = get_job(job_id, include_result=False)
+    if record is None or record["status"] != "queued":
+        return record
+    future = FUTURES.get(job_id)
+    if future is None or not future.cancel():
+        job_path(job_id, ".cancel").touch()
+    return get_job(job_id, include_result=False)
+
+async def dispatch(kind: str, fn, background: bool = False, **params):
+    """
+    Κοινό σημείο εκτέλεσης για τα βαριά endpoints.
+
+    Με background=True υποβάλλει εργασία και επιστρέφει αμέσως το job (id, κατάσταση)·
+    αλλιώς εκτελεί τη συνάρτηση στο process pool και επιστρέφει το αποτέλεσμά της.
+
+    """
+    if background:
+        return submit_job(kind, fn, **params)
+    return await run_in_pool(fn, **params)
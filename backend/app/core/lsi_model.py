@@ -0,0 +1,209 @@
+import numpy as np
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import DATA_DIR
+from app.core.tfidf import get_tfidf_space
+from app.core.token_store import get_token_store
+
+# Φάκελος αποθήκευσης του μοντέλου LSI
+LSI_DIR = DATA_DIR / "lsi"
+
+# Παράμετροι του randomized SVD
+N_COMPONENTS = 100
+OVERSAMPLES = 10
+POWER_ITERATIONS = 2
+RANDOM_STATE = 42
+
+# Πλήθος ομιλιών ανά τμήμα (η μνήμη εξαρτάται από αυτό και όχι από το μέγεθος του corpus)
+BUILD_CHUNK_DOCS = 20_000
+
+LSI_CACHE = None
+
+def iter_chunks(n_docs: int, chunk_size: int = BUILD_CHUNK_DOCS):
+    for start in range(0, n_docs, chunk_size):
+        yield np.arange(start, min(start + chunk_size, n_docs))
+
+def doc_chunks(store, doc_ids=None, chunk_size: int = BUILD_CHUNK_DOCS):
+    """
+    Τμήματα των δοσμένων ομιλιών (προεπιλογή: όλο το corpus).
+
+    """
+    if doc_ids is None:
+        yield from iter_chunks(store.n_docs, chunk_size)
+        return
+    for start in range(0, len(doc_ids), chunk_size):
+        yield doc_ids[start:start + chunk_size]
+
+def gram_product(space, store, Q, doc_ids=None):
+    """
+    Υπολογισμός Xᵀ(XQ) τμηματικά, όπου X ο πίνακας TF-IDF ολόκληρου του corpus (ή των doc_ids).
+
+    Ο X δεν υλοποιείται ποτέ ολόκληρος· κάθε τμήμα ομιλιών μετατρέπεται σε TF-IDF,
+    συνεισφέρει στο αποτέλεσμα (n_features × l) και απορρίπτεται.
+
+    """
+    result = np.zeros_like(Q)
+    for chunk in doc_chunks(store, doc_ids):
+        X = space.transform(chunk, store)
+        result += X.T @ (X @ Q)
+    return result
+
+def randomized_svd(space, store, n_components: int, doc_ids=None):
+    """
+    Randomized SVD (Halko et al.) του πίνακα TF-IDF σε φραγμένη μνήμη
+    (ολόκληρου του corpus ή μόνο των doc_ids, π.χ. ενός έτους).
+
+    1. Τυχαίος πίνακας Ω (n_features × l) και Z = XᵀXΩ (τμηματικά)
+    2. Power iterations με επανορθοκανονικοποίηση για ακρίβεια στις μικρές ιδιοτιμές
+    3. Q = orth(Z) προσεγγίζει τον χώρο των δεξιών ιδιαζόντων διανυσμάτων V
+    4. Ιδιοανάλυση του μικρού πίνακα QᵀXᵀXQ (l × l) → V = QW, σ = √λ
+
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    n_oversampled = min(n_components + OVERSAMPLES, space.n_features)
+    Q = rng.standard_normal((space.n_features, n_oversampled))
+    for _ in range(POWER_ITERATIONS + 1):
+        Q, _ = np.linalg.qr(gram_product(space, store, Q, doc_ids))
+
+    C = np.zeros((n_oversampled, n_oversampled))
+    for chunk in doc_chunks(store, doc_ids):
+        XQ = space.transform(chunk, store) @ Q
+        C += XQ.T @ XQ
+    eigenvalues, W = np.linalg.eigh(C)
+    order = np.argsort(eigenvalues)[::-1][:n_components]
+    components = (Q @ W[:, order]).T
+    singular_values = np.sqrt(np.clip(eigenvalues[order], 0, None))
+
+    # Σταθερό πρόσημο: η μεγαλύτερη (κατ' απόλυτη τιμή) φόρτιση κάθε θέματος είναι θετική
+    signs = np.sign(components[np.arange(len(components)), np.abs(components).argmax(axis=1)])
+    signs[signs == 0] = 1
+    return (components * signs[:, None]).astype(np.float32), singular_values.astype(np.float32)
+
+class LsiModel:
+    """
+    Μοντέλο LSI ολόκληρου του corpus.
+
+    - components: φορτίσεις όρων ανά θέμα (n_components × n_features)
+    - singular_values: ιδιάζουσες τιμές ανά θέμα
+    - doc_vectors: διανύσματα ομιλιών στον λανθάνοντα χώρο (n_docs × n_components),
+      κανονικοποιημένα κατά L2 ώστε το εσωτερικό γινόμενο να είναι cosine similarity
+
+    """
+
+    def __init__(self, components, singular_values, doc_vectors, space, meta=None):
+        self.components = components
+        self.singular_values = singular_values
+        self.doc_vectors = doc_vectors
+        self.space = space
+        self.meta = meta or {}
+
+    @property
+    def n_components(self) -> int:
+        return len(self.components)
+
+    def topics(self, n_topics: int, top_terms: int, store=None) -> list[dict]:
+        if store is None:
+            store = get_token_store()
+        topics = []
+        for i, comp in enumerate(self.components[:n_topics]):
+            top_idx = np.argsort(-comp, kind="stable")[:top_terms]
+            topics.append({
+                "topic_id": i,
+                "terms": [store.vocab[self.space.feature_ids[j]] for j in top_idx],
+                "strength": float(self.singular_values[i]),
+            })
+        return topics
+
+    def fold(self, terms: list[str], store=None):
+        """
+        Προβολή (folding-in) ερωτήματος στον λανθάνοντα χώρο: q̂ = q V, κανονικοποιημένο κατά L2.
+
+        """
+        q = self.space.transform_terms(terms, store)
+        return self.project(q)
+
+    def fold_tokens(self, term_ids):
+        """
+        Προβολή μιας ομιλίας από τα term ids της (π.χ. ομιλία segment, εκτός του μοντέλου).
+
+        Οι όροι εκτός του χώρου TF-IDF (και οι νέοι όροι των segments) αγνοούνται.
+
+        """
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        term_ids = term_ids[term_ids < len(self.space.column_of_term)]
+        return self.project(self.space.weigh(np.zeros(len(term_ids), dtype=np.int64), term_ids, 1))
+
+    def project(self, q):
+        vector = np.asarray(q @ self.components.T).ravel().astype(np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def search(self, terms: list[str], top_k: int = 5, store=None):
+        """
+        Σημασιολογική αναζήτηση: οι top_k ομιλίες με τη μεγαλύτερη cosine similarity με το ερώτημα.
+
+        """
+        vector = self.fold(terms, store)
+        if not vector.any():
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        scores = self.doc_vectors @ vector
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top, scores[top]
+
+def build_lsi_model(path=LSI_DIR, space=None, store=None):
+    """
+    Δημιουργία και αποθήκευση του μοντέλου LSI για ολόκληρο το corpus (βήμα build).
+
+    1. Randomized SVD του πίνακα TF-IDF σε τμήματα ομιλιών (φραγμένη μνήμη)
+    2. Υπολογισμός των διανυσμάτων ομιλιών XV τμηματικά, απευθείας σε memory-mapped αρχείο
+    3. Κανονικοποίηση L2 των διανυσμάτων για cosine similarity
+
+    """
+    if space is None:
+        space = get_tfidf_space()
+    if store is None:
+        store = get_token_store()
+
+    n_components = min(N_COMPONENTS, space.n_features)
+    components, singular_values = randomized_svd(space, store, n_components)
+
+    meta = {"n_components": n_components, "n_docs": store.n_docs}
+    with artifact_writer(path, meta) as tmp:
+        np.save(tmp / "components.npy", components)
+        np.save(tmp / "singular_values.npy", singular_values)
+        doc_vectors = np.lib.format.open_memmap(
+            tmp / "doc_vectors.npy", mode="w+", dtype=np.float32, shape=(store.n_docs, n_components)
+        )
+        for doc_ids in iter_chunks(store.n_docs):
+            vectors = np.asarray(space.transform(doc_ids, store) @ components.T)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            doc_vectors[doc_ids[0]:doc_ids[-1] + 1] = vectors / norms
+        doc_vectors.flush()
+        del doc_vectors
+    return path
+
+def load_lsi_model(path=LSI_DIR):
+    loaded = read_artifact(path, ["components", "singular_values", "doc_vectors"])
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return LsiModel(
+        components=np.asarray(arrays["components"]),
+        singular_values=np.asarray(arrays["singular_values"]),
+        doc_vectors=arrays["doc_vectors"],
+        space=get_tfidf_space(),
+        meta=meta,
+    )
+
+def get_lsi_model() -> LsiModel:
+    global LSI_CACHE
+    if LSI_CACHE is None:
+        model = load_lsi_model()
+        if model is None:
+            build_lsi_model()
+            model = load_lsi_model()
+        LSI_CACHE = model
+    return LSI_CACHE
@@ -0,0 +1,228 @@
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfTransformer
+
+from app.core.artifacts import read_artifact, write_artifact
+from app.core.data_loader import DATA_DIR
+from app.core.term_cube import get_term_cube
+from app.core.token_store import get_token_store
+
+# Φάκελος αποθήκευσης του πίνακα πλησιέστερων μελών
+MEMBER_SIMILARITY_DIR = DATA_DIR / "member_similarity"
+
+# Πλήθος λέξεων-κλειδιών ανά μέλος για την ομοιότητα Jaccard
+TOP_TERMS = 20
+
+# Πλήθος πλησιέστερων μελών που αποθηκεύονται για κάθε μέλος
+NEIGHBOURS = 100
+
+# Πλήθος μελών ανά μπλοκ (ο πυκνός πίνακας ομοιοτήτων είναι το πολύ BLOCK_MEMBERS × n_members)
+BLOCK_MEMBERS = 256
+
+METRICS = ("jaccard", "cosine")
+
+MEMBER_SIMILARITY_CACHE = None
+
+class MemberNeighbours:
+    """
+    Προϋπολογισμένος πίνακας πλησιέστερων μελών ανά μετρική ομοιότητας.
+
+    Για το μέλος i, τα neighbours[metric][i] είναι οι θέσεις (στο labels) των NEIGHBOURS
+    πιο όμοιων μελών σε φθίνουσα σειρά και τα scores[metric][i] οι ομοιότητές τους.
+
+    """
+
+    def __init__(self, labels, neighbours: dict, scores: dict):
+        self.labels = list(labels)
+        self.neighbours = neighbours
+        self.scores = scores
+        self.member_index = {label: i for i, label in enumerate(self.labels)}
+
+    def find(self, name: str) -> list[int]:
+        """
+        Μέλη που αντιστοιχούν στο name: ακριβές όνομα (χωρίς διάκριση πεζών/κεφαλαίων), αλλιώς όσα το περιέχουν.
+
+        """
+        if name in self.member_index:
+            return [self.member_index[name]]
+        lowered = name.lower()
+        exact = [i for i, label in enumerate(self.labels) if label.lower() == lowered]
+        if exact:
+            return exact
+        return [i for i, label in enumerate(self.labels) if lowered in label.lower()]
+
+    def peers(self, member: int, metric: str, top_k: int) -> list[dict]:
+        neighbours = self.neighbours[metric][member][:top_k]
+        scores = self.scores[metric][member][:top_k]
+        return [
+            {"member_name": self.labels[j], "similarity": round(float(s), 4)}
+            for j, s in zip(neighbours, scores)
+        ]
+
+    def top_pairs(self, metric: str, top_k: int) -> list[dict]:
+        """
+        Τα top_k πιο όμοια ζεύγη μελών από τον πίνακα πλησιέστερων.
+
+        Ένα ζεύγος ανάμεσα στα top_k συνολικά είναι πάντα μέσα στους top_k πλησιέστερους
+        και των δύο μελών του, οπότε το αποτέλεσμα είναι ακριβές για top_k <= NEIGHBOURS.
+
+        """
+        neighbours = np.asarray(self.neighbours[metric][:, :top_k], dtype=np.int64)
+        scores = np.asarray(self.scores[metric][:, :top_k])
+        members = np.repeat(np.arange(len(neighbours)), neighbours.shape[1])
+        first = np.minimum(members, neighbours.ravel())
+        second = np.maximum(members, neighbours.ravel())
+        keys, unique = np.unique(first * len(self.labels) + second, return_index=True)
+        pair_scores = scores.ravel()[unique]
+        order = np.lexsort((keys, -pair_scores))[:top_k]
+        return [
+            {
+                "member_1": self.labels[first[unique[i]]],
+                "member_2": self.labels[second[unique[i]]],
+                "similarity": round(float(pair_scores[i]), 4),
+            }
+            for i in order
+        ]
+
+def member_term_matrix(cube=None, store=None):
+    """
+    Αραιός πίνακας συχνοτήτων μελών × όρων (CSR), αθροίζοντας τις γραμμές (έτος, μέλος) του κύβου.
+
+    Κρατάει μόνο τις λέξεις-κλειδιά (όρους με τουλάχιστον KEYWORD_MIN_LENGTH γράμματα).
+
+    """
+    if cube is None:
+        cube = get_term_cube()
+    if store is None:
+        store = get_token_store()
+
+    member = cube.member
+    rows = sparse.csr_matrix(
+        (member.data, member.indices, member.indptr), shape=(len(member.years), member.n_terms)
+    )
+    assign = sparse.csr_matrix(
+        (np.ones(len(member.codes)), (member.codes, np.arange(len(member.codes)))),
+        shape=(len(member.labels), len(member.codes)),
+    )
+    matrix = (assign @ rows).tocsr()
+    matrix = matrix @ sparse.diags(store.keyword_mask.astype(np.float64))
+    matrix.eliminate_zeros()
+    return list(member.labels), matrix.tocsr()
+
+def keyword_sets(matrix, top_n: int = TOP_TERMS):
+    """
+    Δυαδικός πίνακας μελών × όρων με τις top_n λέξεις-κλειδιά κάθε μέλους (ισοβαθμίες κατά term id).
+
+    Η επιλογή γίνεται για όλα τα μέλη μαζί: ταξινόμηση των μη μηδενικών στοιχείων κατά
+    (μέλος, φθίνουσα συχνότητα, term id) και διατήρηση των πρώτων top_n κάθε γραμμής.
+
+    """
+    matrix = matrix.tocsr()
+    matrix.sort_indices()
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    order = np.lexsort((matrix.indices, -matrix.data, rows))
+    rank = np.arange(len(order)) - matrix.indptr[rows[order]]
+    keep = order[rank < top_n]
+    return sparse.csr_matrix(
+        (np.ones(len(keep), dtype=np.float32), (rows[keep], matrix.indices[keep])),
+        shape=matrix.shape,
+    )
+
+def blocked_top_k(similarity_block, n_members: int, k: int):
+    """
+    Οι k πλησιέστερες γραμμές για κάθε μέλος, υπολογίζοντας το πολύ BLOCK_MEMBERS γραμμές ομοιοτήτων τη φορά.
+
+    Το similarity_block(start, end) επιστρέφει πυκνό πίνακα (end - start) × n_members.
+
+    """
+    k = min(k, n_members - 1)
+    neighbours = np.zeros((n_members, k), dtype=np.int32)
+    scores = np.zeros((n_members, k), dtype=np.float32)
+    if k <= 0:
+        return neighbours, scores
+    for start in range(0, n_members, BLOCK_MEMBERS):
+        end = min(start + BLOCK_MEMBERS, n_members)
+        block = similarity_block(start, end)
+        block[np.arange(end - start), np.arange(start, end)] = -np.inf
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.lexsort((top, -top_scores), axis=1)
+        neighbours[start:end] = np.take_along_axis(top, order, axis=1)
+        scores[start:end] = np.take_along_axis(top_scores, order, axis=1)
+    return neighbours, scores
+
+def jaccard_neighbours(matrix, k: int):
+    """
+    Jaccard ανάμεσα στα σύνολα λέξεων-κλειδιών: |A ∩ B| / |A ∪ B|.
+
+    Οι τομές όλων των ζευγών ενός μπλοκ δίνονται από ένα αραιό γινόμενο B Bᵀ
+    και οι ενώσεις από |A| + |B| - |A ∩ B|.
+
+    """
+    sets = keyword_sets(matrix)
+    sizes = np.asarray(sets.sum(axis=1)).ravel()
+    transposed = sets.T.tocsc()
+
+    def similarity_block(start, end):
+        intersection = (sets[start:end] @ transposed).toarray()
+        union = sizes[start:end, None] + sizes[None, :] - intersection
+        return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+    return blocked_top_k(similarity_block, matrix.shape[0], k)
+
+def cosine_neighbours(matrix, k: int):
+    """
+    Cosine similarity ανάμεσα στα διανύσματα TF-IDF (sublinear tf) των μελών.
+
+    """
+    vectors = TfidfTransformer(sublinear_tf=True).fit_transform(matrix).astype(np.float32).tocsr()
+    transposed = vectors.T.tocsc()
+
+    def similarity_block(start, end):
+        return (vectors[start:end] @ transposed).toarray()
+
+    return blocked_top_k(similarity_block, matrix.shape[0], k)
+
+def build_member_neighbours(cube=None, store=None) -> MemberNeighbours:
+    """
+    Δημιουργία του πίνακα πλησιέστερων μελών για όλα τα μέλη (βήμα build).
+
+    1. Πίνακας μελών × όρων από τον κύβο συχνοτήτων
+    2. Ομοιότητες Jaccard και cosine με αραιά γινόμενα πινάκων, ανά μπλοκ μελών
+    3. Διατήρηση των NEIGHBOURS πιο όμοιων μελών ανά μέλος
+
+    """
+    labels, matrix = member_term_matrix(cube, store)
+    neighbours, scores = {}, {}
+    for metric, compute in (("jaccard", jaccard_neighbours), ("cosine", cosine_neighbours)):
+        neighbours[metric], scores[metric] = compute(matrix, NEIGHBOURS)
+    return MemberNeighbours(labels, neighbours, scores)
+
+def save_member_neighbours(table: MemberNeighbours, path=MEMBER_SIMILARITY_DIR):
+    arrays = {}
+    for metric in METRICS:
+        arrays[f"{metric}_neighbours"] = table.neighbours[metric]
+        arrays[f"{metric}_scores"] = table.scores[metric]
+    return write_artifact(path, arrays, meta={"labels": table.labels, "top_terms": TOP_TERMS})
+
+def load_member_neighbours(path=MEMBER_SIMILARITY_DIR):
+    names = [f"{metric}_{field}" for metric in METRICS for field in ("neighbours", "scores")]
+    loaded = read_artifact(path, names)
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return MemberNeighbours(
+        labels=meta["labels"],
+        neighbours={metric: arrays[f"{metric}_neighbours"] for metric in METRICS},
+        scores={metric: arrays[f"{metric}_scores"] for metric in METRICS},
+    )
+
+def get_member_neighbours() -> MemberNeighbours:
+    global MEMBER_SIMILARITY_CACHE
+    if MEMBER_SIMILARITY_CACHE is None:
+        table = load_member_neighbours()
+        if table is None:
+            save_member_neighbours(build_member_neighbours())
+            table = load_member_neighbours()
+        MEMBER_SIMILARITY_CACHE = table
+    return MEMBER_SIMILARITY_CACHE
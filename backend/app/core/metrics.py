@@ -0,0 +1,230 @@
+"""
+Ελαφριά μετρικά απόδοσης (instrumentation) και έκθεσή τους σε μορφή Prometheus.
+
+- stage(name): context manager που χρονομετρεί ένα στάδιο (π.χ. load_df, bm25) σε ιστόγραμμα
+  και, αν το αίτημα το ζήτησε, στη λίστα σταδίων του τρέχοντος αιτήματος (contextvar)
+- MetricsMiddleware: latency ανά route (ιστόγραμμα), αιτήματα σε εξέλιξη, μέγεθος αποκρίσεων
+- render_metrics(): κείμενο για το /metrics (μαζί με RSS της διεργασίας και μνήμη του DataFrame)
+
+Με την κεφαλίδα "X-Timing: 1" ή την παράμετρο ?timing=1 η απόκριση περιέχει κεφαλίδα
+Server-Timing με τη διάρκεια κάθε σταδίου, για profiling αργών endpoints.
+
+Στάδια που εκτελούνται στο process pool μετρώνται στη διεργασία τους· στο αίτημα
+εμφανίζονται συνολικά ως στάδιο "pool".
+
+"""
+
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from urllib.parse import parse_qsl
+
+from starlette.routing import Match
+
+# Όρια (δευτερόλεπτα) των buckets των ιστογραμμάτων χρόνου
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Όρια (bytes) των buckets του ιστογράμματος μεγέθους αποκρίσεων
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Στάδια του τρέχοντος αιτήματος [(όνομα, δευτερόλεπτα)]· None όταν δεν ζητήθηκε Server-Timing
+REQUEST_STAGES = ContextVar("request_stages", default=None)
+
+class Histogram:
+    """
+    Ιστόγραμμα Prometheus (σωρευτικά buckets, άθροισμα, πλήθος) ανά συνδυασμό labels.
+
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = defaultdict(lambda: [[0] * len(buckets), 0.0, 0])
+        self.lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        with self.lock:
+            counts, _, _ = series = self.series[labels]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            for labels, (counts, total, count) in sorted(self.series.items()):
+                base = format_labels(self.label_names, labels)
+                for bound, bucket_count in zip(self.buckets, counts):
+                    bucket = join_labels(base, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{{{bucket}}} {bucket_count}")
+                bucket = join_labels(base, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{{{bucket}}} {count}")
+                lines.append(f"{self.name}_sum{{{base}}} {total}")
+                lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+class Gauge:
+    """
+    Gauge Prometheus ανά συνδυασμό labels.
+
+    """
+
+    def __init__(self, name: str, help_text: str, label_names: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.values = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def add(self, labels: tuple, amount: float):
+        with self.lock:
+            self.values[labels] += amount
+
+    def set(self, labels: tuple, value: float):
+        with self.lock:
+            self.values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        with self.lock:
+            for labels, value in sorted(self.values.items()):
+                base = format_labels(self.label_names, labels)
+                lines.append(f"{self.name}{{{base}}} {value}" if base else f"{self.name} {value}")
+        return lines
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def format_labels(names: tuple, values: tuple) -> str:
+    return ",".join(f'{name}="{escape_label(value)}"' for name, value in zip(names, values))
+
+def join_labels(*parts: str) -> str:
+    return ",".join(part for part in parts if part)
+
+REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Latency αιτημάτων ανά route", ("method", "route", "status"), LATENCY_BUCKETS
+)
+RESPONSE_BYTES = Histogram(
+    "http_response_size_bytes", "Μέγεθος σώματος αποκρίσεων ανά route", ("method", "route"), SIZE_BUCKETS
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Αιτήματα σε εξέλιξη ανά route", ("method", "route"))
+STAGE_SECONDS = Histogram("stage_duration_seconds", "Διάρκεια σταδίων επεξεργασίας", ("stage",), LATENCY_BUCKETS)
+PROCESS_RSS = Gauge("process_resident_memory_bytes", "Resident memory (RSS) της διεργασίας")
+DATAFRAME_BYTES = Gauge("dataframe_memory_bytes", "Μνήμη του DataFrame του corpus (0 αν δεν έχει φορτωθεί)")
+
+@contextmanager
+def stage(name: str):
+    """
+    Χρονομέτρηση ενός σταδίου επεξεργασίας (ιστόγραμμα και, αν ζητήθηκε, Server-Timing του αιτήματος).
+
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe((name,), elapsed)
+        stages = REQUEST_STAGES.get()
+        if stages is not None:
+            stages.append((name, elapsed))
+
+def process_rss() -> int:
+    """
+    Τρέχον RSS της διεργασίας από το /proc (Linux / Docker)· 0 όπου δεν είναι διαθέσιμο.
+
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+def dataframe_bytes() -> int:
+    # Τοπικό import: το data_loader χρησιμοποιεί το stage αυτού του module
+    from app.core import data_loader
+
+    df = data_loader.DF_CACHE
+    if df is None:
+        return 0
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def render_metrics() -> str:
+    PROCESS_RSS.set((), process_rss())
+    DATAFRAME_BYTES.set((), dataframe_bytes())
+    lines = []
+    for metric in (REQUEST_SECONDS, RESPONSE_BYTES, IN_FLIGHT, STAGE_SECONDS, PROCESS_RSS, DATAFRAME_BYTES):
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+def route_template(scope) -> str:
+    """
+    Το πρότυπο του route (π.χ. /api/similarity/member/{name}), ώστε τα labels να μην εξαρτώνται από τις τιμές των παραμέτρων.
+
+    """
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+def timing_requested(scope) -> bool:
+    for key, value in scope["headers"]:
+        if key == b"x-timing" and value not in (b"", b"0"):
+            return True
+    params = parse_qsl(scope["query_string"].decode("latin-1"))
+    return any(name == "timing" and value not in ("", "0") for name, value in params)
+
+def server_timing(stages: list, total: float) -> bytes:
+    entries = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in stages]
+    entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries).encode("latin-1")
+
+class MetricsMiddleware:
+    """
+    ASGI middleware που καταγράφει latency, αιτήματα σε εξέλιξη και μέγεθος αποκρίσεων ανά route.
+
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        labels = (scope["method"], route_template(scope))
+        stages = [] if timing_requested(scope) else None
+        token = REQUEST_STAGES.set(stages)
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def instrumented_send(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if stages is not None:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(stages, time.perf_counter() - start)))
+                    message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        IN_FLIGHT.add(labels, 1)
+        try:
+            await self.app(scope, receive, instrumented_send)
+        finally:
+            IN_FLIGHT.add(labels, -1)
+            REQUEST_STAGES.reset(token)
+            REQUEST_SECONDS.observe((*labels, str(status)), time.perf_counter() - start)
+            RESPONSE_BYTES.observe(labels, size)
@@ -0,0 +1,343 @@
+"""
+Ευρετήριο θέσεων (positional index) για ερωτήματα φράσεων και εγγύτητας.
+
+Για κάθε posting (όρος, ομιλία) του ανεστραμμένου ευρετηρίου αποθηκεύονται οι θέσεις του όρου
+στη ροή όρων της ομιλίας (όπως στο TokenStore, μετά την αφαίρεση stopwords):
+- η πρώτη θέση απόλυτη και οι επόμενες ως διαφορές από την προηγούμενη (delta encoding)
+- κάθε τιμή ως varint (7 bits ανά byte, το υψηλό bit σημαίνει «ακολουθεί κι άλλο byte»)
+- όλα τα postings συνεχόμενα σε ένα αρχείο bytes (positions.bin, memory-mapped) με τη σειρά
+  των postings του InvertedIndex· το posting_offsets[p] είναι η θέση του posting p στο αρχείο
+
+Σύνταξη ερωτημάτων αναζήτησης:
+- "κοινωνική ασφάλιση": φράση (οι όροι σε διαδοχικές θέσεις)
+- οικονομία NEAR/5 ανάπτυξη: οι δύο όροι σε απόσταση έως 5 όρων (με οποιαδήποτε σειρά)
+- οι υπόλοιποι όροι: όπως πριν (BM25 σε όλους τους όρους του ερωτήματος)
+
+"""
+
+import re
+
+import numpy as np
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import DATA_DIR
+from app.core.inverted_index import get_index
+from app.core.text_cleaner import tokenize
+from app.core.token_store import get_token_store, ragged_take
+
+# Φάκελος αποθήκευσης του ευρετηρίου θέσεων
+POSITIONS_DIR = DATA_DIR / "positions"
+
+# Πλήθος ομιλιών / postings ανά τμήμα κατά τη δημιουργία (φραγμένη μνήμη)
+BUILD_CHUNK_DOCS = 50_000
+BUILD_CHUNK_POSTINGS = 2_000_000
+
+# Μέγιστο πλήθος bytes ενός varint (τιμές έως 2^35)
+VARINT_MAX_BYTES = 5
+
+# Φράσεις σε εισαγωγικά, τελεστές NEAR/n και μεμονωμένες λέξεις του ερωτήματος
+QUERY_TOKENS = re.compile(r'"([^"]*)"|\b(NEAR/\d+)\b|([^\s"]+)')
+
+POSITIONS_CACHE = None
+
+def encode_varints(values):
+    """
+    Κωδικοποίηση μη αρνητικών ακεραίων σε varint bytes, χωρίς βρόχο ανά τιμή.
+
+    Επιστρέφει (bytes ως uint8, πλήθος bytes κάθε τιμής).
+
+    """
+    values = np.asarray(values, dtype=np.int64)
+    n_bytes = np.ones(len(values), dtype=np.int64)
+    for k in range(1, VARINT_MAX_BYTES):
+        n_bytes += values >= (1 << (7 * k))
+    starts = np.cumsum(n_bytes) - n_bytes
+    data = np.empty(int(n_bytes.sum()), dtype=np.uint8)
+    for k in range(VARINT_MAX_BYTES):
+        has_byte = n_bytes > k
+        more = (n_bytes[has_byte] > k + 1).astype(np.int64) << 7
+        data[starts[has_byte] + k] = ((values[has_byte] >> (7 * k)) & 0x7F) | more
+    return data, n_bytes
+
+def decode_varints(data):
+    """
+    Αποκωδικοποίηση συνεχόμενων varints (αντίστροφο του encode_varints).
+
+    """
+    data = np.asarray(data)
+    if len(data) == 0:
+        return np.empty(0, dtype=np.int64)
+    ends = (data & 0x80) == 0
+    starts = np.flatnonzero(np.concatenate(([True], ends[:-1])))
+    value_of_byte = np.cumsum(ends) - ends
+    shifts = 7 * (np.arange(len(data)) - starts[value_of_byte])
+    return np.add.reduceat((data & 0x7F).astype(np.int64) << shifts, starts)
+
+def undelta(deltas, lengths):
+    """
+    Θέσεις από διαφορές: αθροιστικό άθροισμα που ξεκινάει από την αρχή σε κάθε ομάδα μήκους lengths[i].
+
+    """
+    totals = np.cumsum(deltas)
+    firsts = np.cumsum(lengths) - lengths
+    return totals - np.repeat(totals[firsts] - deltas[firsts], lengths)
+
+def scan_positions(tokens, offsets, term_id: int, doc_ids):
+    """
+    Θέσεις ενός όρου σε λίγες ομιλίες απευθείας από τα tokens τους (χωρίς ευρετήριο θέσεων).
+
+    Επιστρέφει (doc id κάθε εμφάνισης, θέση) ταξινομημένα κατά (ομιλία, θέση).
+
+    """
+    doc_ids = np.asarray(doc_ids, dtype=np.int64)
+    lengths = np.asarray(offsets[doc_ids + 1], dtype=np.int64) - np.asarray(offsets[doc_ids], dtype=np.int64)
+    docs = np.repeat(doc_ids, lengths)
+    positions = np.arange(len(docs), dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    hits = ragged_take(tokens, offsets, doc_ids) == term_id
+    return docs[hits], positions[hits]
+
+class PositionalIndex:
+    """
+    Θέσεις των όρων ανά posting, συμπιεσμένες (delta + varint), ευθυγραμμισμένες με το InvertedIndex.
+
+    """
+
+    def __init__(self, data, posting_offsets, index):
+        self.data = data
+        self.posting_offsets = posting_offsets
+        self.index = index
+
+    def term_positions(self, term_id: int, doc_ids):
+        """
+        Θέσεις του όρου μόνο στις δοσμένες (ταξινομημένες) ομιλίες.
+
+        1. Βρίσκει με δυαδική αναζήτηση τα postings του όρου για αυτές τις ομιλίες
+        2. Αποκωδικοποιεί μόνο τα bytes αυτών των postings (varint → διαφορές → θέσεις)
+
+        Επιστρέφει (doc id κάθε εμφάνισης, θέση) ταξινομημένα κατά (ομιλία, θέση).
+
+        """
+        start, end = int(self.index.term_offsets[term_id]), int(self.index.term_offsets[term_id + 1])
+        docs = self.index.doc_ids[start:end]
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        found = np.minimum(np.searchsorted(docs, doc_ids), max(len(docs) - 1, 0))
+        postings = start + found[(len(docs) > 0) & (np.asarray(docs[found]) == doc_ids)]
+
+        tfs = np.asarray(self.index.term_freqs[postings], dtype=np.int64)
+        deltas = decode_varints(ragged_take(self.data, self.posting_offsets, postings))
+        docs = np.repeat(np.asarray(self.index.doc_ids[postings], dtype=np.int64), tfs)
+        return docs, undelta(deltas, tfs)
+
+def scatter_positions(store, index, out):
+    """
+    Θέσεις όλων των tokens στη σειρά των postings (όρος, ομιλία, θέση), σε τμήματα ομιλιών.
+
+    Κάθε τμήμα ταξινομείται κατά όρο (σταθερά) και οι θέσεις του γράφονται στη συνέχεια
+    των θέσεων κάθε όρου από τα προηγούμενα τμήματα (counting sort σε δύο περάσματα).
+
+    """
+    n_terms = len(index.term_offsets) - 1
+    term_totals = np.bincount(
+        np.repeat(np.arange(n_terms), np.diff(index.term_offsets)),
+        weights=index.term_freqs, minlength=n_terms,
+    ).astype(np.int64)
+    cursor = np.cumsum(term_totals) - term_totals
+
+    for start in range(0, store.n_docs, BUILD_CHUNK_DOCS):
+        doc_ids = np.arange(start, min(start + BUILD_CHUNK_DOCS, store.n_docs))
+        lengths = np.diff(store.offsets[doc_ids[0]:doc_ids[-1] + 2])
+        terms = store.gather(doc_ids)
+        positions = np.arange(len(terms), dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        order = np.argsort(terms, kind="stable")
+        sorted_terms = terms[order]
+        counts = np.bincount(terms, minlength=n_terms)
+        first_of_term = np.cumsum(counts) - counts
+        rank = np.arange(len(terms)) - first_of_term[sorted_terms]
+        out[cursor[sorted_terms] + rank] = positions[order]
+        cursor += counts
+
+def build_positional_index(path=POSITIONS_DIR, store=None, index=None):
+    """
+    Δημιουργία του ευρετηρίου θέσεων από το tokenized corpus (βήμα build).
+
+    1. Γράφει τις θέσεις όλων των tokens στη σειρά των postings (όρος, ομιλία, θέση)
+    2. Ανά τμήμα postings: μετατρέπει τις θέσεις σε διαφορές (η πρώτη κάθε posting απόλυτη)
+    3. Κωδικοποιεί τις διαφορές ως varints και τις γράφει διαδοχικά στο positions.bin
+    4. Αποθηκεύει τη θέση κάθε posting στο αρχείο (posting_offsets)
+
+    """
+    if store is None:
+        store = get_token_store()
+    if index is None:
+        index = get_index()
+
+    n_postings = len(index.doc_ids)
+    tf_offsets = np.zeros(n_postings + 1, dtype=np.int64)
+    np.cumsum(index.term_freqs, out=tf_offsets[1:])
+
+    meta = {"n_postings": n_postings, "n_positions": int(tf_offsets[-1])}
+    with artifact_writer(path, meta) as tmp:
+        positions = np.lib.format.open_memmap(
+            tmp / "scatter.npy", mode="w+", dtype=np.int32, shape=(int(tf_offsets[-1]),)
+        )
+        scatter_positions(store, index, positions)
+
+        posting_offsets = np.lib.format.open_memmap(
+            tmp / "posting_offsets.npy", mode="w+", dtype=np.int64, shape=(n_postings + 1,)
+        )
+        posting_offsets[0] = 0
+        with open(tmp / "positions.bin", "wb") as f:
+            for start in range(0, n_postings, BUILD_CHUNK_POSTINGS):
+                end = min(start + BUILD_CHUNK_POSTINGS, n_postings)
+                values = np.asarray(positions[tf_offsets[start]:tf_offsets[end]], dtype=np.int64)
+                tfs = np.asarray(index.term_freqs[start:end], dtype=np.int64)
+                firsts = np.cumsum(tfs) - tfs
+                deltas = np.diff(values, prepend=0)
+                deltas[firsts] = values[firsts]
+                data, n_bytes = encode_varints(deltas)
+                f.write(data.tobytes())
+                sizes = np.add.reduceat(n_bytes, firsts) if len(firsts) else n_bytes[:0]
+                posting_offsets[start + 1:end + 1] = posting_offsets[start] + np.cumsum(sizes)
+
+        posting_offsets.flush()
+        meta["n_bytes"] = int(posting_offsets[-1])
+        del positions, posting_offsets
+        (tmp / "scatter.npy").unlink()
+    return path
+
+def load_positional_index(path=POSITIONS_DIR):
+    loaded = read_artifact(path, ["posting_offsets"])
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    data = np.memmap(path / "positions.bin", dtype=np.uint8, mode="r") if meta["n_bytes"] else np.zeros(0, dtype=np.uint8)
+    return PositionalIndex(data, arrays["posting_offsets"], get_index())
+
+def get_positional_index() -> PositionalIndex:
+    global POSITIONS_CACHE
+    if POSITIONS_CACHE is None:
+        positional = load_positional_index()
+        if positional is None:
+            build_positional_index()
+            positional = load_positional_index()
+        POSITIONS_CACHE = positional
+    return POSITIONS_CACHE
+
+class ParsedQuery:
+    """
+    Ερώτημα αναζήτησης: όροι για το BM25, φράσεις και ζεύγη όρων με μέγιστη απόσταση (NEAR/n).
+
+    """
+
+    def __init__(self, terms, phrases, near):
+        self.terms = terms
+        self.phrases = phrases
+        self.near = near
+
+    @property
+    def has_constraints(self) -> bool:
+        return bool(self.phrases or self.near)
+
+def parse_query(query: str) -> ParsedQuery:
+    """
+    Ανάλυση ερωτήματος σε όρους, φράσεις ("...") και τελεστές εγγύτητας (α NEAR/n β).
+
+    Οι όροι κανονικοποιούνται και τα stopwords αφαιρούνται όπως στο corpus, οπότε οι
+    θέσεις μιας φράσης αντιστοιχούν σε διαδοχικές θέσεις της ροής όρων. Τελεστής NEAR
+    χωρίς όρο αριστερά ή δεξιά αγνοείται· με φράση ως όρισμα χρησιμοποιείται ο πλησιέστερος όρος της.
+
+    """
+    items = []
+    for phrase, near, word in QUERY_TOKENS.findall(query):
+        if near:
+            items.append(("near", int(near.split("/")[1])))
+        elif word:
+            items.extend(("term", [term]) for term in tokenize(word))
+        elif terms := tokenize(phrase):
+            items.append(("phrase", terms))
+
+    terms, phrases, near = [], [], []
+    for i, (kind, value) in enumerate(items):
+        if kind == "near":
+            if 0 < i < len(items) - 1 and items[i - 1][0] != "near" and items[i + 1][0] != "near":
+                near.append((items[i - 1][1][-1], items[i + 1][1][0], value))
+            continue
+        terms.extend(value)
+        if kind == "phrase" and len(value) > 1:
+            phrases.append(value)
+    return ParsedQuery(terms, phrases, near)
+
+def phrase_docs(corpus, term_ids, candidates):
+    """
+    Ομιλίες (από τις candidates) όπου οι όροι εμφανίζονται σε διαδοχικές θέσεις.
+
+    Κάθε εμφάνιση του i-οστού όρου μετατοπίζεται κατά -i και οι φράσεις είναι τα κοινά
+    κλειδιά (ομιλία, θέση έναρξης) όλων των όρων· μετά από κάθε όρο οι υποψήφιες ομιλίες λιγοστεύουν.
+
+    """
+    keys = None
+    for i, term_id in enumerate(term_ids):
+        docs, positions = corpus.positions(term_id, candidates)
+        starts = positions - i
+        term_keys = (docs[starts >= 0] << 32) | starts[starts >= 0]
+        keys = term_keys if keys is None else np.intersect1d(keys, term_keys, assume_unique=True)
+        candidates = np.unique(keys >> 32)
+        if len(candidates) == 0:
+            break
+    return candidates
+
+def near_docs(corpus, first: int, second: int, distance: int, candidates):
+    """
+    Ομιλίες (από τις candidates) όπου οι δύο όροι απέχουν το πολύ distance θέσεις.
+
+    Για κάθε εμφάνιση του δεύτερου όρου ελέγχονται οι πλησιέστερες εμφανίσεις του πρώτου
+    (δυαδική αναζήτηση στα ταξινομημένα κλειδιά (ομιλία, θέση)).
+
+    """
+    docs_a, positions_a = corpus.positions(first, candidates)
+    docs_b, positions_b = corpus.positions(second, candidates)
+    if len(docs_a) == 0 or len(docs_b) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    keys_a = (docs_a << 32) | positions_a
+    keys_b = (docs_b << 32) | positions_b
+    found = np.searchsorted(keys_a, keys_b)
+    # Για τον ίδιο όρο η εμφάνιση βρίσκει τον εαυτό της· ελέγχονται οι γειτονικές της
+    neighbours = (found - 1, found + 1) if first == second else (found - 1, found)
+    matched = np.zeros(len(keys_b), dtype=bool)
+    for neighbour in neighbours:
+        valid = (neighbour >= 0) & (neighbour < len(keys_a))
+        neighbour = np.clip(neighbour, 0, len(keys_a) - 1)
+        same_doc = docs_a[neighbour] == docs_b
+        matched |= valid & same_doc & (np.abs(positions_a[neighbour] - positions_b) <= distance)
+    return np.unique(docs_b[matched])
+
+def constrained_docs(corpus, query: ParsedQuery, doc_ids):
+    """
+    Οι ομιλίες του doc_ids που ικανοποιούν όλες τις φράσεις και τους τελεστές NEAR του ερωτήματος.
+
+    1. Για κάθε περιορισμό, υποψήφιες είναι οι ομιλίες που περιέχουν όλους τους όρους του
+       (τομή postings)
+    2. Οι θέσεις διαβάζονται μόνο για τις υποψήφιες ομιλίες
+
+    Το corpus παρέχει term_index, term_docs(term_id) και positions(term_id, doc_ids).
+
+    """
+    matched = np.unique(np.asarray(doc_ids, dtype=np.int64))
+    constraints = [("phrase", terms) for terms in query.phrases]
+    constraints += [("near", (a, b, n)) for a, b, n in query.near]
+    for kind, value in constraints:
+        terms = value if kind == "phrase" else value[:2]
+        term_ids = [corpus.term_index.get(term) for term in terms]
+        if any(term_id is None for term_id in term_ids):
+            return np.empty(0, dtype=np.int64)
+        candidates = matched
+        for term_id in set(term_ids):
+            candidates = np.intersect1d(candidates, corpus.term_docs(term_id), assume_unique=True)
+        if kind == "phrase":
+            matched = phrase_docs(corpus, term_ids, candidates)
+        else:
+            matched = near_docs(corpus, term_ids[0], term_ids[1], value[2], candidates)
+        if len(matched) == 0:
+            break
+    return matched
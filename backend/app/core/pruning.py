@@ -0,0 +1,253 @@
+"""
+Top-k αξιολόγηση ερωτημάτων BM25 με δυναμικό κλάδεμα (MaxScore).
+
+Κάθε όρος του ερωτήματος έχει άνω φράγμα (upper bound) της συνεισφοράς του σε οποιαδήποτε
+ομιλία. Με τους όρους σε φθίνουσα σειρά φράγματος:
+1. Οι όροι με μεγάλο φράγμα («ουσιώδεις») διαβάζονται ολόκληροι και τα scores αθροίζονται·
+   μετά από κάθε όρο, κατώφλι θ είναι το k-οστό καλύτερο μερικό score
+2. Όταν το άθροισμα των φραγμάτων των υπόλοιπων όρων πέσει κάτω από το θ, καμία ομιλία που
+   δεν έχει ήδη βρεθεί δεν μπορεί να μπει στα top-k, οπότε οι υπόλοιπες λίστες δεν διαβάζονται
+3. Για τους υπόλοιπους όρους αναζητούνται (δυαδική αναζήτηση) μόνο οι υποψήφιες ομιλίες,
+   αφού πρώτα αφαιρεθούν όσες δεν μπορούν πια να φτάσουν το θ
+
+Η αξιολόγηση γίνεται ανά όρο με πράξεις numpy σε ολόκληρες λίστες (όχι ανά ομιλία σε Python),
+ενώ ο σωρός των top-k είναι ένα argpartition μεγέθους k στα scores των υποψηφίων.
+
+Σε batch ερωτημάτων (ScorerCache) οι scorers είναι κοινοί, οπότε η λίστα κάθε όρου
+βαθμολογείται το πολύ μία φορά για όλα τα ερωτήματα που τον περιέχουν.
+
+"""
+
+import threading
+
+import numpy as np
+
+from app.core.facets import isin_sorted
+from app.core.inverted_index import bm25_term_scores
+
+# Σχετική ανοχή στα άνω φράγματα (διαφορές στρογγυλοποίησης float32 στα αθροίσματα)
+BOUND_TOLERANCE = 1e-5
+
+# Μέγιστο πλήθος βαθμολογημένων postings που κρατάει στη μνήμη ένα ScorerCache (~12 bytes το καθένα)
+CACHE_MAX_POSTINGS = 20_000_000
+
+# Πίνακας μερικών scores ανά thread, κοινός για όλα τα ερωτήματα του thread
+BUFFERS = threading.local()
+
+class TermScorer:
+    """
+    Συνεισφορά BM25 ενός όρου ερωτήματος (qtf × idf × βάρος) πάνω στα postings του.
+
+    Τα postings είναι τμήματα (first, doc_lengths, docs, tfs): του βασικού ευρετηρίου
+    (first = 0) και κάθε segment (first = το πρώτο doc id του segment).
+
+    """
+
+    def __init__(self, weight: float, parts: list, avgdl: float, upper_bound: float):
+        self.weight = weight
+        self.parts = parts
+        self.avgdl = avgdl
+        self.upper_bound = upper_bound
+        self.lock = None
+        self.scored = None
+
+    def __len__(self) -> int:
+        return sum(len(docs) for _, _, docs, _ in self.parts)
+
+    def memoize(self):
+        """
+        Τα postings του όρου βαθμολογούνται μία φορά και κρατούνται (κοινός scorer σε batch).
+
+        """
+        self.lock = threading.Lock()
+
+    def score_all(self):
+        """
+        Όλα τα postings του όρου: (ταξινομημένα doc ids, scores).
+
+        """
+        if self.lock is None:
+            return self.compute_all()
+        with self.lock:
+            if self.scored is None:
+                self.scored = self.compute_all()
+            return self.scored
+
+    def compute_all(self):
+        all_docs = [docs.astype(np.int64) + first for first, _, docs, _ in self.parts]
+        all_scores = [bm25_term_scores(self.weight, tfs, doc_lengths[docs], self.avgdl) for _, doc_lengths, docs, tfs in self.parts]
+        if not all_docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        return np.concatenate(all_docs), np.concatenate(all_scores)
+
+    def score(self, doc_ids):
+        """
+        Scores του όρου μόνο για τις δοσμένες (ταξινομημένες) ομιλίες (0 όπου ο όρος λείπει).
+
+        """
+        scores = np.zeros(len(doc_ids), dtype=np.float64)
+        for first, doc_lengths, docs, tfs in self.parts:
+            if len(docs) == 0:
+                continue
+            local = doc_ids - first
+            found = np.minimum(np.searchsorted(docs, local), len(docs) - 1)
+            hits = np.flatnonzero(docs[found] == local)
+            postings = found[hits]
+            scores[hits] += bm25_term_scores(self.weight, tfs[postings], doc_lengths[docs[postings]], self.avgdl)
+        return scores
+
+class ScorerCache:
+    """
+    Κοινοί TermScorers για πολλά ερωτήματα (batch), ανά (όρο, συχνότητα στο ερώτημα).
+
+    Κάθε scorer δημιουργείται μία φορά και οι λίστες που διαβάζονται ολόκληρες κρατούνται
+    βαθμολογημένες, μέχρι max_postings συνολικά· πέρα από αυτό οι νέοι όροι βαθμολογούνται
+    χωρίς αποθήκευση. Είναι ασφαλές για χρήση από πολλά threads.
+
+    """
+
+    def __init__(self, max_postings: int = CACHE_MAX_POSTINGS):
+        self.max_postings = max_postings
+        self.scorers = {}
+        self.postings = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, make):
+        with self.lock:
+            self.requests += 1
+            scorer = self.scorers.get(key)
+            if scorer is None:
+                scorer = make()
+                if self.postings + len(scorer) <= self.max_postings:
+                    scorer.memoize()
+                    self.scorers[key] = scorer
+                    self.postings += len(scorer)
+            return scorer
+
+    def stats(self) -> dict:
+        scored = [s for s in self.scorers.values() if s.scored is not None]
+        return {
+            "term_lookups": self.requests,
+            "unique_terms": len(self.scorers),
+            "lists_scored": len(scored),
+            "postings_scored": sum(len(s) for s in scored),
+        }
+
+def kth_score(scores, k: int) -> float:
+    if len(scores) < k:
+        return 0.0
+    return float(np.partition(scores, len(scores) - k)[len(scores) - k])
+
+def top_k_of(doc_ids, scores, k: int):
+    """
+    Τα doc ids των k μεγαλύτερων scores (χωρίς σειρά) και το k-οστό score (0 αν είναι λιγότερα από k).
+
+    """
+    if len(doc_ids) <= k:
+        return doc_ids, float(scores.min()) if len(doc_ids) == k else 0.0
+    top = np.argpartition(-scores, k - 1)[:k]
+    return doc_ids[top], float(scores[top].min())
+
+def rank_top_k(doc_ids, scores, k: int):
+    """
+    Τα top-k κατά score (φθίνουσα σειρά, ισοβαθμίες κατά doc id) με argpartition.
+
+    Το argpartition διαλέγει αυθαίρετα ανάμεσα σε ισοβαθμίες στο k-οστό score, οπότε
+    υποψήφιες είναι όλες οι ομιλίες με score τουλάχιστον ίσο με αυτό.
+
+    """
+    k = max(0, min(k, len(doc_ids)))
+    if 0 < k < len(doc_ids):
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        top = np.flatnonzero(scores >= kth)
+    else:
+        top = np.arange(len(doc_ids))
+    return top[np.lexsort((doc_ids[top], -scores[top]))][:k]
+
+def score_buffer(n_docs: int):
+    """
+    Μηδενικός πίνακας float64 με τουλάχιστον n_docs θέσεις, ένας ανά thread.
+
+    Δημιουργείται μία φορά (και ξανά μόνο όταν μεγαλώσει το corpus)· όποιος τον χρησιμοποιεί
+    μηδενίζει στο τέλος μόνο τις θέσεις που άγγιξε, οπότε το κόστος ενός ερωτήματος είναι
+    ανάλογο των postings του και όχι του μεγέθους του corpus.
+
+    """
+    buffer = getattr(BUFFERS, "scores", None)
+    if buffer is None or len(buffer) < n_docs:
+        buffer = BUFFERS.scores = np.zeros(n_docs, dtype=np.float64)
+    return buffer
+
+def maxscore_top_k(scorers: list, k: int, n_docs: int, allowed=None, excluded=None):
+    """
+    Τα top-k (doc ids, scores) του αθροίσματος των scorers, με κλάδεμα MaxScore.
+
+    1. Ταξινομεί τους όρους κατά άνω φράγμα (φθίνουσα σειρά)
+    2. Διαβάζει ολόκληρες λίστες όσο τα φράγματα των υπόλοιπων όρων μπορούν να ξεπεράσουν το θ
+    3. Για τους υπόλοιπους όρους κλαδεύει τους υποψήφιους και συμπληρώνει τα scores τους
+    4. Επιστρέφει επίσης στατιστικά: ομιλίες που βαθμολογήθηκαν και postings που παραλείφθηκαν
+
+    Τα μερικά scores των ουσιωδών όρων αθροίζονται στον πίνακα του thread (score_buffer). Το θ και οι
+    συγκρίσεις γίνονται στα scores στρογγυλοποιημένα σε float32, όπως τα κατατάσσει η εξαντλητική
+    αξιολόγηση: μια ομιλία κλαδεύεται μόνο αν ούτε το φράγμα της δεν φτάνει το θ, οπότε και οι
+    ισοβαθμίες (κατά doc id) είναι ίδιες με τα εξαντλητικά top-k.
+    Το allowed (ταξινομημένα doc ids, π.χ. φίλτρο μέλους/κόμματος) περιορίζει τους υποψήφιους
+    πριν από τον υπολογισμό του θ, οπότε το κλάδεμα μένει ακριβές και με φίλτρα· το excluded
+    (ταξινομημένα doc ids, π.χ. διπλότυπα) αφαιρεί ομιλίες με τον ίδιο τρόπο.
+
+    """
+    scorers = sorted(scorers, key=lambda s: -s.upper_bound)
+    bounds = np.array([s.upper_bound * (1 + BOUND_TOLERANCE) for s in scorers])
+    remaining = np.concatenate((np.cumsum(bounds[::-1])[::-1], [0.0]))
+
+    accumulator = score_buffer(n_docs)
+    touched = []
+    top = np.empty(0, dtype=np.int64)
+    threshold = 0.0
+    essential = 0
+    try:
+        while essential < len(scorers) and k > 0:
+            if len(top) >= k and np.float32(remaining[essential]) < threshold:
+                break
+            docs, term_scores = scorers[essential].score_all()
+            if allowed is not None:
+                keep = isin_sorted(docs, allowed)
+                docs, term_scores = docs[keep], term_scores[keep]
+            if excluded is not None:
+                keep = ~isin_sorted(docs, excluded)
+                docs, term_scores = docs[keep], term_scores[keep]
+            # Κάθε ομιλία εμφανίζεται μία φορά στη λίστα ενός όρου, οπότε η πρόσθεση με δείκτες είναι ασφαλής
+            accumulator[docs] += term_scores
+            touched.append(docs)
+            # Μόνο οι ομιλίες του όρου άλλαξαν score: τα νέα top-k είναι τα top-k των παλιών και αυτών
+            pool = np.concatenate((top[~isin_sorted(top, docs)], docs))
+            top, threshold = top_k_of(pool, accumulator[pool].astype(np.float32), k)
+            essential += 1
+
+        doc_ids = np.unique(np.concatenate(touched)) if touched else np.empty(0, dtype=np.int64)
+        scores = accumulator[doc_ids]
+    finally:
+        for docs in touched:
+            accumulator[docs] = 0.0
+    scored = len(doc_ids)
+    lookups = 0
+    for i in range(essential, len(scorers)):
+        keep = (scores + remaining[i]).astype(np.float32) >= threshold
+        doc_ids, scores = doc_ids[keep], scores[keep]
+        scores += scorers[i].score(doc_ids)
+        lookups += len(doc_ids)
+        threshold = kth_score(scores.astype(np.float32), k)
+
+    scores = scores.astype(np.float32)
+    top = rank_top_k(doc_ids, scores, k)
+    stats = {
+        "mode": "maxscore",
+        "terms": len(scorers),
+        "essential_terms": essential,
+        "postings": sum(len(s) for s in scorers),
+        "scored": scored,
+        "skipped": sum(len(s) for s in scorers[essential:]),
+        "lookups": lookups,
+    }
+    return doc_ids[top], scores[top], stats
@@ -0,0 +1,240 @@
+"""
+Cache αποκρίσεων (JSON) για τα endpoints ανάλυσης, με HTTP conditional responses.
+
+Τα tabs του frontend στέλνουν επανειλημμένα τα ίδια αιτήματα (timelines, topic drift,
+θέματα LSI). Το ResponseCacheMiddleware κρατάει τις αποκρίσεις των GET αιτημάτων:
+- κλειδί: path + ταξινομημένες παράμετροι query + fingerprint του dataset και γενιά των segments
+  (νέο dataset ή νέες συνεδριάσεις → νέα κλειδιά, οπότε οι παλιές εγγραφές δεν επιστρέφονται ποτέ)
+- LRU στη μνήμη με όριο σε bytes και προαιρετικό επίπεδο στον δίσκο που επιβιώνει επανεκκινήσεις
+- ETag / Cache-Control σε κάθε απόκριση και 304 Not Modified όταν το If-None-Match ταιριάζει
+
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode
+
+from app.core.data_loader import DATA_DIR, dataset_fingerprint
+from app.core.metrics import timing_requested
+from app.core.segments import segment_generation
+
+# Φάκελος του επιπέδου δίσκου του cache
+RESPONSE_CACHE_DIR = DATA_DIR / "response_cache"
+
+# Όριο μνήμης του LRU (bytes σωμάτων αποκρίσεων)
+MAX_MEMORY_BYTES = 64 * 1024 * 1024
+
+# Αποκρίσεις μεγαλύτερες από αυτό δεν αποθηκεύονται
+MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+# Χρόνος (δευτερόλεπτα) για τον οποίο ο browser μπορεί να χρησιμοποιήσει την απόκριση χωρίς επανέλεγχο
+CACHE_MAX_AGE = 60
+
+# Endpoints των οποίων οι αποκρίσεις αποθηκεύονται
+CACHED_PREFIXES = (
+    "/api/analysis", "/api/keywords", "/api/lsi", "/api/clustering",
+    "/api/similarity", "/api/data", "/api/speeches", "/api/duplicates",
+)
+
+# Παράμετροι που σημαίνουν ότι η απόκριση δεν είναι αποτέλεσμα (π.χ. job id)
+UNCACHED_PARAMS = {"background": {"true", "1", "yes", "on"}}
+
+def cache_key(path: str, query_string: bytes, fingerprint: str) -> str:
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    raw = f"{path}?{urlencode(params)}#{fingerprint}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(tag.removeprefix("W/") == etag for tag in candidates)
+
+class ResponseCache:
+    """
+    LRU αποκρίσεων με όριο σε bytes και προαιρετικό επίπεδο στον δίσκο.
+
+    Στον δίσκο κάθε εγγραφή είναι ένα αρχείο disk_dir/<fingerprint>/<key>.json·
+    οι φάκελοι άλλων fingerprints (παλιά datasets) διαγράφονται στην πρώτη εγγραφή.
+
+    """
+
+    def __init__(self, max_bytes: int = MAX_MEMORY_BYTES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.pruned_fingerprint = None
+
+    def get(self, key: str, fingerprint: str):
+        body = self.entries.get(key)
+        if body is not None:
+            self.entries.move_to_end(key)
+        elif self.disk_dir is not None:
+            try:
+                body = (self.disk_dir / fingerprint / f"{key}.json").read_bytes()
+            except OSError:
+                # Δεν υπάρχει (ή διαγράφηκε μόλις από άλλον worker): miss
+                body = None
+            if body is not None:
+                self.remember(key, body)
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    def remember(self, key: str, body: bytes):
+        if key in self.entries:
+            self.size -= len(self.entries.pop(key))
+        self.entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes and self.entries:
+            _, evicted = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def put(self, key: str, fingerprint: str, body: bytes):
+        if len(body) > MAX_ENTRY_BYTES:
+            return
+        self.remember(key, body)
+        if self.disk_dir is None:
+            return
+        if self.pruned_fingerprint != fingerprint:
+            self.prune_disk(fingerprint)
+        try:
+            self.write_disk(self.disk_dir / fingerprint, key, body)
+        except OSError:
+            # Το επίπεδο δίσκου είναι βελτιστοποίηση: αποτυχία εγγραφής σημαίνει απλώς miss αργότερα
+            pass
+
+    def write_disk(self, directory, key: str, body: bytes):
+        """
+        Ατομική εγγραφή στον δίσκο: μοναδικό προσωρινό αρχείο ανά εγγραφή και μετονομασία,
+        ώστε workers που γράφουν το ίδιο κλειδί ταυτόχρονα να μη συγκρούονται.
+
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=f"{key}.", suffix=".tmp", delete=False) as tmp:
+            tmp.write(body)
+        try:
+            os.replace(tmp.name, directory / f"{key}.json")
+        except OSError:
+            os.unlink(tmp.name)
+            raise
+
+    def prune_disk(self, fingerprint: str):
+        if self.disk_dir.exists():
+            for directory in self.disk_dir.iterdir():
+                if directory.is_dir() and directory.name != fingerprint:
+                    shutil.rmtree(directory, ignore_errors=True)
+        self.pruned_fingerprint = fingerprint
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+        if self.disk_dir is not None:
+            shutil.rmtree(self.disk_dir, ignore_errors=True)
+
+    def stats(self) -> dict:
+        return {"entries": len(self.entries), "bytes": self.size, "hits": self.hits, "misses": self.misses}
+
+RESPONSE_CACHE = None
+
+def get_response_cache() -> ResponseCache:
+    global RESPONSE_CACHE
+    if RESPONSE_CACHE is None:
+        RESPONSE_CACHE = ResponseCache(disk_dir=RESPONSE_CACHE_DIR)
+    return RESPONSE_CACHE
+
+def cacheable(scope) -> bool:
+    """
+    Αν το αίτημα εξυπηρετείται από το cache.
+
+    Τα αιτήματα με timing (παράμετρος ή X-Timing) παρακάμπτουν το cache, ώστε να
+    εκτελούνται και να επιστρέφουν στο Server-Timing τα στάδιά τους.
+
+    """
+    if scope["type"] != "http" or scope["method"] != "GET":
+        return False
+    if not scope["path"].startswith(CACHED_PREFIXES) or timing_requested(scope):
+        return False
+    params = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    return not any(value.lower() in UNCACHED_PARAMS.get(name, ()) for name, value in params)
+
+def request_header(scope, name: bytes):
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware που εξυπηρετεί τα GET αιτήματα των CACHED_PREFIXES από το ResponseCache.
+
+    Αποθηκεύονται μόνο αποκρίσεις 200 με σώμα JSON· οι υπόλοιπες (π.χ. streaming) περνούν αυτούσιες.
+
+    """
+
+    def __init__(self, app, cache: ResponseCache):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if not cacheable(scope):
+            await self.app(scope, receive, send)
+            return
+
+        fingerprint = f"{dataset_fingerprint() or 'none'}-{segment_generation()}"
+        key = cache_key(scope["path"], scope["query_string"], fingerprint)
+        if_none_match = request_header(scope, b"if-none-match")
+
+        body = self.cache.get(key, fingerprint)
+        if body is not None:
+            await self.respond(send, body, if_none_match, "HIT")
+            return
+
+        chunks = []
+        passthrough = False
+
+        async def capture(message):
+            nonlocal passthrough
+            if message["type"] == "http.response.start":
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if message["status"] != 200 or not content_type.startswith(b"application/json"):
+                    passthrough = True
+                    await send(message)
+                return
+            if passthrough:
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                body = b"".join(chunks)
+                self.cache.put(key, fingerprint, body)
+                await self.respond(send, body, if_none_match, "MISS")
+
+        await self.app(scope, receive, capture)
+
+    async def respond(self, send, body: bytes, if_none_match, status: str):
+        etag = make_etag(body)
+        headers = [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", f"public, max-age={CACHE_MAX_AGE}".encode("latin-1")),
+            (b"x-cache", status.encode("latin-1")),
+        ]
+        if if_none_match and etag_matches(if_none_match, etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers += [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
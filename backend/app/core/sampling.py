@@ -0,0 +1,241 @@
+"""
+Ευρετήριο δειγματοληψίας: επαναλήψιμα (seed), στρωματοποιημένα δείγματα ομιλιών.
+
+Οι ομιλίες ομαδοποιούνται σε στρώματα (έτος × κόμμα) και αποθηκεύονται ως ταξινομημένοι
+πίνακες doc ids ανά στρώμα (μορφή CSR: rows[offsets[s]:offsets[s + 1]]). Ένα δείγμα:
+- επιλέγει τα στρώματα των φίλτρων (διάστημα ετών, κόμμα) από τους μικρούς πίνακες των στρωμάτων
+- κατανέμει το μέγεθος του δείγματος στις ομάδες της στρωματοποίησης (έτος, κόμμα ή και τα δύο)
+- τραβά θέσεις χωρίς επανάθεση μέσα σε κάθε ομάδα και τις μεταφράζει σε doc ids
+  με δυαδική αναζήτηση στα αθροιστικά μεγέθη των στρωμάτων
+
+Το κόστος είναι ανάλογο του δείγματος (και του πλήθους των στρωμάτων), χωρίς σάρωση ή
+αντιγραφή του DataFrame. Το ευρετήριο καλύπτει τις ομιλίες του αρχικού corpus (όπως το
+tokenized corpus από το οποίο υπολογίζονται τα θέματα και οι ομάδες του δείγματος).
+
+"""
+
+import numpy as np
+
+from app.core.artifacts import read_artifact, write_artifact
+from app.core.data_loader import DATA_DIR, load_df
+from app.core.facets import FACETS, NameMatcher
+
+# Φάκελος αποθήκευσης του ευρετηρίου
+SAMPLING_DIR = DATA_DIR / "sampling"
+
+# Στρωματοποιήσεις: όνομα → πεδία του στρώματος που ορίζουν τις ομάδες
+STRATIFICATIONS = {"year": ("year",), "party": ("party",), "year_party": ("year", "party")}
+
+# Κατανομή του δείγματος στις ομάδες: ανάλογη του μεγέθους τους ή ίση (με όριο το μέγεθος)
+ALLOCATIONS = ("proportional", "equal")
+
+DEFAULT_SEED = 42
+
+SAMPLING_CACHE = None
+
+def allocate(sizes, n: int, allocation: str = "proportional"):
+    """
+    Κατανομή n δειγμάτων σε ομάδες με τα δοσμένα μεγέθη (καμία ομάδα πάνω από το μέγεθός της).
+
+    - proportional: n·μέγεθος/σύνολο, με τα υπόλοιπα στις ομάδες με τα μεγαλύτερα κλασματικά μέρη
+    - equal: ίσο μερίδιο ανά ομάδα· ό,τι περισσεύει από τις μικρές ομάδες μοιράζεται στις υπόλοιπες
+
+    """
+    sizes = np.asarray(sizes, dtype=np.int64)
+    n = min(n, int(sizes.sum()))
+    if allocation == "equal":
+        counts = np.zeros(len(sizes), dtype=np.int64)
+        remaining = n
+        # Από τη μικρότερη ομάδα: παίρνει το μερίδιό της ή όλες τις ομιλίες της
+        for rank, group in enumerate(np.argsort(sizes, kind="stable")):
+            share = remaining // (len(sizes) - rank)
+            counts[group] = min(sizes[group], share)
+            remaining -= counts[group]
+        # Υπόλοιπο της ακέραιας διαίρεσης: μία ομιλία στις μεγαλύτερες ομάδες με περιθώριο
+        for group in np.argsort(-sizes, kind="stable"):
+            if remaining == 0:
+                break
+            if counts[group] < sizes[group]:
+                counts[group] += 1
+                remaining -= 1
+        return counts
+
+    exact = n * sizes / max(int(sizes.sum()), 1)
+    counts = np.floor(exact).astype(np.int64)
+    remainder = n - int(counts.sum())
+    if remainder:
+        counts[np.argsort(-(exact - counts), kind="stable")[:remainder]] += 1
+    return counts
+
+class SamplingIndex:
+    """
+    Ομιλίες ανά στρώμα (έτος × κόμμα): rows[offsets[s]:offsets[s + 1]] είναι τα (ταξινομημένα) doc ids του στρώματος s.
+
+    """
+
+    def __init__(self, rows, offsets, years, parties, party_labels):
+        self.rows = rows
+        self.offsets = offsets
+        self.years = years
+        self.parties = parties
+        self.party_labels = list(party_labels)
+        self.matcher = NameMatcher(self.party_labels)
+
+    @property
+    def n_strata(self) -> int:
+        return len(self.years)
+
+    def sizes(self):
+        return np.diff(self.offsets)
+
+    def strata(self, start_year=None, end_year=None, party: str | None = None):
+        """
+        Τα στρώματα που ικανοποιούν τα φίλτρα (το κόμμα επιλύεται όπως στο facet κόμματος).
+
+        """
+        keep = np.ones(self.n_strata, dtype=bool)
+        if start_year is not None:
+            keep &= self.years >= start_year
+        if end_year is not None:
+            keep &= self.years <= end_year
+        if party is not None:
+            keep &= np.isin(self.parties, self.matcher.match(party))
+        return np.flatnonzero(keep)
+
+    def draw(self, strata, n: int, rng):
+        """
+        n doc ids χωρίς επανάθεση, ομοιόμορφα από την ένωση των δοσμένων στρωμάτων.
+
+        Οι θέσεις τραβιούνται στο [0, σύνολο) και κάθε θέση μεταφράζεται στο στρώμα της
+        (δυαδική αναζήτηση στα αθροιστικά μεγέθη) και στο doc id της μέσα σε αυτό.
+
+        """
+        sizes = self.offsets[strata + 1] - self.offsets[strata]
+        ends = np.cumsum(sizes)
+        positions = rng.choice(int(ends[-1]), size=n, replace=False)
+        owners = np.searchsorted(ends, positions, side="right")
+        return self.rows[self.offsets[strata[owners]] + positions - (ends[owners] - sizes[owners])]
+
+    def sample(self, n: int, seed: int = DEFAULT_SEED, stratify_by: str | None = None,
+               start_year=None, end_year=None, party: str | None = None, allocation: str = "proportional"):
+        """
+        Επαναλήψιμο δείγμα έως n ομιλιών: (ταξινομημένα doc ids, περιγραφή του δείγματος).
+
+        1. Επιλέγει τα στρώματα των φίλτρων (διάστημα ετών, κόμμα)
+        2. Τα ομαδοποιεί κατά stratify_by (χωρίς στρωματοποίηση: μία ομάδα, δηλαδή απλό τυχαίο δείγμα)
+        3. Κατανέμει το n στις ομάδες (proportional ή equal)
+        4. Τραβά τα doc ids κάθε ομάδας χωρίς επανάθεση, με γεννήτρια από το seed
+
+        Το ίδιο seed με τις ίδιες παραμέτρους δίνει πάντα το ίδιο δείγμα.
+
+        """
+        strata = self.strata(start_year, end_year, party)
+        sizes = self.sizes()[strata]
+        strata, sizes = strata[sizes > 0], sizes[sizes > 0]
+        population = int(sizes.sum())
+        if population == 0:
+            return np.empty(0, dtype=np.int64), {"population": 0, "size": 0, "groups": 0}
+
+        fields = {"year": self.years[strata], "party": self.parties[strata]}
+        columns = [fields[field] for field in STRATIFICATIONS[stratify_by]] if stratify_by else [np.zeros(len(strata))]
+        group_keys, groups = np.unique(np.column_stack(columns), axis=0, return_inverse=True)
+        groups = groups.ravel()
+        group_sizes = np.bincount(groups, weights=sizes, minlength=len(group_keys)).astype(np.int64)
+        counts = allocate(group_sizes, n, allocation)
+
+        # Τα στρώματα κάθε ομάδας ως συνεχές τμήμα (χωρίς μάσκα ανά ομάδα)
+        order = np.argsort(groups, kind="stable")
+        bounds = np.searchsorted(groups[order], np.arange(len(group_keys) + 1))
+
+        rng = np.random.default_rng(seed)
+        parts = [
+            self.draw(strata[order[bounds[g]:bounds[g + 1]]], int(counts[g]), rng)
+            for g in range(len(group_keys)) if counts[g]
+        ]
+        doc_ids = np.sort(np.concatenate(parts).astype(np.int64))
+        return doc_ids, {"population": population, "size": len(doc_ids), "groups": len(group_keys)}
+
+def parse_year_range(text: str | None):
+    """
+    Διάστημα ετών από κείμενο "2000-2010" ή "2005": (start_year, end_year), (None, None) χωρίς διάστημα.
+
+    """
+    if not text:
+        return None, None
+    start, _, end = text.partition("-")
+    return int(start), int(end or start)
+
+def sample_params_error(sample_size, seed=None, stratify_by=None, allocation=None, year_range=None, party=None):
+    """
+    Έλεγχος των παραμέτρων δειγματοληψίας των endpoints: μήνυμα σφάλματος ή None.
+
+    Χωρίς sample_size οι απαντήσεις προέρχονται από τα μοντέλα ολόκληρου του corpus,
+    οπότε οι παράμετροι του δείγματος απορρίπτονται αντί να αγνοούνται σιωπηλά.
+
+    """
+    start_year, end_year = parse_year_range(year_range)
+    if start_year is not None and start_year > end_year:
+        return "year_range start must be <= end"
+    if sample_size is None and any(value is not None for value in (seed, stratify_by, allocation, year_range, party)):
+        return "seed, stratify_by, allocation, year_range and party require sample_size"
+    return None
+
+def draw_sample(sample_size: int, seed: int | None = None, stratify_by: str | None = None,
+                year_range: str | None = None, party: str | None = None, allocation: str | None = None):
+    """
+    Δείγμα για τα endpoints θεμάτων/ομάδων: (doc ids, περιγραφή του δείγματος για την απόκριση).
+
+    """
+    seed = DEFAULT_SEED if seed is None else seed
+    allocation = allocation or "proportional"
+    start_year, end_year = parse_year_range(year_range)
+    doc_ids, info = get_sampling_index().sample(sample_size, seed, stratify_by, start_year, end_year, party, allocation)
+    return doc_ids, {
+        "seed": seed,
+        "stratify_by": stratify_by,
+        "allocation": allocation,
+        "year_range": year_range,
+        "party": party,
+        **info,
+    }
+
+def build_sampling_index(df=None) -> SamplingIndex:
+    """
+    Στρώματα (έτος × κόμμα) από τις στήλες year και κόμματος του snapshot (σταθερή ταξινόμηση,
+    οπότε τα doc ids κάθε στρώματος είναι ταξινομημένα).
+
+    """
+    if df is None:
+        df = load_df()
+    values = df[FACETS["party"]]
+    party_labels = [str(label) for label in values.cat.categories]
+    parties = values.cat.codes.to_numpy().astype(np.int64)
+    years = df["year"].to_numpy().astype(np.int64)
+
+    keys = (years - years.min()) * (len(party_labels) + 1) + parties + 1
+    order = np.argsort(keys, kind="stable")
+    _, starts = np.unique(keys[order], return_index=True)
+    offsets = np.append(starts, len(order)).astype(np.int64)
+    first = order[starts]
+    return SamplingIndex(order.astype(np.int32), offsets, years[first].astype(np.int16), parties[first].astype(np.int32), party_labels)
+
+def save_sampling_index(index: SamplingIndex, path=SAMPLING_DIR):
+    arrays = {"rows": index.rows, "offsets": index.offsets, "years": index.years, "parties": index.parties}
+    return write_artifact(path, arrays, meta={"party_labels": index.party_labels, "n_strata": index.n_strata})
+
+def load_sampling_index(path=SAMPLING_DIR):
+    loaded = read_artifact(path, ["rows", "offsets", "years", "parties"])
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return SamplingIndex(party_labels=meta["party_labels"], **arrays)
+
+def get_sampling_index() -> SamplingIndex:
+    global SAMPLING_CACHE
+    if SAMPLING_CACHE is None:
+        index = load_sampling_index()
+        if index is None:
+            save_sampling_index(build_sampling_index())
+            index = load_sampling_index()
+        SAMPLING_CACHE = index
+    return SAMPLING_CACHE
@@ -0,0 +1,288 @@
+"""
+Εκτέλεση ερωτημάτων αναζήτησης (ένα ερώτημα, batch ερωτημάτων ή εξαγωγή όλων των αποτελεσμάτων).
+
+Ένα batch εκτελείται πάνω στο ίδιο στιγμιότυπο του corpus και με κοινό ScorerCache:
+οι όροι όλων των ερωτημάτων συγκεντρώνονται ανά (όρο, συχνότητα) και η λίστα postings κάθε
+όρου διαβάζεται και βαθμολογείται το πολύ μία φορά, όσα ερωτήματα κι αν τον περιέχουν.
+Τα ερωτήματα μοιράζονται σε threads (οι πράξεις numpy στα postings απελευθερώνουν το GIL),
+ώστε να χρησιμοποιούνται όλοι οι πυρήνες χωρίς αντίγραφα της cache σε άλλες διεργασίες.
+
+"""
+
+import base64
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+
+from app.core.data_loader import speech_results
+from app.core.duplicates import get_duplicate_index
+from app.core.facets import isin_sorted
+from app.core.jobs import MAX_WORKERS
+from app.core.metrics import stage
+from app.core.positions import constrained_docs, parse_query
+from app.core.pruning import ScorerCache, rank_top_k
+from app.core.segments import get_live_corpus
+from app.core.snippets import SNIPPET_LENGTH, compile_terms, highlight
+
+# Πλήθος threads για batch ερωτημάτων (όσες και οι διεργασίες του process pool του worker)
+BATCH_WORKERS = MAX_WORKERS
+
+# Πλήθος αποτελεσμάτων της εξαγωγής που κατατάσσονται πριν από την πλήρη ταξινόμηση
+EXPORT_FIRST_CHUNK = 1_000
+
+def matching_docs(query, request: dict, live, cache: ScorerCache | None = None):
+    """
+    Όλες οι ομιλίες που ταιριάζουν σε ένα ερώτημα (χωρίς ταξινόμηση): (doc ids, scores, στατιστικά).
+
+    1. BM25 σε όλες τις ομιλίες που περιέχουν κάποιον όρο
+    2. Κρατάει όσες ικανοποιούν τις φράσεις και τους τελεστές NEAR (ευρετήριο θέσεων)
+    3. Εφαρμόζει τα φίλτρα κόμματος/μέλους και, με collapse_duplicates, παραλείπει τα διπλότυπα
+
+    """
+    filters = [(facet, request.get(facet)) for facet in ("party", "member") if request.get(facet)]
+    duplicates = get_duplicate_index() if request.get("collapse_duplicates") else None
+
+    with stage("bm25"):
+        doc_ids, scores = live.bm25(query.terms, cache)
+    evaluation = {"mode": "exhaustive", "terms": sum(t in live.term_index for t in set(query.terms)), "scored": len(doc_ids), "skipped": 0}
+
+    if query.has_constraints and len(doc_ids):
+        with stage("positions"):
+            keep = isin_sorted(doc_ids, constrained_docs(live, query, doc_ids))
+            doc_ids, scores = doc_ids[keep], scores[keep]
+
+    with stage("filter"):
+        for facet, text in filters:
+            if len(doc_ids):
+                keep = live.filter(doc_ids, facet, text)
+                doc_ids, scores = doc_ids[keep], scores[keep]
+        if duplicates is not None:
+            keep = ~isin_sorted(doc_ids, duplicates.redundant)
+            doc_ids, scores = doc_ids[keep], scores[keep]
+    return doc_ids, scores, evaluation
+
+def evaluate_search(request: dict, live, cache: ScorerCache | None = None):
+    """
+    Αξιολόγηση ενός ερωτήματος (πεδία του SearchRequest): (doc ids, scores, στατιστικά) των top_k.
+
+    1. Διαιρεί το query σε όρους, φράσεις και τελεστές NEAR
+    2. Με exhaustive (ή φράσεις / NEAR): όλες οι ομιλίες που ταιριάζουν και top_k·
+       αλλιώς top_k με κλάδεμα MaxScore, με τα φίλτρα ως επιτρεπτές ομιλίες
+
+    Επιστρέφει None για ερώτημα χωρίς όρους. Η cache (batch ερωτημάτων) κάνει κοινή
+    τη βαθμολόγηση των όρων μεταξύ των ερωτημάτων.
+
+    """
+    with stage("tokenize"):
+        query = parse_query(request["query"])
+    if not query.terms:
+        return None
+
+    top_k = request.get("top_k", 5)
+    if request.get("exhaustive") or query.has_constraints:
+        doc_ids, scores, evaluation = matching_docs(query, request, live, cache)
+        with stage("rank"):
+            top = rank_top_k(doc_ids, scores, top_k)
+        return doc_ids[top], scores[top], evaluation
+
+    with stage("filter"):
+        allowed = None
+        for facet in ("party", "member"):
+            if request.get(facet):
+                facet_ids = live.facet_doc_ids(facet, request[facet])
+                allowed = facet_ids if allowed is None else np.intersect1d(allowed, facet_ids, assume_unique=True)
+
+    with stage("bm25"):
+        duplicates = get_duplicate_index() if request.get("collapse_duplicates") else None
+        excluded = duplicates.redundant if duplicates is not None else None
+        return live.top_k(query.terms, top_k, allowed, excluded, cache)
+
+def search_responses(requests: list[dict], evaluated: list, live) -> list[dict]:
+    """
+    Οι αποκρίσεις πολλών αξιολογημένων ερωτημάτων, με ένα πέρασμα στο DataFrame για τα
+    αποτελέσματα όλων (snippet, μεταδεδομένα).
+
+    Με collapse_duplicates κάθε αποτέλεσμα αναφέρει και πόσα διπλότυπα αντιπροσωπεύει.
+
+    """
+    ranked = [item for item in evaluated if item is not None]
+    doc_ids = np.concatenate([item[0] for item in ranked]) if ranked else np.empty(0, dtype=np.int64)
+    scores = np.concatenate([item[1] for item in ranked]) if ranked else np.empty(0, dtype=np.float32)
+    all_results = iter(speech_results(doc_ids, scores, df=live.frame()))
+
+    responses = []
+    for request, item in zip(requests, evaluated):
+        if item is None:
+            responses.append({"query": request["query"], "results": []})
+            continue
+        query_doc_ids, _, evaluation = item
+        results = [next(all_results) for _ in range(len(query_doc_ids))]
+        if request.get("collapse_duplicates"):
+            # Κάθε αποτέλεσμα αντιπροσωπεύει και τα διπλότυπά του (όσα παραλείφθηκαν)
+            duplicates = get_duplicate_index()
+            for result, doc_id in zip(results, query_doc_ids):
+                result["duplicates"] = duplicates.duplicate_count(int(doc_id))
+        responses.append({"query": request["query"], "results": results, "evaluation": evaluation})
+    return responses
+
+def execute_search(request: dict, live=None, cache: ScorerCache | None = None) -> dict:
+    """
+    Εκτέλεση ενός ερωτήματος: αξιολόγηση και απόκριση με τα αποτελέσματα.
+
+    """
+    if live is None:
+        live = get_live_corpus()
+    return search_responses([request], [evaluate_search(request, live, cache)], live)[0]
+
+def iter_search_batch(requests: list[dict], cache: ScorerCache, workers: int = BATCH_WORKERS):
+    """
+    Εκτέλεση πολλών ερωτημάτων με κοινή cache όρων, παράλληλα σε threads.
+
+    Επιστρέφει (yield) ζεύγη (θέση στο batch, απόκριση) μόλις ολοκληρώνεται κάθε ερώτημα
+    (με σειρά ολοκλήρωσης)· όλα τα ερωτήματα βλέπουν το ίδιο στιγμιότυπο του corpus.
+    Αν ο καλών σταματήσει νωρίτερα (π.χ. αποσύνδεση του client), τα υπόλοιπα ακυρώνονται.
+
+    """
+    live = get_live_corpus()
+    live.frame()
+    if workers == 1 or len(requests) < 2:
+        for position, request in enumerate(requests):
+            yield position, execute_search(request, live, cache)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        futures = {executor.submit(execute_search, request, live, cache): position for position, request in enumerate(requests)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def search_batch(requests: list[dict], cache: ScorerCache, workers: int = BATCH_WORKERS) -> list[dict]:
+    """
+    Εκτέλεση πολλών ερωτημάτων με κοινή cache όρων: αξιολόγηση παράλληλα σε threads και
+    ένα κοινό πέρασμα για τα αποτελέσματα όλων· οι αποκρίσεις με τη σειρά του batch.
+
+    """
+    live = get_live_corpus()
+    live.frame()
+    if workers == 1 or len(requests) < 2:
+        evaluated = [evaluate_search(request, live, cache) for request in requests]
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            evaluated = list(executor.map(lambda request: evaluate_search(request, live, cache), requests))
+    return search_responses(requests, evaluated, live)
+
+def encode_cursor(score: float, speech_id: int) -> str:
+    """
+    Cursor σελιδοποίησης: η θέση μετά από την τελευταία ομιλία που στάλθηκε (score, speech_id).
+
+    """
+    payload = json.dumps({"score": float(score), "speech_id": int(speech_id)}).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    """
+    (score, speech_id) ενός cursor· None αν δεν είναι έγκυρος.
+
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return float(payload["score"]), int(payload["speech_id"])
+    except (ValueError, KeyError, TypeError):
+        return None
+
+def after(doc_ids, scores, score: float, doc_id: int):
+    """
+    Μάσκα των ομιλιών που έπονται του (score, doc_id) στη σειρά κατάταξης
+    (φθίνον score, ισοβαθμίες κατά doc id).
+
+    """
+    score = np.float32(score)
+    return (scores < score) | ((scores == score) & (doc_ids > doc_id))
+
+def first_ranked(doc_ids, scores, k: int):
+    """
+    Οι θέσεις των k πρώτων στη σειρά κατάταξης, με argpartition αντί για πλήρη ταξινόμηση
+    (ακριβώς όπως θα τις έδινε η πλήρης ταξινόμηση, και στις ισοβαθμίες).
+
+    """
+    if len(doc_ids) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(len(doc_ids))
+    return candidates[np.lexsort((doc_ids[candidates], -scores[candidates]))][:k]
+
+def iter_ranked(doc_ids, scores, first_chunk: int = EXPORT_FIRST_CHUNK):
+    """
+    Οι θέσεις όλων των ομιλιών στη σειρά κατάταξης, σε τμήματα.
+
+    Το πρώτο τμήμα υπολογίζεται με argpartition (ο χρόνος ως το πρώτο byte δεν εξαρτάται
+    από την ταξινόμηση όλων)· τα υπόλοιπα ταξινομούνται μία φορά, μετά την αποστολή του.
+
+    """
+    first = first_ranked(doc_ids, scores, first_chunk)
+    yield first
+    if len(first) < len(doc_ids):
+        last = first[-1]
+        rest = np.flatnonzero(after(doc_ids, scores, scores[last], doc_ids[last]))
+        yield rest[np.lexsort((doc_ids[rest], -scores[rest]))]
+
+def iter_export(request: dict, cursor=None, limit: int | None = None, snippet_length: int = SNIPPET_LENGTH):
+    """
+    Εξαγωγή όλων των αποτελεσμάτων ενός ερωτήματος με τη σειρά κατάταξης (γραμμές NDJSON).
+
+    1. Υπολογίζει τα scores όλων των ομιλιών που ταιριάζουν (πίνακες doc ids / scores μόνο)
+    2. Κρατάει όσες έπονται του cursor (σελιδοποίηση keyset: score, speech_id)
+    3. Για κάθε ομιλία που στέλνεται διαβάζει το κείμενο από την αποθήκη ομιλιών και
+       υπολογίζει snippet γύρω από τους όρους με τις θέσεις επισήμανσης
+    4. Τελευταία γραμμή: σύνολο αποτελεσμάτων, πλήθος που στάλθηκαν και next_cursor
+       (null όταν δεν υπάρχουν άλλα)
+
+    Η μνήμη δεν εξαρτάται από το πλήθος των αποτελεσμάτων πέρα από τους πίνακες doc ids / scores.
+
+    """
+    with stage("tokenize"):
+        query = parse_query(request["query"])
+    live = get_live_corpus()
+    if query.terms:
+        doc_ids, scores, _ = matching_docs(query, request, live)
+    else:
+        doc_ids, scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    total = len(doc_ids)
+
+    if cursor is not None:
+        score, speech_id = cursor
+        cursor_doc = int(live.doc_ids([speech_id])[0])
+        keep = after(doc_ids, scores, score, cursor_doc if cursor_doc >= 0 else -1)
+        doc_ids, scores = doc_ids[keep], scores[keep]
+    offset = total - len(doc_ids)
+    limit = len(doc_ids) if limit is None else min(limit, len(doc_ids))
+
+    pattern = compile_terms(set(query.terms))
+    sent = 0
+    last = None
+    for positions in iter_ranked(doc_ids, scores):
+        for position in positions[:limit - sent]:
+            speech = live.get(int(doc_ids[position]))
+            text = speech.pop("speech")
+            last = (float(scores[position]), speech["speech_id"])
+            sent += 1
+            yield {
+                "rank": offset + sent,
+                **speech,
+                "score": round(last[0], 4),
+                **highlight(text, pattern, snippet_length),
+            }
+        if sent >= limit:
+            break
+
+    more = sent < len(doc_ids)
+    yield {
+        "done": True,
+        "total": total,
+        "sent": sent,
+        "next_cursor": encode_cursor(*last) if more and last is not None else None,
+    }
@@ -0,0 +1,792 @@
+"""
+Σταδιακή εισαγωγή (incremental ingestion) νέων συνεδριάσεων σε αμετάβλητα segments.
+
+Το βασικό corpus (CSV / snapshot και τα ευρετήριά του) δεν αλλάζει· κάθε νέα παρτίδα
+ομιλιών κανονικοποιείται μία φορά και αποθηκεύεται ως segment στο data/segments/<όνομα>/:
+- rows.arrow: οι γραμμές της παρτίδας (ίδια μορφή με το prepare_frame, με νέα speech_ids)
+- tokens / offsets: τα term ids κάθε ομιλίας (κοινό λεξιλόγιο· οι νέοι όροι στο vocab.txt
+  παίρνουν τα επόμενα term ids μετά από το βασικό λεξιλόγιο και τα προηγούμενα segments)
+- postings (term_ids, term_offsets, doc_ids, term_freqs, doc_lengths): ανεστραμμένο ευρετήριο
+  μόνο για τους όρους του segment
+- cube/: συχνότητες όρων ανά (έτος, κόμμα) και (έτος, μέλος), στη μορφή του TermCube
+
+Το manifest.json κρατάει τη σειρά των ενεργών segments και έναν αριθμό γενιάς (generation)
+που αυξάνεται σε κάθε αλλαγή. Τα doc ids των segments συνεχίζουν μετά από τις ομιλίες του
+βασικού corpus, με τη σειρά του manifest. Το get_live_corpus() ελέγχει το manifest (stat)
+σε κάθε κλήση, οπότε όλες οι διεργασίες του server βλέπουν τα νέα segments χωρίς επανεκκίνηση.
+Τα ονόματα των segments δεν επαναχρησιμοποιούνται και ένα υπάρχον segment δεν αντικαθίσταται.
+
+Όταν αλλάξει το βασικό dataset (άλλο fingerprint), τα segments ευθυγραμμίζονται με αυτό
+(rebase_segments): όσα περιέχονται ήδη στο νέο dataset αφαιρούνται και τα υπόλοιπα
+ξαναγράφονται με το νέο λεξιλόγιο, οπότε καμία εισαγμένη συνεδρίαση δεν χάνεται.
+
+Όταν συσσωρευτούν MERGE_FACTOR διαδοχικά segments παρόμοιου μεγέθους στο τέλος,
+συγχωνεύονται (στο παρασκήνιο) σε ένα· τα doc ids και τα term ids δεν αλλάζουν.
+Τα μοντέλα που εκπαιδεύονται σε όλο το corpus (TF-IDF, LSI, clustering, ομοιότητα μελών)
+καλύπτουν το βασικό corpus μέχρι την επόμενη πλήρη δημιουργία τους.
+
+"""
+
+import json
+import math
+import shutil
+import threading
+from collections import ChainMap, Counter
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+from pandas.api.types import union_categoricals
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import (
+    COLUMNS, DATA_DIR, DATE_FORMAT, dataset_fingerprint, load_df, prepare_frame, read_snapshot,
+)
+from app.core.doc_store import get_doc_store
+from app.core.facets import build_facets, get_facets, isin_sorted, rank_suggestions
+from app.core.inverted_index import bm25_idf, bm25_weights, build_index, combine_scores, get_index
+from app.core.positions import get_positional_index, scan_positions
+from app.core.pruning import ScorerCache, TermScorer, maxscore_top_k
+from app.core.term_cube import build_term_cube, get_term_cube, load_term_cube, save_term_cube
+from app.core.token_store import TokenStore, build_keyword_mask, build_token_store, get_token_store, top_term_ids
+
+try:
+    import fcntl
+except ImportError:  # Windows: μόνο κλείδωμα εντός διεργασίας
+    fcntl = None
+
+# Φάκελος των segments και το manifest με τη σειρά τους
+SEGMENTS_DIR = DATA_DIR / "segments"
+MANIFEST_PATH = SEGMENTS_DIR / "manifest.json"
+
+# Πλήθος διαδοχικών segments του ίδιου επιπέδου μεγέθους που συγχωνεύονται σε ένα
+MERGE_FACTOR = 8
+
+# Segments με έως τόσες ομιλίες ανήκουν στο επίπεδο 0· κάθε επίπεδο είναι MERGE_FACTOR φορές μεγαλύτερο
+MERGE_MIN_DOCS = 1000
+
+SEGMENT_ARRAYS = ["tokens", "offsets", "term_ids", "term_offsets", "doc_ids", "term_freqs", "doc_lengths"]
+
+LOCK = threading.Lock()
+
+MANIFEST_CACHE = None
+SEGMENT_CACHE = {}
+LIVE_CACHE = None
+
+@contextmanager
+def segment_lock():
+    """
+    Αποκλειστική πρόσβαση στο manifest (και μεταξύ διεργασιών, όπου υπάρχει fcntl).
+
+    """
+    SEGMENTS_DIR.mkdir(parents=True, exist_ok=True)
+    with LOCK, open(SEGMENTS_DIR / ".lock", "w") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+def empty_manifest() -> dict:
+    return {
+        "fingerprint": dataset_fingerprint(),
+        "generation": 0,
+        "next_segment": 1,
+        "next_speech_id": None,
+        "segments": [],
+    }
+
+def manifest_state():
+    try:
+        stat = MANIFEST_PATH.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+def read_manifest() -> dict:
+    """
+    Το τρέχον manifest (ξαναδιαβάζεται μόνο όταν αλλάξει το αρχείο).
+
+    Το fingerprint του μπορεί να ανήκει σε προηγούμενο dataset· η ευθυγράμμιση των
+    segments γίνεται στο rebase_segments.
+
+    """
+    global MANIFEST_CACHE
+    state = manifest_state()
+    if MANIFEST_CACHE is None or MANIFEST_CACHE[0] != state:
+        manifest = empty_manifest()
+        if state is not None:
+            manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+        MANIFEST_CACHE = (state, manifest)
+    return MANIFEST_CACHE[1]
+
+def write_manifest(manifest: dict):
+    tmp = MANIFEST_PATH.with_name(MANIFEST_PATH.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+    tmp.replace(MANIFEST_PATH)
+
+def allocate_segment(number: int):
+    """
+    Το πρώτο ελεύθερο όνομα segment από τον αριθμό number: (όνομα, επόμενος αριθμός).
+
+    Παραλείπονται οι φάκελοι που υπάρχουν ήδη, ώστε να μη γραφτεί ποτέ πάνω σε segment.
+
+    """
+    while (SEGMENTS_DIR / f"{number:06d}").exists():
+        number += 1
+    return f"{number:06d}", number + 1
+
+def segment_generation() -> str:
+    """
+    Αναγνωριστικό της τρέχουσας γενιάς των segments (για κλειδιά cache).
+
+    """
+    return str(read_manifest()["generation"])
+
+def concat_frames(frames: list) -> pd.DataFrame:
+    """
+    Συνένωση DataFrames της μορφής του prepare_frame, με ένωση των categories (χωρίς μετατροπή σε object).
+
+    """
+    categorical = {"member_name", "political_party"}
+    columns = {}
+    for column in frames[0].columns:
+        if column in categorical:
+            values = [f[column] for f in frames]
+            # Οι categories του CSV (string) και των Arrow αρχείων (string[pyarrow]) διαφέρουν σε dtype
+            if len({v.cat.categories.dtype for v in values}) > 1:
+                values = [pd.Categorical.from_codes(v.cat.codes, v.cat.categories.astype(object)) for v in values]
+            columns[column] = pd.Categorical(union_categoricals(values))
+        else:
+            columns[column] = pd.concat([f[column] for f in frames], ignore_index=True)
+    return pd.DataFrame(columns)
+
+class SegmentIndex:
+    """
+    Postings ενός segment: μόνο οι όροι που εμφανίζονται σε αυτό (term_ids, ταξινομημένα),
+    σε μορφή CSR όπως στο InvertedIndex, με doc ids τοπικά στο segment.
+
+    """
+
+    def __init__(self, term_ids, term_offsets, doc_ids, term_freqs, doc_lengths):
+        self.term_ids = term_ids
+        self.term_offsets = term_offsets
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs
+        self.doc_lengths = doc_lengths
+
+    def postings(self, term_id: int):
+        i = int(np.searchsorted(self.term_ids, term_id))
+        if i == len(self.term_ids) or self.term_ids[i] != term_id:
+            return self.doc_ids[:0], self.term_freqs[:0]
+        start, end = self.term_offsets[i], self.term_offsets[i + 1]
+        return self.doc_ids[start:end], self.term_freqs[start:end]
+
+class Segment:
+    """
+    Αμετάβλητο segment: γραμμές, tokens, postings και κύβος συχνοτήτων μίας ή περισσότερων παρτίδων.
+
+    """
+
+    def __init__(self, name, meta, new_terms, rows, tokens, offsets, index, cube):
+        self.name = name
+        self.meta = meta
+        self.new_terms = new_terms
+        self.rows = rows
+        self.tokens = tokens
+        self.offsets = offsets
+        self.index = index
+        self.cube = cube
+        self.n_docs = int(meta["n_docs"])
+        self.first_term = int(meta["first_term"])
+        self.speech_ids = rows["speech_id"].to_numpy()
+        self.facets = build_facets(rows)
+
+    def summary(self) -> dict:
+        return {
+            "name": self.name,
+            "n_docs": self.n_docs,
+            "first_speech_id": int(self.speech_ids[0]),
+            "last_speech_id": int(self.speech_ids[-1]),
+            "new_terms": len(self.new_terms),
+        }
+
+def write_segment(path, rows: pd.DataFrame, store: TokenStore, first_term: int):
+    """
+    Αποθήκευση ενός segment (γραμμές, tokens, postings, κύβος) από tokenized γραμμές.
+
+    1. Δημιουργεί τα postings με το build_index και κρατάει μόνο τους όρους του segment
+    2. Δημιουργεί τον κύβο συχνοτήτων (έτος × κόμμα / μέλος) των γραμμών
+    3. Γράφει τα πάντα σε προσωρινό φάκελο που μετονομάζεται στο τέλος (artifact_writer)
+
+    Το store έχει term ids του κοινού λεξιλογίου· οι όροι από το first_term και μετά είναι
+    οι νέοι όροι του segment.
+
+    """
+    index = build_index(store)
+    term_ids = np.flatnonzero(np.diff(index.term_offsets)).astype(np.int32)
+    term_offsets = np.append(index.term_offsets[term_ids], index.term_offsets[-1])
+    cube = build_term_cube(df=rows, store=store)
+
+    meta = {"n_docs": store.n_docs, "first_term": first_term, "n_terms": store.n_terms}
+    with artifact_writer(path, meta, vocab=store.vocab[first_term:]) as tmp:
+        table = pa.Table.from_pandas(rows, preserve_index=False)
+        feather.write_feather(table, tmp / "rows.arrow", compression="uncompressed")
+        arrays = {
+            "tokens": store.tokens,
+            "offsets": store.offsets,
+            "term_ids": term_ids,
+            "term_offsets": term_offsets,
+            "doc_ids": index.doc_ids,
+            "term_freqs": index.term_freqs,
+            "doc_lengths": index.doc_lengths,
+        }
+        for name, values in arrays.items():
+            np.save(tmp / f"{name}.npy", values)
+        save_term_cube(cube, tmp / "cube")
+    return path
+
+def load_segment(name: str):
+    path = SEGMENTS_DIR / name
+    loaded = read_artifact(path, SEGMENT_ARRAYS)
+    if loaded is None:
+        return None
+    arrays, meta, new_terms = loaded
+    index = SegmentIndex(**{key: arrays[key] for key in SEGMENT_ARRAYS[2:]})
+    return Segment(
+        name=name,
+        meta=meta,
+        new_terms=new_terms or [],
+        rows=read_snapshot(path / "rows.arrow"),
+        tokens=arrays["tokens"],
+        offsets=arrays["offsets"],
+        index=index,
+        cube=load_term_cube(path / "cube"),
+    )
+
+def get_segment(name: str) -> Segment:
+    if name not in SEGMENT_CACHE:
+        SEGMENT_CACHE[name] = load_segment(name)
+    return SEGMENT_CACHE[name]
+
+class LiveCubeSlice:
+    """
+    Ενιαία όψη μιας διάστασης του κύβου (κόμμα ή μέλος) πάνω στο βασικό corpus και στα segments.
+
+    Έχει τις ίδιες μεθόδους με το CubeSlice (match, rows, by_year)· οι γραμμές και οι μάσκες
+    είναι λίστες με ένα στοιχείο ανά τμήμα και τα διανύσματα συχνοτήτων έχουν μήκος n_terms.
+
+    """
+
+    def __init__(self, parts: list, n_terms: int):
+        self.parts = parts
+        self.n_terms = n_terms
+
+    def match(self, text: str):
+        return [part.match(text) for part in self.parts]
+
+    def rows(self, mask=None, start_year=None, end_year=None):
+        masks = mask if mask is not None else [None] * len(self.parts)
+        return [part.rows(m, start_year, end_year) for part, m in zip(self.parts, masks)]
+
+    def totals(self, rows):
+        counts = np.zeros(self.n_terms)
+        n_docs = 0
+        for part, part_rows in zip(self.parts, rows):
+            part_counts, part_docs = part.totals(part_rows)
+            counts[:len(part_counts)] += part_counts
+            n_docs += part_docs
+        return counts, n_docs
+
+    def by_year(self, rows):
+        totals = {}
+        for part, part_rows in zip(self.parts, rows):
+            for year, counts, n_docs in part.by_year(part_rows):
+                total = totals.setdefault(year, [np.zeros(self.n_terms), 0])
+                total[0][:len(counts)] += counts
+                total[1] += n_docs
+        return [(year, counts, n_docs) for year, (counts, n_docs) in sorted(totals.items())]
+
+class LiveCorpus:
+    """
+    Το corpus όπως το βλέπουν τα routes: βασικό corpus και τα ενεργά segments του manifest.
+
+    Χωρίς segments όλες οι μέθοδοι καταλήγουν απευθείας στα βασικά ευρετήρια.
+
+    """
+
+    def __init__(self, segments: list, generation: int):
+        store = get_token_store()
+        self.segments = segments
+        self.generation = generation
+        self.base_docs = store.n_docs
+        self.first_docs = np.cumsum([store.n_docs] + [s.n_docs for s in segments])[:-1]
+        self.n_docs = store.n_docs + sum(s.n_docs for s in segments)
+
+        new_terms = [term for segment in segments for term in segment.new_terms]
+        if new_terms:
+            self.vocab = store.vocab + new_terms
+            self.term_index = ChainMap(
+                {term: store.n_terms + i for i, term in enumerate(new_terms)}, store.term_index
+            )
+            self.keyword_mask = np.concatenate([store.keyword_mask, build_keyword_mask(new_terms)])
+        else:
+            self.vocab = store.vocab
+            self.term_index = store.term_index
+            self.keyword_mask = store.keyword_mask
+        self.frame_cache = None
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.vocab)
+
+    def top_terms(self, counts, top_n: int = 10) -> list[str]:
+        return [self.vocab[i] for i in top_term_ids(counts, self.keyword_mask, top_n)]
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Οι γραμμές όλου του corpus με τη σειρά των doc ids (load_df() και οι γραμμές των segments).
+
+        """
+        if not self.segments:
+            return load_df()
+        if self.frame_cache is None:
+            self.frame_cache = concat_frames([load_df()] + [s.rows for s in self.segments])
+        return self.frame_cache
+
+    def cube(self, facet: str):
+        base = get_term_cube().slices[facet]
+        if not self.segments:
+            return base
+        return LiveCubeSlice([base] + [s.cube.slices[facet] for s in self.segments], self.n_terms)
+
+    def doc_freqs(self):
+        """
+        Document frequency κάθε όρου του λεξιλογίου σε όλο το corpus (βασικό ευρετήριο και segments).
+
+        """
+        base = np.diff(get_index().term_offsets)
+        if not self.segments:
+            return base
+        freqs = np.zeros(self.n_terms, dtype=np.int64)
+        freqs[:len(base)] = base
+        for segment in self.segments:
+            freqs[segment.index.term_ids] += np.diff(segment.index.term_offsets)
+        return freqs
+
+    def facet_doc_ids(self, facet: str, text: str):
+        """
+        Ταξινομημένα doc ids των ομιλιών των οποίων το μέλος/κόμμα περιέχει το text.
+
+        """
+        base = get_facets()[facet].filter(text)
+        if not self.segments:
+            return base
+        parts = [base] + [s.facets[facet].filter(text) + first for first, s in zip(self.first_docs, self.segments)]
+        return np.concatenate(parts)
+
+    def filter(self, doc_ids, facet: str, text: str):
+        """
+        Μάσκα των doc_ids που ανήκουν στο facet (τομή με τα doc ids του ονόματος).
+
+        """
+        return isin_sorted(doc_ids, self.facet_doc_ids(facet, text))
+
+    def complete(self, facet: str, text: str, limit: int = 10) -> list[dict]:
+        """
+        Προτάσεις ονομάτων μελών/κομμάτων (autocomplete), με το πλήθος ομιλιών σε όλο το corpus.
+
+        """
+        counts = get_facets()[facet].suggestions(text)
+        for segment in self.segments:
+            for name, count in segment.facets[facet].suggestions(text).items():
+                counts[name] = counts.get(name, 0) + count
+        return rank_suggestions(text, counts, limit)
+
+    @property
+    def avgdl(self) -> float:
+        index = get_index()
+        if not self.segments:
+            return index.avgdl
+        total_length = float(index.meta["avgdl"]) * index.n_docs
+        total_length += sum(int(np.sum(s.index.doc_lengths, dtype=np.int64)) for s in self.segments)
+        return total_length / self.n_docs or 1.0
+
+    def term_scorers(self, terms: list[str], cache: ScorerCache | None = None) -> list[TermScorer]:
+        """
+        Ένας TermScorer ανά (διακριτό, γνωστό) όρο του ερωτήματος, με κοινά στατιστικά σε όλο το corpus.
+
+        Τα postings κάθε όρου διαβάζονται από το βασικό ευρετήριο και από κάθε segment·
+        το idf χρησιμοποιεί το συνολικό document frequency, οπότε τα scores είναι ίδια με
+        αυτά ενός ευρετηρίου που θα περιείχε όλες τις ομιλίες. Το άνω φράγμα του βασικού
+        ευρετηρίου (υπολογισμένο με το δικό του μέσο μήκος) κλιμακώνεται όταν το μέσο μήκος
+        μεγαλώνει, αφού το βάρος BM25 αυξάνεται το πολύ αναλογικά με αυτό.
+        Με cache (batch ερωτημάτων) οι scorers είναι κοινοί μεταξύ των ερωτημάτων.
+
+        """
+        query_tf = Counter(t for t in terms if t in self.term_index)
+        if cache is None:
+            return [self.term_scorer(term, qtf) for term, qtf in query_tf.items()]
+        return [cache.get((term, qtf), lambda: self.term_scorer(term, qtf)) for term, qtf in query_tf.items()]
+
+    def term_scorer(self, term: str, qtf: int) -> TermScorer:
+        index = get_index()
+        avgdl = self.avgdl
+        base_scale = max(1.0, avgdl / index.avgdl)
+        term_id = self.term_index[term]
+        parts = []
+        bound = 0.0
+        if term_id < len(index.term_offsets) - 1:
+            parts.append((0, index.doc_lengths, *index.postings(term_id)))
+            bound = float(index.max_weights[term_id]) * base_scale
+        for first, segment in zip(self.first_docs, self.segments):
+            docs, tfs = segment.index.postings(term_id)
+            if len(docs):
+                parts.append((first, segment.index.doc_lengths, docs, tfs))
+                bound = max(bound, float(bm25_weights(tfs, segment.index.doc_lengths[docs], avgdl).max()))
+
+        weight = qtf * bm25_idf(self.n_docs, sum(len(docs) for _, _, docs, _ in parts))
+        return TermScorer(weight, parts, avgdl, weight * bound)
+
+    def bm25(self, terms: list[str], cache: ScorerCache | None = None):
+        """
+        Βαθμολόγηση BM25 σε όλο το corpus (εξαντλητικά: όλες οι ομιλίες που περιέχουν κάποιον όρο).
+
+        """
+        if not self.segments and cache is None:
+            return get_index().bm25(terms)
+        postings = [scorer.score_all() for scorer in self.term_scorers(terms, cache)]
+        return combine_scores([docs for docs, _ in postings], [scores for _, scores in postings])
+
+    def top_k(self, terms: list[str], k: int, allowed=None, excluded=None, cache: ScorerCache | None = None):
+        """
+        Τα top-k αποτελέσματα BM25 με κλάδεμα MaxScore: (doc ids, scores, στατιστικά).
+
+        """
+        return maxscore_top_k(self.term_scorers(terms, cache), k, self.n_docs, allowed, excluded)
+
+    def term_docs(self, term_id: int):
+        """
+        Ταξινομημένα doc ids των ομιλιών που περιέχουν τον όρο (postings βασικού ευρετηρίου και segments).
+
+        """
+        index = get_index()
+        parts = []
+        if term_id < len(index.term_offsets) - 1:
+            parts.append(index.postings(term_id)[0].astype(np.int64))
+        for first, segment in zip(self.first_docs, self.segments):
+            parts.append(segment.index.postings(term_id)[0].astype(np.int64) + first)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def positions(self, term_id: int, doc_ids):
+        """
+        Θέσεις ενός όρου στις δοσμένες (ταξινομημένες) ομιλίες: (doc id κάθε εμφάνισης, θέση).
+
+        Για το βασικό corpus διαβάζονται από το ευρετήριο θέσεων· για τα (μικρά) segments
+        υπολογίζονται απευθείας από τα tokens τους.
+
+        """
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        all_docs = []
+        all_positions = []
+        base_ids = doc_ids[doc_ids < self.base_docs]
+        if len(base_ids) and term_id < get_token_store().n_terms:
+            docs, positions = get_positional_index().term_positions(term_id, base_ids)
+            all_docs.append(docs)
+            all_positions.append(positions)
+        for first, segment in zip(self.first_docs, self.segments):
+            local = doc_ids[(doc_ids >= first) & (doc_ids < first + segment.n_docs)] - first
+            docs, positions = scan_positions(segment.tokens, segment.offsets, term_id, local)
+            all_docs.append(docs + first)
+            all_positions.append(positions)
+        if not all_docs:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(all_docs), np.concatenate(all_positions)
+
+    def locate(self, doc_id: int):
+        """
+        Το segment (None για το βασικό corpus) και η τοπική θέση ενός doc id.
+
+        """
+        if doc_id < self.base_docs:
+            return None, doc_id
+        i = int(np.searchsorted(self.first_docs, doc_id, side="right")) - 1
+        return self.segments[i], doc_id - int(self.first_docs[i])
+
+    def doc_ids(self, speech_ids):
+        """
+        Doc ids των δοσμένων speech_ids σε όλο το corpus (-1 για όσα δεν υπάρχουν).
+
+        """
+        doc_ids = get_doc_store().doc_ids(speech_ids)
+        speech_ids = np.asarray(speech_ids, dtype=np.int64)
+        for first, segment in zip(self.first_docs, self.segments):
+            positions = np.minimum(np.searchsorted(segment.speech_ids, speech_ids), segment.n_docs - 1)
+            found = (doc_ids < 0) & (segment.speech_ids[positions] == speech_ids)
+            doc_ids = np.where(found, positions + first, doc_ids)
+        return doc_ids
+
+    def metadata(self, doc_id: int) -> dict:
+        segment, local = self.locate(doc_id)
+        if segment is None:
+            return get_doc_store().metadata(local)
+        row = segment.rows.iloc[local]
+        return {
+            "speech_id": int(row["speech_id"]),
+            "sitting_date": row["sitting_date"].strftime(DATE_FORMAT),
+            "member_name": str(row["member_name"]),
+            "political_party": str(row["political_party"]),
+        }
+
+    def get(self, doc_id: int) -> dict:
+        segment, local = self.locate(doc_id)
+        if segment is None:
+            return get_doc_store().get(local)
+        return {**self.metadata(doc_id), "speech": str(segment.rows["speech"].iloc[local])}
+
+    def doc_tokens(self, doc_id: int):
+        """
+        Τα term ids μίας ομιλίας (βασικό corpus ή segment).
+
+        """
+        segment, local = self.locate(doc_id)
+        if segment is None:
+            return get_token_store().doc(local)
+        return segment.tokens[segment.offsets[local]:segment.offsets[local + 1]]
+
+    def keywords(self, doc_id: int, top_n: int = 10) -> list[str]:
+        segment, local = self.locate(doc_id)
+        if segment is None:
+            return get_token_store().keywords([local], top_n)
+        return self.top_terms(np.bincount(self.doc_tokens(doc_id), minlength=self.n_terms), top_n)
+
+def get_live_corpus() -> LiveCorpus:
+    global LIVE_CACHE
+    manifest = read_manifest()
+    if manifest["fingerprint"] != dataset_fingerprint():
+        with segment_lock():
+            manifest = rebase_segments()
+    if LIVE_CACHE is None or LIVE_CACHE.generation != manifest["generation"]:
+        for name in set(SEGMENT_CACHE) - set(manifest["segments"]):
+            del SEGMENT_CACHE[name]
+        segments = [get_segment(name) for name in manifest["segments"]]
+        LIVE_CACHE = LiveCorpus([s for s in segments if s is not None], manifest["generation"])
+    return LIVE_CACHE
+
+def segment_store(rows: pd.DataFrame, vocab: list, term_index, keyword_mask, workers: int | None = None):
+    """
+    Tokenization γραμμών με αντιστοίχιση στο κοινό λεξιλόγιο: (TokenStore, νέοι όροι).
+
+    Οι όροι που λείπουν από το term_index παίρνουν τα επόμενα term ids μετά το vocab.
+
+    """
+    batch = build_token_store(rows, workers=workers)
+    new_terms = [term for term in batch.vocab if term not in term_index]
+    term_index = ChainMap({term: len(vocab) + i for i, term in enumerate(new_terms)}, term_index)
+    mapping = np.array([term_index[term] for term in batch.vocab], dtype=np.int32)
+    store = TokenStore(
+        vocab + new_terms, mapping[batch.tokens], batch.offsets,
+        term_index=term_index,
+        keyword_mask=np.concatenate([keyword_mask, build_keyword_mask(new_terms)]),
+    )
+    return store, new_terms
+
+def rows_in_base(rows: pd.DataFrame, base: pd.DataFrame) -> bool:
+    """
+    Αν όλες οι γραμμές ενός segment υπάρχουν (ημερομηνία, μέλος, ομιλία) στο βασικό dataset.
+
+    Συγκρίνονται hashes των γραμμών, μόνο με τις ομιλίες των ίδιων ημερομηνιών του βασικού dataset.
+
+    """
+    def row_hashes(df):
+        key = df[["sitting_date", "member_name", "speech"]].astype({"member_name": str, "speech": str})
+        return pd.util.hash_pandas_object(key, index=False).to_numpy()
+
+    candidates = base[base["sitting_date"].isin(rows["sitting_date"].unique())]
+    return bool(np.isin(row_hashes(rows), row_hashes(candidates)).all())
+
+def rebase_segments() -> dict:
+    """
+    Ευθυγράμμιση των segments με το τρέχον βασικό dataset (καλείται με το segment_lock).
+
+    Το fingerprint αλλάζει με κάθε νέο CSV (ή αλλαγή του χρόνου τροποποίησής του, ή του
+    FRAME_VERSION), οπότε τα term ids των segments δεν αντιστοιχούν πια στο λεξιλόγιο:
+    1. Segments των οποίων όλες οι γραμμές περιέχονται στο νέο dataset αφαιρούνται
+    2. Τα υπόλοιπα ξαναγράφονται (tokenization με το νέο λεξιλόγιο) σε νέα segments, με
+       νέα speech_ids μόνο αν τα παλιά συμπίπτουν πια με ομιλίες του dataset
+    3. Το manifest γράφεται με το νέο fingerprint και μετά διαγράφονται τα παλιά segments
+
+    Ο αριθμός των segments (next_segment) δεν μειώνεται ποτέ.
+
+    """
+    manifest = read_manifest()
+    fingerprint = dataset_fingerprint()
+    if manifest["fingerprint"] == fingerprint:
+        return manifest
+
+    base = load_df()
+    store = get_token_store()
+    vocab, term_index, keyword_mask = store.vocab, store.term_index, store.keyword_mask
+    next_speech_id = int(get_doc_store().speech_ids[-1]) + 1 if get_doc_store().n_docs else 0
+    next_segment = manifest["next_segment"]
+    old_names = manifest["segments"]
+    names = []
+    for old in old_names:
+        rows = read_snapshot(SEGMENTS_DIR / old / "rows.arrow")
+        if rows_in_base(rows, base):
+            continue
+        if int(rows["speech_id"].min()) < next_speech_id:
+            rows = rows.assign(speech_id=np.arange(next_speech_id, next_speech_id + len(rows), dtype=np.int64))
+        next_speech_id = int(rows["speech_id"].max()) + 1
+        segment, new_terms = segment_store(rows, vocab, term_index, keyword_mask)
+        name, next_segment = allocate_segment(next_segment)
+        write_segment(SEGMENTS_DIR / name, rows, segment, first_term=len(vocab))
+        vocab, term_index, keyword_mask = segment.vocab, segment.term_index, segment.keyword_mask
+        names.append(name)
+
+    manifest = {
+        **manifest,
+        "fingerprint": fingerprint,
+        "generation": manifest["generation"] + 1,
+        "next_segment": next_segment,
+        "next_speech_id": max(next_speech_id, manifest["next_speech_id"] or 0),
+        "segments": names,
+    }
+    write_manifest(manifest)
+    for old in old_names:
+        shutil.rmtree(SEGMENTS_DIR / old, ignore_errors=True)
+    return manifest
+
+def ingest_batch(raw: pd.DataFrame, workers: int | None = None) -> dict:
+    """
+    Εισαγωγή μιας παρτίδας ομιλιών (στήλες του dataset) ως νέο segment.
+
+    1. Δίνει στις γραμμές νέα speech_ids (συνέχεια του dataset) και εφαρμόζει το prepare_frame
+    2. Κανονικοποιεί / κάνει tokenization μόνο τις ομιλίες της παρτίδας
+    3. Αντιστοιχίζει τους όρους στο κοινό λεξιλόγιο (οι νέοι όροι παίρνουν τα επόμενα term ids)
+    4. Γράφει το segment (postings, κύβος) και το προσθέτει στο manifest
+
+    Το κόστος είναι ανάλογο του μεγέθους της παρτίδας, όχι του corpus.
+
+    """
+    missing = [column for column in COLUMNS if column not in raw.columns]
+    if missing:
+        return {"error": f"Missing columns: {', '.join(missing)}"}
+
+    with segment_lock():
+        manifest = rebase_segments()
+        live = get_live_corpus()
+        first_speech_id = manifest["next_speech_id"]
+        if first_speech_id is None:
+            first_speech_id = int(get_doc_store().speech_ids[-1]) + 1 if get_doc_store().n_docs else 0
+
+        raw = raw[COLUMNS].astype("string")
+        raw.index = pd.RangeIndex(first_speech_id, first_speech_id + len(raw))
+        rows = prepare_frame(raw)
+        if rows.empty:
+            return {"error": "No valid speeches in batch"}
+
+        store, new_terms = segment_store(rows, live.vocab, live.term_index, live.keyword_mask, workers)
+
+        name, next_segment = allocate_segment(manifest["next_segment"])
+        write_segment(SEGMENTS_DIR / name, rows, store, first_term=live.n_terms)
+        manifest = {
+            **manifest,
+            "generation": manifest["generation"] + 1,
+            "next_segment": next_segment,
+            "next_speech_id": first_speech_id + len(raw),
+            "segments": manifest["segments"] + [name],
+        }
+        write_manifest(manifest)
+
+    return {
+        "segment": name,
+        "n_docs": len(rows),
+        "skipped": len(raw) - len(rows),
+        "first_speech_id": int(rows["speech_id"].iloc[0]),
+        "last_speech_id": int(rows["speech_id"].iloc[-1]),
+        "new_terms": len(new_terms),
+        "generation": manifest["generation"],
+    }
+
+def segment_level(n_docs: int) -> int:
+    return max(0, math.ceil(math.log(max(n_docs, 1) / MERGE_MIN_DOCS, MERGE_FACTOR)))
+
+def merge_candidates(manifest: dict) -> list[str]:
+    """
+    Τα τελευταία MERGE_FACTOR segments, αν ανήκουν όλα στο ίδιο επίπεδο μεγέθους (αλλιώς κενή λίστα).
+
+    Συγχωνεύονται πάντα διαδοχικά segments, ώστε να διατηρείται η σειρά των doc ids.
+
+    """
+    names = manifest["segments"][-MERGE_FACTOR:]
+    if len(names) < MERGE_FACTOR:
+        return []
+    levels = {segment_level(get_segment(name).n_docs) for name in names}
+    return names if len(levels) == 1 else []
+
+def merge_segments(names: list[str] | None = None) -> dict:
+    """
+    Συγχώνευση διαδοχικών segments σε ένα (εκτελείται στο παρασκήνιο).
+
+    1. Επιλέγει τα segments (προεπιλογή: merge_candidates) και ενώνει γραμμές και tokens
+    2. Ξαναδημιουργεί postings και κύβο μόνο για τις ομιλίες αυτών των segments
+    3. Αντικαθιστά τα segments στο manifest με το νέο, αν δεν άλλαξαν στο μεταξύ
+
+    """
+    with segment_lock():
+        manifest = rebase_segments()
+        if names is None:
+            names = merge_candidates(manifest)
+        if len(names) < 2:
+            return {"merged": []}
+        if not set(names) <= set(manifest["segments"]):
+            return {"merged": [], "error": "Segments changed during merge"}
+        name, next_segment = allocate_segment(manifest["next_segment"])
+        write_manifest({**manifest, "next_segment": next_segment})
+
+    live = get_live_corpus()
+    segments = [get_segment(n) for n in names]
+    rows = concat_frames([s.rows for s in segments])
+    offsets = [np.asarray(segments[0].offsets[:1])]
+    shift = 0
+    for segment in segments:
+        offsets.append(np.asarray(segment.offsets[1:]) + shift)
+        shift += int(segment.offsets[-1])
+    first_term = segments[0].first_term
+    n_terms = segments[-1].first_term + len(segments[-1].new_terms)
+    store = TokenStore(
+        live.vocab[:n_terms],
+        np.concatenate([s.tokens for s in segments]),
+        np.concatenate(offsets),
+        term_index=live.term_index,
+        keyword_mask=live.keyword_mask[:n_terms],
+    )
+    write_segment(SEGMENTS_DIR / name, rows, store, first_term=first_term)
+
+    with segment_lock():
+        manifest = read_manifest()
+        current = manifest["segments"]
+        start = current.index(names[0]) if names[0] in current else -1
+        if start < 0 or current[start:start + len(names)] != names:
+            shutil.rmtree(SEGMENTS_DIR / name, ignore_errors=True)
+            return {"merged": [], "error": "Segments changed during merge"}
+        manifest = {
+            **manifest,
+            "generation": manifest["generation"] + 1,
+            "segments": current[:start] + [name] + current[start + len(names):],
+        }
+        write_manifest(manifest)
+
+    for old in names:
+        shutil.rmtree(SEGMENTS_DIR / old, ignore_errors=True)
+    return {"merged": names, "segment": name, "n_docs": len(rows), "generation": manifest["generation"]}
+
+def list_segments() -> dict:
+    live = get_live_corpus()
+    return {
+        "generation": live.generation,
+        "base_docs": live.base_docs,
+        "n_docs": live.n_docs,
+        "segments": [s.summary() for s in live.segments],
+    }
@@ -0,0 +1,114 @@
+"""
+Snippets με κέντρο τους όρους του ερωτήματος και θέσεις επισήμανσης (highlighting).
+
+Η κανονικοποίηση (πεζά, αφαίρεση τόνων, σύμβολα → κενό) αντιστοιχεί κάθε χαρακτήρα σε
+έναν χαρακτήρα, οπότε οι εμφανίσεις των όρων στο πεζό κείμενο έχουν τις ίδιες θέσεις με
+το αρχικό κείμενο και οι επισημάνσεις αναφέρονται απευθείας σε αυτό.
+
+"""
+
+import re
+
+from app.core.text_cleaner import ACCENTS_TABLE, NORMALIZE_TABLE, UNWANTED_CHARS
+
+SNIPPET_LENGTH = 300
+
+# Χαρακτήρες που χωρίζουν λέξεις μετά την κανονικοποίηση (κενά, αριθμοί, σύμβολα)
+SEPARATORS = r"\s" + re.escape(UNWANTED_CHARS)
+
+def lowered_text(text: str) -> str:
+    """
+    Πεζά γράμματα, με ίδιο μήκος με το αρχικό κείμενο (χαρακτήρα προς χαρακτήρα).
+
+    """
+    lowered = text.lower()
+    if len(lowered) != len(text):
+        # Σπάνιοι χαρακτήρες που το lower() επεκτείνει (π.χ. İ): πεζά χαρακτήρα προς χαρακτήρα
+        lowered = "".join(c.lower()[:1] for c in text)
+    return lowered
+
+def compile_terms(terms) -> re.Pattern | None:
+    """
+    Κανονική έκφραση για τις εμφανίσεις των (κανονικοποιημένων) όρων σε πεζό κείμενο.
+
+    Κάθε γράμμα ταιριάζει και με τις τονισμένες μορφές του και κάθε όρος μόνο ως ολόκληρη
+    λέξη (ανάμεσα σε κενά, αριθμούς ή σύμβολα), όπως στο tokenization· έτσι δεν χρειάζεται
+    κανονικοποίηση ολόκληρου του κειμένου κάθε ομιλίας.
+
+    """
+    variants = {}
+    for accented, plain in ACCENTS_TABLE.items():
+        variants.setdefault(chr(plain), [chr(plain)]).append(chr(accented))
+
+    def letter(c):
+        forms = variants.get(c)
+        return f"[{''.join(forms)}]" if forms else re.escape(c)
+
+    alternatives = sorted({"".join(letter(c) for c in term) for term in terms if term}, key=len, reverse=True)
+    if not alternatives:
+        return None
+    return re.compile(f"(?<![^{SEPARATORS}])(?:{'|'.join(alternatives)})(?![^{SEPARATORS}])")
+
+def term_matches(text: str, pattern: re.Pattern | None) -> list[tuple[int, int, str]]:
+    """
+    Οι εμφανίσεις των όρων στο κείμενο: (αρχή, τέλος, όρος) σε θέσεις του αρχικού κειμένου.
+
+    """
+    if pattern is None:
+        return []
+    return [(m.start(), m.end(), m.group().translate(NORMALIZE_TABLE)) for m in pattern.finditer(lowered_text(text))]
+
+def best_window(matches: list, length: int) -> int:
+    """
+    Η αρχή του παραθύρου μήκους length με τους περισσότερους διαφορετικούς όρους
+    (και μετά τις περισσότερες εμφανίσεις), που ξεκινά από κάποια εμφάνιση.
+
+    """
+    best, best_key = 0, None
+    end = 0
+    for i, (start, _, _) in enumerate(matches):
+        end = max(end, i)
+        while end + 1 < len(matches) and matches[end + 1][1] <= start + length:
+            end += 1
+        window = matches[i:end + 1]
+        key = (len({term for _, _, term in window}), len(window))
+        if best_key is None or key > best_key:
+            best, best_key = start, key
+    return best
+
+def highlight(text: str, pattern: re.Pattern | None, length: int = SNIPPET_LENGTH) -> dict:
+    """
+    Snippet μιας ομιλίας γύρω από τους όρους του ερωτήματος.
+
+    1. Βρίσκει τις εμφανίσεις των όρων (στο κανονικοποιημένο κείμενο)
+    2. Επιλέγει το παράθυρο length χαρακτήρων με τους περισσότερους διαφορετικούς όρους,
+       με λίγο κείμενο πριν από την πρώτη εμφάνιση, σε όρια λέξεων
+    3. Επιστρέφει το snippet, τη θέση του στην ομιλία και τις θέσεις [αρχή, τέλος)
+       των όρων μέσα στο snippet
+
+    Το pattern είναι οι όροι του ερωτήματος (compile_terms). Χωρίς εμφανίσεις (π.χ. κενό
+    ερώτημα) το snippet είναι η αρχή της ομιλίας.
+
+    """
+    if not isinstance(text, str):
+        return {"snippet": "", "snippet_start": 0, "highlights": []}
+
+    matches = term_matches(text, pattern)
+    start = 0
+    if matches:
+        first = best_window(matches, length)
+        start = max(0, first - length // 5)
+        # Αρχή σε όριο λέξης (όχι πριν από την πρώτη εμφάνιση του παραθύρου)
+        if start > 0 and not text[start - 1].isspace():
+            boundary = text.find(" ", start, first)
+            start = boundary + 1 if boundary >= 0 else first
+    end = min(len(text), start + length)
+    if end < len(text):
+        boundary = text.rfind(" ", start, end)
+        end = boundary if boundary > start else end
+
+    return {
+        "snippet": text[start:end],
+        "snippet_start": start,
+        "highlights": [[s - start, e - start] for s, e, _ in matches if s >= start and e <= end],
+    }
@@ -0,0 +1,186 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from app.core.artifacts import read_artifact, write_artifact
+from app.core.data_loader import DATA_DIR, load_df
+from app.core.facets import FACETS, NameMatcher
+from app.core.token_store import get_token_store, ragged_take
+
+# Φάκελος αποθήκευσης του κύβου συχνοτήτων όρων
+CUBE_DIR = DATA_DIR / "cube"
+
+# Πλήθος ομιλιών ανά τμήμα κατά τη δημιουργία του κύβου (φραγμένη μνήμη)
+BUILD_CHUNK_DOCS = 50_000
+
+CUBE_CACHE = None
+
+class CubeSlice:
+    """
+    Αραιός πίνακας συχνοτήτων όρων (μορφή CSR) με μία γραμμή ανά (έτος, τιμή facet).
+
+    Η γραμμή r αντιστοιχεί στο έτος years[r] και στην τιμή labels[codes[r]]
+    (κόμμα ή μέλος) και περιέχει το άθροισμα των συχνοτήτων όρων όλων των ομιλιών
+    της ομάδας· το n_docs[r] είναι το πλήθος αυτών των ομιλιών.
+
+    """
+
+    def __init__(self, labels, years, codes, n_docs, indptr, indices, data, n_terms):
+        self.labels = pd.Index(labels)
+        self.matcher = NameMatcher(labels)
+        self.years = years
+        self.codes = codes
+        self.n_docs = n_docs
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.n_terms = n_terms
+
+    def match(self, text: str):
+        """
+        Γραμμές των οποίων η τιμή περιέχει το text (χωρίς διάκριση πεζών/τόνων, έλεγχος μόνο στις διακριτές τιμές).
+
+        """
+        return np.isin(self.codes, self.matcher.match(text))
+
+    def rows(self, mask=None, start_year=None, end_year=None):
+        keep = np.ones(len(self.years), dtype=bool) if mask is None else mask.copy()
+        if start_year is not None:
+            keep &= self.years >= start_year
+        if end_year is not None:
+            keep &= self.years <= end_year
+        return np.flatnonzero(keep)
+
+    def sum_rows(self, rows):
+        """
+        Άθροισμα γραμμών του κύβου σε πυκνό διάνυσμα συχνοτήτων μήκους n_terms.
+
+        """
+        indices = ragged_take(self.indices, self.indptr, rows)
+        data = ragged_take(self.data, self.indptr, rows)
+        return np.bincount(indices, weights=data, minlength=self.n_terms)
+
+    def totals(self, rows):
+        """
+        Άθροισμα γραμμών: (διάνυσμα συχνοτήτων, πλήθος ομιλιών).
+
+        """
+        return self.sum_rows(rows), int(self.n_docs[rows].sum())
+
+    def by_year(self, rows):
+        """
+        Ομαδοποίηση γραμμών ανά έτος: [(year, counts, n_docs), ...] σε αύξουσα σειρά ετών.
+
+        """
+        timeline = []
+        for year in np.unique(self.years[rows]):
+            year_rows = rows[self.years[rows] == year]
+            timeline.append((int(year), self.sum_rows(year_rows), int(self.n_docs[year_rows].sum())))
+        return timeline
+
+class TermCube:
+    """
+    Προϋπολογισμένες συχνότητες όρων ανά (έτος, κόμμα) και (έτος, μέλος).
+
+    Τα endpoints χρονολογικής ανάλυσης απαντούν αθροίζοντας λίγες γραμμές του κύβου,
+    χωρίς ένωση κειμένων ή μέτρηση λέξεων ανά αίτημα.
+
+    """
+
+    def __init__(self, slices: dict):
+        self.slices = slices
+
+    @property
+    def party(self) -> CubeSlice:
+        return self.slices["party"]
+
+    @property
+    def member(self) -> CubeSlice:
+        return self.slices["member"]
+
+def aggregate_counts(row_of_doc, n_rows: int, store):
+    """
+    Άθροιση των συχνοτήτων όρων των ομιλιών ανά γραμμή του κύβου, σε τμήματα ομιλιών.
+
+    """
+    matrix = sparse.csr_matrix((n_rows, store.n_terms), dtype=np.int64)
+    for start in range(0, store.n_docs, BUILD_CHUNK_DOCS):
+        doc_ids = np.arange(start, min(start + BUILD_CHUNK_DOCS, store.n_docs))
+        lengths = np.diff(store.offsets[doc_ids[0]:doc_ids[-1] + 2])
+        rows = np.repeat(row_of_doc[doc_ids], lengths)
+        terms = store.gather(doc_ids)
+        chunk = sparse.coo_matrix(
+            (np.ones(len(terms), dtype=np.int64), (rows, terms)), shape=(n_rows, store.n_terms)
+        ).tocsr()
+        matrix = matrix + chunk
+    matrix.sum_duplicates()
+    return matrix
+
+def build_term_cube(df=None, store=None) -> TermCube:
+    """
+    Δημιουργία του κύβου συχνοτήτων όρων από το tokenized corpus.
+
+    1. Για κάθε facet (κόμμα, μέλος) ορίζει μία ομάδα ανά διακριτό ζεύγος (έτος, τιμή)
+    2. Αντιστοιχίζει κάθε ομιλία στην ομάδα της
+    3. Αθροίζει τις συχνότητες όρων των ομιλιών κάθε ομάδας σε αραιό πίνακα
+
+    """
+    if df is None:
+        df = load_df()
+    if store is None:
+        store = get_token_store()
+
+    years = df["year"].to_numpy().astype(np.int64)
+    slices = {}
+    for name, column in FACETS.items():
+        values = df[column].cat
+        labels = list(values.categories)
+        group_keys = years * len(labels) + values.codes.to_numpy()
+        keys, row_of_doc = np.unique(group_keys, return_inverse=True)
+        matrix = aggregate_counts(row_of_doc, len(keys), store)
+        slices[name] = CubeSlice(
+            labels=labels,
+            years=(keys // len(labels)).astype(np.int16),
+            codes=(keys % len(labels)).astype(np.int32),
+            n_docs=np.bincount(row_of_doc, minlength=len(keys)).astype(np.int32),
+            indptr=matrix.indptr.astype(np.int64),
+            indices=matrix.indices.astype(np.int32),
+            data=matrix.data.astype(np.int32),
+            n_terms=store.n_terms,
+        )
+    return TermCube(slices)
+
+def save_term_cube(cube: TermCube, path=CUBE_DIR):
+    arrays = {}
+    meta = {}
+    for name, cube_slice in cube.slices.items():
+        for field in ("years", "codes", "n_docs", "indptr", "indices", "data"):
+            arrays[f"{name}_{field}"] = getattr(cube_slice, field)
+        meta[f"{name}_labels"] = list(cube_slice.labels)
+        meta["n_terms"] = cube_slice.n_terms
+    return write_artifact(path, arrays, meta=meta)
+
+def load_term_cube(path=CUBE_DIR):
+    fields = ("years", "codes", "n_docs", "indptr", "indices", "data")
+    loaded = read_artifact(path, [f"{name}_{field}" for name in FACETS for field in fields])
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return TermCube({
+        name: CubeSlice(
+            labels=meta[f"{name}_labels"],
+            n_terms=meta["n_terms"],
+            **{field: arrays[f"{name}_{field}"] for field in fields},
+        )
+        for name in FACETS
+    })
+
+def get_term_cube() -> TermCube:
+    global CUBE_CACHE
+    if CUBE_CACHE is None:
+        cube = load_term_cube()
+        if cube is None:
+            save_term_cube(build_term_cube())
+            cube = load_term_cube()
+        CUBE_CACHE = cube
+    return CUBE_CACHE
@@ -1,4 +1,9 @@
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from app.core.metrics import stage
 from app.core.stopwords import STOPWORDS
 
 ACCENTS_TABLE = str.maketrans(
@@ -6,7 +11,16 @@ ACCENTS_TABLE = str.maketrans(
     "αεηιουωιιυυαεηιουωαηιυω"
 )
 
-UNWANTED = re.compile(r"[0-9@#$%^&*()\-_=+\[\]{};:'\",.<>/?\\|`~!]")
+UNWANTED_CHARS = "0123456789@#$%^&*()-_=+[]{};:'\",.<>/?\\|`~!"
+
+UNWANTED = re.compile(f"[{re.escape(UNWANTED_CHARS)}]")
+
+# Ενιαίος πίνακας μετατροπής: αφαίρεση διακριτικών και αντικατάσταση αριθμών/συμβόλων με κενό
+# σε ένα μόνο πέρασμα (str.translate), χωρίς regex και ενδιάμεσα strings
+NORMALIZE_TABLE = {**ACCENTS_TABLE, **{ord(c): " " for c in UNWANTED_CHARS}}
+
+# Πλήθος ομιλιών ανά τμήμα για την επεξεργασία σε process pool
+BATCH_CHUNK_TEXTS = 2_000
 
 def normalize(text: str) -> str:
     """
@@ -22,10 +36,7 @@ def normalize(text: str) -> str:
     """
     if not text:
         return ""
-    text = text.lower().translate(ACCENTS_TABLE)
-    text = re.sub(UNWANTED, " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+    return " ".join(text.lower().translate(NORMALIZE_TABLE).split())
 
 STOPWORDS_NORM = {normalize(w) for w in STOPWORDS}
 
@@ -39,4 +50,74 @@ def remove_stopwords(text: str) -> str:
     
     """
     words = [w for w in text.split() if w not in STOPWORDS_NORM]
-    return " ".join(words)
\ No newline at end of file
+    return " ".join(words)
+
+def tokenize(text) -> list[str]:
+    """
+    Μετατροπή κειμένου σε λίστα όρων (κανονικοποίηση, αφαίρεση stopwords, διαχωρισμός).
+
+    """
+    if not isinstance(text, str):
+        return []
+    return [w for w in text.lower().translate(NORMALIZE_TABLE).split() if w not in STOPWORDS_NORM]
+
+def tokenize_many(texts) -> list[list[str]]:
+    """
+    Tokenization πολλών κειμένων σε μία διεργασία (ίδιο αποτέλεσμα με το tokenize ανά κείμενο).
+
+    Κανονικοποίηση, διαχωρισμός και αφαίρεση stopwords γίνονται σε ένα πέρασμα ανά κείμενο,
+    με τοπικές αναφορές στους πίνακες ώστε να αποφεύγονται οι αναζητήσεις ονομάτων στον βρόχο.
+
+    """
+    table = NORMALIZE_TABLE
+    stopwords = STOPWORDS_NORM
+    with stage("tokenize"):
+        return [
+            [w for w in text.lower().translate(table).split() if w not in stopwords]
+            if isinstance(text, str) else []
+            for text in texts
+        ]
+
+def iter_batches(texts, chunk_size: int = BATCH_CHUNK_TEXTS):
+    iterator = iter(texts)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+def map_batches(fn, texts, chunk_size: int = BATCH_CHUNK_TEXTS, workers: int | None = None):
+    """
+    Εφαρμογή του fn σε διαδοχικά τμήματα κειμένων, παράλληλα σε process pool.
+
+    1. Χωρίζει την είσοδο (οποιοδήποτε iterable ή Series) σε τμήματα chunk_size κειμένων
+    2. Κρατάει το πολύ 2 × workers τμήματα σε εκτέλεση, ώστε η μνήμη να μένει φραγμένη
+    3. Επιστρέφει (yield) τα αποτελέσματα με τη σειρά της εισόδου, μόλις είναι έτοιμα
+
+    Με workers=1 (ή ένα μόνο τμήμα) εκτελείται στην τρέχουσα διεργασία.
+    Το fn πρέπει να είναι συνάρτηση επιπέδου module (pickle).
+
+    """
+    workers = workers or os.cpu_count() or 1
+    batches = iter_batches(texts, chunk_size)
+    head = list(islice(batches, 2))
+    if workers == 1 or len(head) < 2:
+        for batch in chain(head, batches):
+            yield fn(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in chain(head, batches):
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+            pending.append(executor.submit(fn, batch))
+        while pending:
+            yield pending.popleft().result()
+
+def iter_tokenized(texts, chunk_size: int = BATCH_CHUNK_TEXTS, workers: int | None = None):
+    """
+    Tokenization μεγάλου πλήθους κειμένων σε όλους τους πυρήνες, με ροή αποτελεσμάτων.
+
+    Επιστρέφει (yield) τη λίστα όρων κάθε κειμένου, με τη σειρά της εισόδου.
+
+    """
+    for tokens in map_batches(tokenize_many, texts, chunk_size, workers):
+        yield from tokens
@@ -0,0 +1,122 @@
+import numpy as np
+from scipy import sparse
+
+from app.core.artifacts import read_artifact, write_artifact
+from app.core.data_loader import DATA_DIR
+from app.core.inverted_index import get_index
+from app.core.token_store import get_token_store
+
+# Φάκελος αποθήκευσης του κοινού χώρου TF-IDF
+TFIDF_DIR = DATA_DIR / "tfidf"
+
+# Επιλογή χαρακτηριστικών (όρων) του χώρου TF-IDF
+MIN_DF = 5
+MAX_DF_RATIO = 0.5
+MAX_FEATURES = 50_000
+
+TFIDF_CACHE = None
+
+class TfidfSpace:
+    """
+    Κοινός χώρος TF-IDF του corpus (λεξιλόγιο χαρακτηριστικών και idf).
+
+    Τα χαρακτηριστικά είναι υποσύνολο του λεξιλογίου του TokenStore (feature_ids[j]
+    είναι το term id της στήλης j). Οι ομιλίες μετατρέπονται σε διανύσματα με
+    sublinear tf (1 + log tf) × idf και κανονικοποίηση L2, όπως ο TfidfVectorizer.
+
+    """
+
+    def __init__(self, feature_ids, idf, n_terms: int):
+        self.feature_ids = feature_ids
+        self.idf = idf
+        self.column_of_term = np.full(n_terms, -1, dtype=np.int32)
+        self.column_of_term[feature_ids] = np.arange(len(feature_ids), dtype=np.int32)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_ids)
+
+    def weigh(self, rows, columns, n_rows: int):
+        """
+        Πίνακας TF-IDF (CSR, float32) από ζεύγη (γραμμή, term id) ενός token το καθένα.
+
+        """
+        columns = self.column_of_term[columns]
+        keep = columns >= 0
+        rows, columns = rows[keep], columns[keep]
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float32), (rows, columns)),
+            shape=(n_rows, self.n_features),
+        )
+        matrix.sum_duplicates()
+        matrix.data = (1 + np.log(matrix.data)) * self.idf[matrix.indices]
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms).dot(matrix).astype(np.float32).tocsr()
+
+    def transform(self, doc_ids, store=None):
+        """
+        Διανύσματα TF-IDF των δοσμένων ομιλιών, απευθείας από το tokenized corpus.
+
+        """
+        if store is None:
+            store = get_token_store()
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        lengths = np.asarray(store.offsets[doc_ids + 1] - store.offsets[doc_ids], dtype=np.int64)
+        rows = np.repeat(np.arange(len(doc_ids)), lengths)
+        return self.weigh(rows, store.gather(doc_ids), len(doc_ids))
+
+    def transform_terms(self, terms: list[str], store=None):
+        """
+        Διάνυσμα TF-IDF (1 × n_features) ενός ερωτήματος από τους (κανονικοποιημένους) όρους του.
+
+        """
+        if store is None:
+            store = get_token_store()
+        term_ids = np.array([store.term_index[t] for t in terms if t in store.term_index], dtype=np.int64)
+        return self.weigh(np.zeros(len(term_ids), dtype=np.int64), term_ids, 1)
+
+def build_tfidf_space(store=None, index=None) -> TfidfSpace:
+    """
+    Επιλογή χαρακτηριστικών και υπολογισμός idf από τις συχνότητες εγγράφων του ευρετηρίου.
+
+    1. Κρατάει όρους με τουλάχιστον MIN_DF ομιλίες και το πολύ MAX_DF_RATIO του corpus
+    2. Αγνοεί πολύ μικρές λέξεις (θόρυβος), όπως και οι λέξεις-κλειδιά
+    3. Κρατάει τους MAX_FEATURES συχνότερους όρους
+    4. idf = log((1 + n) / (1 + df)) + 1 (smooth idf, όπως ο TfidfVectorizer)
+
+    """
+    if store is None:
+        store = get_token_store()
+    if index is None:
+        index = get_index()
+
+    doc_freqs = np.diff(index.term_offsets)
+    n_docs = index.n_docs
+    eligible = (doc_freqs >= MIN_DF) & (doc_freqs <= MAX_DF_RATIO * n_docs) & store.keyword_mask
+    candidates = np.flatnonzero(eligible)
+    if len(candidates) > MAX_FEATURES:
+        candidates = candidates[np.argsort(-doc_freqs[candidates], kind="stable")[:MAX_FEATURES]]
+    feature_ids = np.sort(candidates).astype(np.int32)
+    idf = (np.log((1 + n_docs) / (1 + doc_freqs[feature_ids])) + 1).astype(np.float32)
+    return TfidfSpace(feature_ids, idf, store.n_terms)
+
+def save_tfidf_space(space: TfidfSpace, path=TFIDF_DIR):
+    return write_artifact(path, {"feature_ids": space.feature_ids, "idf": space.idf})
+
+def load_tfidf_space(path=TFIDF_DIR):
+    loaded = read_artifact(path, ["feature_ids", "idf"], mmap=False)
+    if loaded is None:
+        return None
+    arrays, _, _ = loaded
+    return TfidfSpace(arrays["feature_ids"], arrays["idf"], get_token_store().n_terms)
+
+def get_tfidf_space() -> TfidfSpace:
+    global TFIDF_CACHE
+    if TFIDF_CACHE is None:
+        space = load_tfidf_space()
+        if space is None:
+            save_tfidf_space(build_tfidf_space())
+            space = load_tfidf_space()
+        TFIDF_CACHE = space
+    return TFIDF_CACHE
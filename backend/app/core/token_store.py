@@ -0,0 +1,192 @@
+from array import array
+
+import numpy as np
+from scipy import sparse
+
+from app.core.artifacts import read_artifact, write_artifact
+from app.core.data_loader import DATA_DIR, load_df
+from app.core.text_cleaner import map_batches, tokenize_many
+
+# Φάκελος αποθήκευσης του tokenized corpus
+TOKENS_DIR = DATA_DIR / "tokens"
+
+# Ελάχιστο μήκος όρου για λέξεις-κλειδιά (λέξεις με λιγότερα γράμματα θεωρούνται θόρυβος)
+KEYWORD_MIN_LENGTH = 3
+
+TOKENS_CACHE = None
+
+def ragged_take(values, offsets, ids):
+    """
+    Συνένωση των τμημάτων values[offsets[i]:offsets[i + 1]] για κάθε i του ids, χωρίς βρόχο Python.
+
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    starts = np.asarray(offsets[ids], dtype=np.int64)
+    lengths = np.asarray(offsets[ids + 1], dtype=np.int64) - starts
+    total = int(lengths.sum())
+    if total == 0:
+        return values[:0]
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return values[np.arange(total, dtype=np.int64) + shifts]
+
+def top_term_ids(counts, keyword_mask, top_n: int = 10):
+    """
+    Τα term ids των top_n πιο συχνών όρων (λέξεων-κλειδιών) από ένα διάνυσμα συχνοτήτων.
+
+    1. Αγνοεί όρους με λιγότερα από KEYWORD_MIN_LENGTH γράμματα (keyword_mask)
+    2. Επιλέγει τους top_n υποψήφιους με argpartition (χωρίς πλήρη ταξινόμηση)
+    3. Ταξινομεί τους υποψήφιους κατά συχνότητα (ισοβαθμίες κατά term id)
+
+    """
+    counts = np.where(keyword_mask, counts, 0)
+    nonzero = int(np.count_nonzero(counts))
+    top_n = min(top_n, nonzero)
+    if top_n <= 0:
+        return np.empty(0, dtype=np.int64)
+    candidates = np.argpartition(-counts, top_n - 1)[:top_n]
+    return candidates[np.lexsort((candidates, -counts[candidates]))]
+
+def build_keyword_mask(vocab) -> np.ndarray:
+    return np.array([len(t) >= KEYWORD_MIN_LENGTH for t in vocab], dtype=bool)
+
+class TokenStore:
+    """
+    Tokenized corpus: κάθε ομιλία ως ακολουθία ακέραιων term ids.
+
+    Όλα τα tokens βρίσκονται σε έναν επίπεδο πίνακα int32· τα tokens της ομιλίας d
+    είναι το tokens[offsets[d]:offsets[d + 1]]. Το doc id είναι η θέση της ομιλίας
+    στο load_df() και το λεξιλόγιο (vocab) είναι κοινό για όλα τα routes και ευρετήρια.
+
+    """
+
+    def __init__(self, vocab, tokens, offsets, meta=None, term_index=None, keyword_mask=None):
+        self.vocab = vocab
+        self.term_index = {term: i for i, term in enumerate(vocab)} if term_index is None else term_index
+        self.tokens = tokens
+        self.offsets = offsets
+        self.meta = meta or {}
+        self.n_docs = len(offsets) - 1
+        self.keyword_mask = build_keyword_mask(vocab) if keyword_mask is None else keyword_mask
+
+    @property
+    def n_terms(self) -> int:
+        return len(self.vocab)
+
+    def term_id(self, term: str):
+        return self.term_index.get(term)
+
+    def doc(self, doc_id: int):
+        return self.tokens[self.offsets[doc_id]:self.offsets[doc_id + 1]]
+
+    def doc_lengths(self):
+        return np.diff(self.offsets).astype(np.int32)
+
+    def gather(self, doc_ids):
+        """
+        Συνένωση των tokens πολλών ομιλιών σε έναν πίνακα, χωρίς βρόχο Python.
+
+        """
+        return ragged_take(self.tokens, self.offsets, doc_ids)
+
+    def term_counts(self, doc_ids):
+        """
+        Συχνότητα κάθε όρου του λεξιλογίου στο σύνολο των δοσμένων ομιλιών.
+
+        """
+        return np.bincount(self.gather(doc_ids), minlength=self.n_terms)
+
+    def top_terms(self, counts, top_n: int = 10) -> list[str]:
+        """
+        Οι top_n πιο συχνοί όροι (λέξεις-κλειδιά) από ένα διάνυσμα συχνοτήτων.
+
+        """
+        return [self.vocab[i] for i in top_term_ids(counts, self.keyword_mask, top_n)]
+
+    def keywords(self, doc_ids, top_n: int = 10) -> list[str]:
+        return self.top_terms(self.term_counts(doc_ids), top_n)
+
+    def count_matrix(self, doc_ids):
+        """
+        Πίνακας συχνοτήτων ομιλιών × όρων (scipy CSR) για τις δοσμένες ομιλίες.
+
+        Κρατάει μόνο τις στήλες των όρων που εμφανίζονται στις ομιλίες·
+        επιστρέφει (matrix, term_ids) με term_ids[j] το term id της στήλης j.
+
+        """
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        starts = np.asarray(self.offsets[doc_ids], dtype=np.int64)
+        lengths = np.asarray(self.offsets[doc_ids + 1], dtype=np.int64) - starts
+        indptr = np.zeros(len(doc_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        data = np.ones(int(indptr[-1]), dtype=np.float64)
+        term_ids, columns = np.unique(self.gather(doc_ids), return_inverse=True)
+        matrix = sparse.csr_matrix((data, columns, indptr), shape=(len(doc_ids), len(term_ids)))
+        matrix.sum_duplicates()
+        return matrix, term_ids
+
+def encode_batch(texts):
+    """
+    Tokenization τμήματος ομιλιών με τοπικό λεξιλόγιο (εκτελείται στο process pool).
+
+    Επιστρέφει (λεξιλόγιο τμήματος, τοπικά term ids, πλήθος tokens ανά ομιλία)· τα τοπικά
+    ids αντιστοιχίζονται στο κοινό λεξιλόγιο μία φορά ανά διακριτό όρο του τμήματος.
+
+    """
+    vocab = {}
+    ids = array("i")
+    lengths = np.zeros(len(texts), dtype=np.int64)
+    for i, terms in enumerate(tokenize_many(texts)):
+        ids.extend([vocab.setdefault(term, len(vocab)) for term in terms])
+        lengths[i] = len(terms)
+    return list(vocab), np.frombuffer(ids, dtype=np.int32), lengths
+
+def build_token_store(df=None, workers: int | None = None) -> TokenStore:
+    """
+    Tokenization ολόκληρου του corpus (εκτελείται μία φορά ως βήμα build).
+
+    1. Κανονικοποιεί τις ομιλίες και αφαιρεί stopwords, σε τμήματα σε όλους τους πυρήνες
+    2. Αντιστοιχίζει κάθε όρο σε ακέραιο term id (κοινό λεξιλόγιο, με σειρά πρώτης εμφάνισης)
+    3. Αποθηκεύει τα tokens σε επίπεδο πίνακα int32 με offsets ανά ομιλία
+
+    """
+    if df is None:
+        df = load_df()
+
+    vocab = {}
+    chunks = []
+    lengths = []
+    for chunk_vocab, chunk_ids, chunk_lengths in map_batches(encode_batch, df["speech"], workers=workers):
+        mapping = np.array([vocab.setdefault(term, len(vocab)) for term in chunk_vocab], dtype=np.int32)
+        chunks.append(mapping[chunk_ids])
+        lengths.append(chunk_lengths)
+
+    offsets = np.zeros(len(df) + 1, dtype=np.int64)
+    if lengths:
+        np.cumsum(np.concatenate(lengths), out=offsets[1:])
+    tokens = np.concatenate(chunks) if chunks else np.zeros(0, dtype=np.int32)
+    return TokenStore(list(vocab), tokens, offsets)
+
+def save_token_store(store: TokenStore, path=TOKENS_DIR):
+    return write_artifact(
+        path,
+        {"tokens": store.tokens, "offsets": store.offsets},
+        meta={"n_docs": store.n_docs, "n_tokens": int(store.offsets[-1])},
+        vocab=store.vocab,
+    )
+
+def load_token_store(path=TOKENS_DIR):
+    loaded = read_artifact(path, ["tokens", "offsets"])
+    if loaded is None:
+        return None
+    arrays, meta, vocab = loaded
+    return TokenStore(vocab, arrays["tokens"], arrays["offsets"], meta)
+
+def get_token_store() -> TokenStore:
+    global TOKENS_CACHE
+    if TOKENS_CACHE is None:
+        store = load_token_store()
+        if store is None:
+            save_token_store(build_token_store())
+            store = load_token_store()
+        TOKENS_CACHE = store
+    return TOKENS_CACHE
@@ -0,0 +1,200 @@
+"""
+Χρονικά τμηματοποιημένο μοντέλο θεμάτων (time-sliced LSI) για την εξέλιξη των θεμάτων.
+
+Για κάθε έτος υπολογίζεται ξεχωριστό LSI (randomized SVD) στις ομιλίες του έτους, στον
+κοινό χώρο TF-IDF, παράλληλα ανά έτος. Τα θέματα κάθε έτους ευθυγραμμίζονται με τα θέματα
+του μοντέλου LSI ολόκληρου του corpus (αναφορά) με αντιστοίχιση στις φορτίσεις όρων
+(Hungarian algorithm στην |cosine similarity|), οπότε το θέμα i κάθε έτους είναι η εκδοχή
+του θέματος i του corpus σε εκείνο το έτος. Αποθηκεύονται ανά έτος και θέμα:
+- strength: ποσοστό της διακύμανσης του έτους που εξηγεί το θέμα (σ² / πλήθος ομιλιών,
+  αφού τα διανύσματα TF-IDF έχουν μοναδιαίο μήκος)
+- alignment: cosine similarity με το θέμα αναφοράς (πόσο καλή είναι η αντιστοίχιση)
+- drift: cosine similarity με το ίδιο θέμα του προηγούμενου έτους (NaN για το πρώτο)
+- top_terms / top_weights: οι όροι με τις μεγαλύτερες φορτίσεις
+
+"""
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+from app.core.artifacts import artifact_writer, read_artifact
+from app.core.data_loader import DATA_DIR, load_df
+from app.core.lsi_model import get_lsi_model, randomized_svd
+from app.core.text_cleaner import map_batches
+from app.core.tfidf import get_tfidf_space
+from app.core.token_store import get_token_store
+
+# Φάκελος αποθήκευσης του μοντέλου
+EVOLUTION_DIR = DATA_DIR / "topic_evolution"
+
+# Θέματα ανά έτος (ευθυγραμμισμένα με τα πρώτα N_TOPICS θέματα του LSI του corpus)
+N_TOPICS = 20
+
+# Πλήθος όρων που αποθηκεύονται ανά θέμα και έτος
+TOP_TERMS = 30
+
+# Έτη με λιγότερες ομιλίες δεν έχουν δικό τους μοντέλο
+MIN_SLICE_DOCS = 200
+
+EVOLUTION_CACHE = None
+
+def fit_slice(slices: list):
+    """
+    LSI των ομιλιών ενός έτους (εκτελείται στο process pool): (φορτίσεις, ιδιάζουσες τιμές).
+
+    """
+    _, doc_ids = slices[0]
+    space = get_tfidf_space()
+    n_components = min(N_TOPICS, space.n_features, len(doc_ids))
+    return randomized_svd(space, get_token_store(), n_components, doc_ids)
+
+def align_topics(components, reference):
+    """
+    Αντιστοίχιση των θεμάτων ενός έτους στα θέματα αναφοράς (Hungarian algorithm).
+
+    Μεγιστοποιεί το άθροισμα των |cosine similarity| των φορτίσεων· το πρόσημο κάθε θέματος
+    (αυθαίρετο στο SVD) αντιστρέφεται ώστε η similarity να είναι θετική. Επιστρέφει τις
+    φορτίσεις στη σειρά της αναφοράς, την similarity κάθε αντιστοίχισης και το θέμα του
+    έτους που αντιστοιχεί σε κάθε θέμα αναφοράς (-1 και 0 όπου δεν υπάρχει αντίστοιχο).
+
+    """
+    similarity = reference @ components.T
+    rows, columns = linear_sum_assignment(-np.abs(similarity))
+    aligned = np.zeros_like(reference)
+    alignment = np.zeros(len(reference), dtype=np.float32)
+    source = np.full(len(reference), -1, dtype=np.int64)
+    signs = np.sign(similarity[rows, columns])
+    signs[signs == 0] = 1
+    aligned[rows] = components[columns] * signs[:, None]
+    alignment[rows] = np.abs(similarity[rows, columns])
+    source[rows] = columns
+    return aligned, alignment, source
+
+class TopicEvolution:
+    """
+    Ευθυγραμμισμένα θέματα ανά έτος (βλ. περιγραφή του module).
+
+    """
+
+    def __init__(self, years, n_docs, strengths, alignment, drift, top_terms, top_weights, labels, meta=None):
+        self.years = years
+        self.n_docs = n_docs
+        self.strengths = strengths
+        self.alignment = alignment
+        self.drift = drift
+        self.top_terms = top_terms
+        self.top_weights = top_weights
+        self.labels = labels
+        self.meta = meta or {}
+
+    @property
+    def n_topics(self) -> int:
+        return self.strengths.shape[1]
+
+    def timeline(self, topic_ids, start_year=None, end_year=None, top_terms: int = 10, store=None) -> list[dict]:
+        """
+        Η εξέλιξη των δοσμένων θεμάτων ανά έτος: ισχύς, αντιστοίχιση, drift και κορυφαίοι όροι.
+
+        """
+        if store is None:
+            store = get_token_store()
+        keep = np.ones(len(self.years), dtype=bool)
+        if start_year is not None:
+            keep &= self.years >= start_year
+        if end_year is not None:
+            keep &= self.years <= end_year
+        rows = np.flatnonzero(keep)
+
+        topics = []
+        for topic in topic_ids:
+            timeline = []
+            for row in rows:
+                drift = float(self.drift[row, topic])
+                timeline.append({
+                    "year": int(self.years[row]),
+                    "strength": round(float(self.strengths[row, topic]), 5),
+                    "alignment": round(float(self.alignment[row, topic]), 4),
+                    "drift": None if np.isnan(drift) else round(drift, 4),
+                    "terms": [store.vocab[t] for t in self.top_terms[row, topic, :top_terms]],
+                })
+            topics.append({"topic_id": int(topic), "label": self.labels[topic][:top_terms], "timeline": timeline})
+        return topics
+
+def build_topic_evolution(path=EVOLUTION_DIR, workers: int | None = None):
+    """
+    Δημιουργία και αποθήκευση του χρονικά τμηματοποιημένου μοντέλου θεμάτων (βήμα build, μετά το LSI).
+
+    1. Χωρίζει τις ομιλίες ανά έτος (έτη με λιγότερες από MIN_SLICE_DOCS παραλείπονται)
+    2. Randomized SVD των ομιλιών κάθε έτους στον κοινό χώρο TF-IDF, παράλληλα ανά έτος
+    3. Ευθυγράμμιση των θεμάτων κάθε έτους με τα θέματα του LSI ολόκληρου του corpus
+    4. Ισχύς, ποιότητα αντιστοίχισης, drift από το προηγούμενο έτος και κορυφαίοι όροι ανά θέμα
+
+    """
+    model = get_lsi_model()
+    space = model.space
+    n_topics = min(N_TOPICS, model.n_components)
+    reference = model.components[:n_topics].astype(np.float64)
+    reference /= np.maximum(np.linalg.norm(reference, axis=1, keepdims=True), 1e-12)
+
+    doc_years = load_df()["year"].to_numpy()
+    all_years, counts = np.unique(doc_years, return_counts=True)
+    years = all_years[counts >= MIN_SLICE_DOCS]
+    slices = [(int(year), np.flatnonzero(doc_years == year)) for year in years]
+
+    n_years = len(years)
+    top_terms = min(TOP_TERMS, space.n_features)
+    n_docs = np.array([len(doc_ids) for _, doc_ids in slices], dtype=np.int64)
+    strengths = np.zeros((n_years, n_topics), dtype=np.float32)
+    alignment = np.zeros((n_years, n_topics), dtype=np.float32)
+    drift = np.full((n_years, n_topics), np.nan, dtype=np.float32)
+    top_term_ids = np.zeros((n_years, n_topics, top_terms), dtype=np.int32)
+    top_weights = np.zeros((n_years, n_topics, top_terms), dtype=np.float32)
+
+    previous, previous_matched = None, None
+    for row, (components, singular_values) in enumerate(map_batches(fit_slice, slices, chunk_size=1, workers=workers)):
+        components = components.astype(np.float64)
+        components /= np.maximum(np.linalg.norm(components, axis=1, keepdims=True), 1e-12)
+        aligned, alignment[row], source = align_topics(components, reference)
+        matched = source >= 0
+        strengths[row, matched] = singular_values[source[matched]] ** 2 / n_docs[row]
+
+        if previous is not None:
+            both = matched & previous_matched
+            drift[row, both] = np.sum(aligned[both] * previous[both], axis=1)
+        previous, previous_matched = aligned, matched
+
+        order = np.argsort(-aligned, axis=1, kind="stable")[:, :top_terms]
+        top_term_ids[row] = space.feature_ids[order]
+        top_weights[row] = np.take_along_axis(aligned, order, axis=1)
+
+    meta = {
+        "n_topics": n_topics,
+        "n_years": n_years,
+        "labels": [topic["terms"] for topic in model.topics(n_topics, TOP_TERMS)],
+    }
+    with artifact_writer(path, meta) as tmp:
+        np.save(tmp / "years.npy", years.astype(np.int16))
+        np.save(tmp / "n_docs.npy", n_docs)
+        np.save(tmp / "strengths.npy", strengths)
+        np.save(tmp / "alignment.npy", alignment)
+        np.save(tmp / "drift.npy", drift)
+        np.save(tmp / "top_terms.npy", top_term_ids)
+        np.save(tmp / "top_weights.npy", top_weights)
+    return path
+
+def load_topic_evolution(path=EVOLUTION_DIR):
+    loaded = read_artifact(path, ["years", "n_docs", "strengths", "alignment", "drift", "top_terms", "top_weights"], mmap=False)
+    if loaded is None:
+        return None
+    arrays, meta, _ = loaded
+    return TopicEvolution(labels=meta["labels"], meta=meta, **arrays)
+
+def get_topic_evolution() -> TopicEvolution:
+    global EVOLUTION_CACHE
+    if EVOLUTION_CACHE is None:
+        model = load_topic_evolution()
+        if model is None:
+            build_topic_evolution()
+            model = load_topic_evolution()
+        EVOLUTION_CACHE = model
+    return EVOLUTION_CACHE
@@ -0,0 +1,138 @@
+"""
+Προθέρμανση (warm-up) του server και κοινή χρήση του corpus μεταξύ πολλών workers.
+
+Με `uvicorn --workers N` κάθε worker είναι ξεχωριστή διεργασία. Για να μη φορτώνει ο καθένας
+το δικό του αντίγραφο του CSV και για να μην πληρώνει το πρώτο αίτημα όλη τη φόρτωση:
+- prepare(): δημιουργεί μία φορά (υπό κλείδωμα αρχείου, άρα από μία μόνο διεργασία) το
+  snapshot και όσα ευρετήρια λείπουν· εκτελείται πριν ξεκινήσουν οι workers
+  (python -m app.core.warmup) ή, αλλιώς, από τον πρώτο worker στην εκκίνησή του
+- warm_up(): σε κάθε worker (lifespan), πριν δεχτεί αιτήματα, φορτώνει το snapshot και τα
+  ευρετήρια με memory-mapping· οι σελίδες τους βρίσκονται μία φορά στο page cache και
+  μοιράζονται από όλους τους workers (και τις διεργασίες του process pool)
+- warmup_status(): κατάσταση ετοιμότητας για το /health
+
+Χρήση (από τον φάκελο backend):
+    python -m app.core.warmup
+
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from app.core.data_loader import DATA_DIR, DATASET_PATH, load_df, snapshot_is_fresh, write_snapshot
+from app.core.doc_store import get_doc_store
+from app.core.facets import get_facets
+from app.core.inverted_index import get_index
+from app.core.positions import get_positional_index
+from app.core.segments import get_live_corpus
+from app.core.term_cube import get_term_cube
+from app.core.token_store import get_token_store
+
+try:
+    import fcntl
+except ImportError:  # Windows: μόνο κλείδωμα εντός διεργασίας
+    fcntl = None
+
+# Η προθέρμανση στην εκκίνηση μπορεί να απενεργοποιηθεί (φόρτωση στο πρώτο αίτημα, όπως παλιά)
+WARMUP_ENABLED = os.environ.get("PARLIAMENT_WARMUP", "1").lower() not in {"0", "false", "no", "off"}
+
+# Τα δεδομένα που φορτώνονται στην εκκίνηση, με τη σειρά των εξαρτήσεών τους·
+# τα μοντέλα (TF-IDF, LSI, clustering, ομοιότητα μελών) φορτώνονται στην πρώτη χρήση
+COMPONENTS = [
+    ("corpus", load_df),
+    ("docs", get_doc_store),
+    ("facets", get_facets),
+    ("tokens", get_token_store),
+    ("index", get_index),
+    ("positions", get_positional_index),
+    ("cube", get_term_cube),
+    ("segments", get_live_corpus),
+]
+
+LOCK = threading.Lock()
+
+# "lazy" όταν η προθέρμανση είναι απενεργοποιημένη (ο worker είναι έτοιμος, φορτώνει στο πρώτο αίτημα)·
+# το "starting" ισχύει μόνο μέσα στο lifespan, πριν ο worker δεχτεί αιτήματα
+STATUS = {"status": "starting" if WARMUP_ENABLED else "lazy", "components": {}, "error": None}
+
+# Καταστάσεις στις οποίες ο worker δέχεται αιτήματα (το /health απαντά 200)
+READY_STATES = {"ready", "lazy"}
+
+@contextmanager
+def build_lock():
+    """
+    Αποκλειστική δημιουργία artifacts (και μεταξύ διεργασιών, όπου υπάρχει fcntl).
+
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with LOCK, open(DATA_DIR / ".build.lock", "w") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+def load_components() -> dict:
+    """
+    Φόρτωση (και δημιουργία, όσων λείπουν) όλων των COMPONENTS· επιστρέφει τον χρόνο καθενός.
+
+    Το snapshot γράφεται πρώτο, ώστε το load_df() να φορτώσει το memory-mapped Arrow αρχείο
+    και όχι το CSV.
+
+    """
+    timings = {}
+    with build_lock():
+        if DATASET_PATH.exists() and not snapshot_is_fresh():
+            start = time.perf_counter()
+            write_snapshot()
+            timings["snapshot"] = round(time.perf_counter() - start, 3)
+        for name, load in COMPONENTS:
+            start = time.perf_counter()
+            load()
+            timings[name] = round(time.perf_counter() - start, 3)
+    return timings
+
+def prepare() -> dict:
+    """
+    Δημιουργία του snapshot και των ευρετηρίων που λείπουν, πριν ξεκινήσουν οι workers.
+
+    """
+    return load_components()
+
+def warm_up() -> dict:
+    """
+    Προθέρμανση ενός worker: φόρτωση όλων των COMPONENTS πριν δεχτεί αιτήματα.
+
+    Σφάλματα καταγράφονται στην κατάσταση (το /health απαντά 503) αντί να σταματούν τον server·
+    τα routes δοκιμάζουν ξανά τη φόρτωση στην πρώτη χρήση.
+
+    """
+    STATUS.update(status="starting", components={}, error=None)
+    start = time.perf_counter()
+    try:
+        STATUS["components"] = load_components()
+    except Exception as exc:
+        STATUS.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    else:
+        STATUS["status"] = "ready"
+    STATUS["warmup_seconds"] = round(time.perf_counter() - start, 3)
+    return STATUS
+
+def warmup_status() -> dict:
+    """
+    Κατάσταση ετοιμότητας του worker: status (ready / lazy / error), χρόνοι φόρτωσης, corpus.
+
+    """
+    state = {**STATUS, "pid": os.getpid()}
+    if STATUS["status"] == "ready":
+        live = get_live_corpus()
+        state["n_docs"] = live.n_docs
+        state["segments"] = len(live.segments)
+        state["generation"] = live.generation
+    return state
+
+def main():
+    print(prepare())
+
+if __name__ == "__main__":
+    main()
@@ -8,9 +8,18 @@ FastAPI application server για το Greek Parliament Information Retrieval Sy
 - LSI (Latent Semantic Indexing) για ανακάλυψη θεμάτων
 - K-Means clustering για ομαδοποίηση ομιλιών
 - Ανάλυση εξέλιξης θεμάτων (topic drift)
+- Ασύγχρονες εργασίες (jobs) για βαριούς υπολογισμούς σε process pool
+- Cache αποκρίσεων με ETag / 304 για τα επαναλαμβανόμενα αιτήματα ανάλυσης
+- Μετρικά απόδοσης (/metrics, Prometheus) και Server-Timing ανά στάδιο
+- Σταδιακή εισαγωγή νέων συνεδριάσεων (segments) χωρίς επανεκκίνηση
+- Εντοπισμός σχεδόν διπλότυπων ομιλιών (MinHash / LSH)
+- Προθέρμανση στην εκκίνηση κάθε worker (memory-mapped δεδομένα κοινά σε όλους) και /health
 """
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes.search import router as search_router
 from app.api.routes.data import router as data_router
@@ -20,8 +29,27 @@ from app.api.routes.similarity import router as similarity_router
 from app.api.routes.lsi import router as lsi_router
 from app.api.routes.clustering import router as clustering_router
 from app.api.routes.analysis import router as analysis_router
+from app.api.routes.jobs import router as jobs_router
+from app.api.routes.admin import router as admin_router
+from app.api.routes.duplicates import router as duplicates_router
+from app.core.jobs import shutdown_executor
+from app.core.response_cache import ResponseCacheMiddleware, get_response_cache
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.warmup import READY_STATES, WARMUP_ENABLED, warm_up, warmup_status
 
-app = FastAPI(title="Greek Parliament IR API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Ο uvicorn ανοίγει τη θύρα μόνο μετά το lifespan: ο worker δέχεται αιτήματα (και το /health)
+    # αφού φορτωθούν τα δεδομένα, χωρίς «κρύο» πρώτο αίτημα
+    if WARMUP_ENABLED:
+        await asyncio.to_thread(warm_up)
+    yield
+    shutdown_executor()
+
+app = FastAPI(title="Greek Parliament IR API", version="0.1.0", lifespan=lifespan)
+
+# Το cache προστίθεται πριν το CORS, ώστε το CORS να εφαρμόζεται και στις αποκρίσεις από το cache
+app.add_middleware(ResponseCacheMiddleware, cache=get_response_cache())
 
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +59,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Τα μετρικά είναι το εξωτερικό middleware, ώστε να μετράνε και τις αποκρίσεις από το cache
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(search_router, prefix="/api/search", tags=["Search"])
 app.include_router(data_router, prefix="/api/data", tags=["Data"])
 app.include_router(speeches_router, prefix="/api/speeches", tags=["Speeches"])
@@ -39,7 +70,30 @@ app.include_router(similarity_router, prefix="/api/similarity", tags=["Similarit
 app.include_router(lsi_router, prefix="/api/lsi", tags=["LSI"])
 app.include_router(clustering_router, prefix="/api/clustering", tags=["Clustering"])
 app.include_router(analysis_router, prefix="/api/analysis", tags=["Analysis"])
+app.include_router(jobs_router, prefix="/api/jobs", tags=["Jobs"])
+app.include_router(admin_router, prefix="/api/admin", tags=["Admin"])
+app.include_router(duplicates_router, prefix="/api/duplicates", tags=["Duplicates"])
 
 @app.get("/")
 async def root():
-    return {"message": "API is running"}
\ No newline at end of file
+    return {"message": "API is running"}
+
+@app.get("/health")
+async def health():
+    """
+    Ετοιμότητα του worker: 200 όταν είναι έτοιμος, 503 όταν η προθέρμανση απέτυχε.
+
+    Η προθέρμανση ολοκληρώνεται στο lifespan, πριν ο worker δεχτεί αιτήματα, οπότε το /health
+    δεν απαντά κατά τη φόρτωση· ως τότε ο healthcheck αποτυγχάνει στη σύνδεση.
+
+    """
+    state = warmup_status()
+    return JSONResponse(state, status_code=200 if state["status"] in READY_STATES else 503)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Μετρικά απόδοσης σε μορφή Prometheus (latency ανά route, στάδια, μνήμη).
+
+    """
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Μετρήσεις απόδοσης (benchmarks) του backend.
+
+- generate: γεννήτρια συνθετικού corpus στο σχήμα του dataset (10k → 5M ομιλίες)
+- micro: microbenchmarks των build, normalize/remove_stopwords, load_df και των route handlers
+- load: ταυτόχρονα αιτήματα στο ASGI app (in-process) με latency p50/p95/p99 και ρυθμαπόδοση
+- text_cleaner: ρυθμαπόδοση (MB/s) της tokenization σε έναν και σε όλους τους πυρήνες
+
+Τα αποτελέσματα γράφονται σε JSON στο benchmarks/results/ (με commit και περιβάλλον),
+ώστε οι εκτελέσεις να συγκρίνονται μεταξύ τους. Εκτέλεση από τον φάκελο backend, π.χ.:
+    python -m benchmarks.generate --rows 100000 --output /tmp/bench/Greek_Parliament_Proceedings_1989_2020.csv
+    PARLIAMENT_DATA_DIR=/tmp/bench python -m benchmarks.micro --build
+    PARLIAMENT_DATA_DIR=/tmp/bench python -m benchmarks.load --concurrency 16
+
+"""
@@ -0,0 +1,188 @@
+"""
+Γεννήτρια συνθετικού corpus πρακτικών της Βουλής για benchmarks.
+
+Παράγει CSV με το σχήμα του dataset (speech, member_name, political_party, sitting_date)
+σε οποιαδήποτε κλίμακα (10k → 5M ομιλίες), γράφοντας τμηματικά (φραγμένη μνήμη):
+- λεξιλόγιο από πραγματικές ελληνικές λέξεις με τόνους και συνθετικές λέξεις από συλλαβές,
+  με κεφαλαία, σημεία στίξης και αριθμούς, ώστε το normalize να κάνει πραγματική δουλειά
+- stopwords σε ρεαλιστική αναλογία και κατανομή Zipf στους όρους
+- θέματα που μετατοπίζονται με τα χρόνια (για topic drift / LSI / clustering)
+- μέλη με σταθερό κόμμα, χρονολογική σειρά συνεδριάσεων, λίγες κενές/ελλιπείς γραμμές
+
+Χρήση (από τον φάκελο backend):
+    python -m benchmarks.generate --rows 100000 --output /tmp/bench/Greek_Parliament_Proceedings_1989_2020.csv
+
+Για να τρέξει το backend στο συνθετικό corpus: PARLIAMENT_DATA_DIR=/tmp/bench
+
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.core.data_loader import DATASET_PATH, DATE_FORMAT
+from app.core.stopwords import STOPWORDS
+
+# Πραγματικές λέξεις του κοινοβουλευτικού λόγου (με τόνους), βάση του λεξιλογίου
+BASE_WORDS = (
+    "κυβέρνηση νομοσχέδιο προϋπολογισμός οικονομία ανάπτυξη φορολογία εργαζόμενοι συντάξεις "
+    "υγεία νοσοκομεία εκπαίδευση σχολεία πανεπιστήμια έρευνα ανεργία επενδύσεις τράπεζες "
+    "χρέος μνημόνιο ευρώπη ευρωπαϊκή ένωση εξωτερική πολιτική άμυνα ένοπλες δυνάμεις "
+    "τουρκία κύπρος μεταναστευτικό προσφυγικό αστυνομία δικαιοσύνη διαφάνεια διαφθορά "
+    "αγρότες γεωργία κτηνοτροφία αλιεία τουρισμός ναυτιλία μεταφορές υποδομές ενέργεια "
+    "περιβάλλον κλιματική αλλαγή δάση πυρκαγιές σεισμοί αυτοδιοίκηση δήμοι περιφέρειες "
+    "τροπολογία άρθρο διάταξη ψηφοφορία επιτροπή ολομέλεια αντιπολίτευση πλειοψηφία "
+    "δημοκρατία σύνταγμα αναθεώρηση εκλογές εκλογικός νόμος πολίτες κοινωνία αλληλεγγύη "
+    "μισθοί επιδόματα ασφαλιστικό ταμεία ιδιωτικοποιήσεις δημόσιο υπάλληλοι αξιολόγηση "
+    "πολιτισμός αθλητισμός ολυμπιακοί αγώνες νεολαία οικογένεια δημογραφικό στέγαση "
+    "κορωνοϊός πανδημία εμβόλια μέτρα στήριξης επιχειρήσεις εξαγωγές ανταγωνιστικότητα"
+).split()
+
+SYLLABLES = (
+    "κα λο μέ ρα τη νο πά σι δή μο κρά τί ζω ή ό ευ ρώ πη θέ ση νό μος ερ γα σί ας ύ γεί ξη στή "
+    "πο λί τι κή οι κο νο μί α νό μου ψή φι σμα ά ρθρο έ ερ γο ύ πουρ γεί ο"
+).split()
+
+PARTIES = [
+    "ΝΕΑ ΔΗΜΟΚΡΑΤΙΑ", "ΠΑΝΕΛΛΗΝΙΟ ΣΟΣΙΑΛΙΣΤΙΚΟ ΚΙΝΗΜΑ", "ΣΥΝΑΣΠΙΣΜΟΣ ΡΙΖΟΣΠΑΣΤΙΚΗΣ ΑΡΙΣΤΕΡΑΣ",
+    "ΚΟΜΜΟΥΝΙΣΤΙΚΟ ΚΟΜΜΑ ΕΛΛΑΔΑΣ", "ΣΥΝΑΣΠΙΣΜΟΣ ΤΗΣ ΑΡΙΣΤΕΡΑΣ ΤΩΝ ΚΙΝΗΜΑΤΩΝ ΚΑΙ ΤΗΣ ΟΙΚΟΛΟΓΙΑΣ",
+    "ΛΑΙΚΟΣ ΟΡΘΟΔΟΞΟΣ ΣΥΝΑΓΕΡΜΟΣ", "ΑΝΕΞΑΡΤΗΤΟΙ ΕΛΛΗΝΕΣ", "ΔΗΜΟΚΡΑΤΙΚΗ ΑΡΙΣΤΕΡΑ",
+    "ΕΛΛΗΝΙΚΗ ΛΥΣΗ", "ΜΕΤΩΠΟ ΕΥΡΩΠΑΙΚΗΣ ΡΕΑΛΙΣΤΙΚΗΣ ΑΝΥΠΑΚΟΗΣ", "βουλη",
+]
+
+BOILERPLATE = "Ο Πρόεδρος κηρύσσει τη συνεδρίαση. Κατατέθηκε η τροπολογία υπ' αριθμόν 12 του Υπουργείου."
+
+FIRST_YEAR, LAST_YEAR = 1989, 2020
+
+class CorpusGenerator:
+    """
+    Συνθετικό corpus με σταθερό σπόρο: ίδιες παράμετροι → ίδιο αρχείο.
+
+    """
+
+    def __init__(self, n_rows: int, n_members: int = 1500, vocab_size: int = 20_000,
+                 n_topics: int = 40, seed: int = 7):
+        self.n_rows = n_rows
+        self.n_topics = n_topics
+        self.rng = np.random.default_rng(seed)
+
+        synthetic = {
+            "".join(self.rng.choice(SYLLABLES, self.rng.integers(2, 5)))
+            for _ in range(vocab_size * 2)
+        }
+        words = list(dict.fromkeys(BASE_WORDS + sorted(synthetic)))[:vocab_size]
+        self.vocab = np.array(words, dtype=object)
+        self.stopwords = np.array(sorted(STOPWORDS), dtype=object)
+
+        # Κάθε θέμα έχει τους δικούς του 200 όρους, με κατανομή Zipf μέσα στο θέμα
+        self.topic_terms = np.stack([
+            self.rng.choice(len(self.vocab), 200, replace=False) for _ in range(n_topics)
+        ])
+        self.topic_zipf = self.zipf(200)
+        self.global_zipf = self.zipf(len(self.vocab))
+
+        self.members = np.array([
+            f"{self.name_part()} {self.name_part()}" for _ in range(n_members)
+        ], dtype=object)
+        self.member_party = self.rng.integers(len(PARTIES), size=n_members)
+        # Λίγα μέλη μιλούν πολύ συχνά (πρόεδροι, υπουργοί), τα περισσότερα σπάνια
+        self.member_weights = self.zipf(n_members, exponent=0.8)
+
+    @staticmethod
+    def zipf(n: int, exponent: float = 1.0):
+        weights = 1 / np.arange(1, n + 1) ** exponent
+        return weights / weights.sum()
+
+    def name_part(self) -> str:
+        return "".join(self.rng.choice(SYLLABLES, self.rng.integers(2, 4))).capitalize()
+
+    def speeches(self, years):
+        """
+        Κείμενα ομιλιών για ένα τμήμα (ένα έτος ανά ομιλία), με διανυσματική δειγματοληψία όρων.
+
+        """
+        n = len(years)
+        lengths = np.clip(self.rng.lognormal(4.5, 0.9, size=n).astype(np.int64), 3, 3000)
+        # Το κύριο θέμα κάθε ομιλίας μετατοπίζεται αργά με τα χρόνια
+        topics = (self.rng.integers(0, 8, size=n) + (years - FIRST_YEAR) // 3) % self.n_topics
+        total = int(lengths.sum())
+        token_topics = np.repeat(topics, lengths)
+
+        kinds = self.rng.random(total)
+        words = np.empty(total, dtype=object)
+        stop = kinds < 0.4
+        topical = (kinds >= 0.4) & (kinds < 0.75)
+        background = kinds >= 0.75
+        words[stop] = self.stopwords[self.rng.integers(len(self.stopwords), size=int(stop.sum()))]
+        ranks = self.rng.choice(200, size=int(topical.sum()), p=self.topic_zipf)
+        words[topical] = self.vocab[self.topic_terms[token_topics[topical], ranks]]
+        words[background] = self.vocab[self.rng.choice(len(self.vocab), size=int(background.sum()), p=self.global_zipf)]
+
+        # Θόρυβος που πρέπει να καθαρίσει το normalize: κεφαλαία, στίξη, αριθμοί
+        upper = self.rng.random(total) < 0.03
+        words[upper] = [w.capitalize() for w in words[upper]]
+        punct = self.rng.random(total) < 0.08
+        marks = np.array([",", ".", ";", "!", ":"], dtype=object)
+        words[punct] = words[punct] + marks[self.rng.integers(len(marks), size=int(punct.sum()))]
+        numbers = self.rng.random(total) < 0.01
+        words[numbers] = self.rng.integers(1, 2021, size=int(numbers.sum())).astype(str).astype(object)
+
+        bounds = np.cumsum(lengths)[:-1]
+        return [" ".join(part) for part in np.split(words, bounds)]
+
+    def chunk(self, start: int, end: int) -> pd.DataFrame:
+        n = end - start
+        # Χρονολογική σειρά: οι ομιλίες κατανέμονται ομοιόμορφα στα έτη 1989-2020
+        positions = np.arange(start, end)
+        span = (pd.Timestamp(LAST_YEAR, 12, 31) - pd.Timestamp(FIRST_YEAR, 1, 1)).days
+        dates = pd.Timestamp(FIRST_YEAR, 1, 1) + pd.to_timedelta(positions * span // max(self.n_rows, 1), unit="D")
+        years = dates.year.to_numpy()
+
+        members = self.rng.choice(len(self.members), size=n, p=self.member_weights)
+        speeches = np.array(self.speeches(years), dtype=object)
+        boilerplate = self.rng.random(n) < 0.02
+        speeches[boilerplate] = BOILERPLATE
+        speeches[self.rng.random(n) < 0.005] = ""
+        names = self.members[members].copy()
+        names[self.rng.random(n) < 0.003] = ""
+
+        return pd.DataFrame({
+            "member_name": names,
+            "sitting_date": dates.strftime(DATE_FORMAT),
+            "political_party": np.array(PARTIES, dtype=object)[self.member_party[members]],
+            "speech": speeches,
+        })
+
+    def write(self, path, chunk_size: int = 50_000):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        for start in range(0, self.n_rows, chunk_size):
+            end = min(start + chunk_size, self.n_rows)
+            self.chunk(start, end).to_csv(tmp, mode="a" if start else "w", header=start == 0, index=False)
+        if self.n_rows == 0:
+            pd.DataFrame(columns=["member_name", "sitting_date", "political_party", "speech"]).to_csv(tmp, index=False)
+        tmp.replace(path)
+        return path
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Γεννήτρια συνθετικού corpus για benchmarks")
+    parser.add_argument("--rows", type=int, default=10_000, help="πλήθος ομιλιών (π.χ. 10000 έως 5000000)")
+    parser.add_argument("--members", type=int, default=1500, help="πλήθος μελών")
+    parser.add_argument("--vocab", type=int, default=20_000, help="μέγεθος λεξιλογίου")
+    parser.add_argument("--topics", type=int, default=40, help="πλήθος θεμάτων")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", default=str(DATASET_PATH), help="διαδρομή του CSV (προεπιλογή: το dataset του DATA_DIR)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    generator = CorpusGenerator(args.rows, args.members, args.vocab, args.topics, args.seed)
+    path = generator.write(args.output)
+    size = Path(path).stat().st_size / 1e6
+    print(f"{path}: {args.rows} ομιλίες, {size:.1f} MB ({time.perf_counter() - start:.1f}s)")
+
+if __name__ == "__main__":
+    main()
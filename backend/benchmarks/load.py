@@ -0,0 +1,99 @@
+"""
+Οδηγός φορτίου (load driver) για το ASGI app, μέσα στην ίδια διεργασία.
+
+Στέλνει ταυτόχρονα αιτήματα (concurrency εργάτες) μέσω httpx.ASGITransport, χωρίς δίκτυο
+και χωρίς uvicorn, και μετράει latency (p50/p95/p99) ανά endpoint και συνολική ρυθμαπόδοση.
+
+Χρήση (από τον φάκελο backend):
+    PARLIAMENT_DATA_DIR=/tmp/bench python -m benchmarks.load --requests 500 --concurrency 16
+    python -m benchmarks.load --no-cache        # χωρίς το cache αποκρίσεων
+
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+from collections import defaultdict
+
+import httpx
+
+from app.core.jobs import shutdown_executor
+from app.core.response_cache import get_response_cache
+from app.main import app
+from benchmarks.results import summarize, write_results
+
+# Μείγμα αιτημάτων που αντιστοιχεί στα tabs του frontend: (όνομα, μέθοδος, url, σώμα JSON)
+SCENARIOS = [
+    ("search", "POST", "/api/search/", {"query": "οικονομία ανάπτυξη", "top_k": 10}),
+    ("search (party)", "POST", "/api/search/", {"query": "υγεία", "top_k": 10, "party": "δημοκρατια"}),
+    ("semantic_search", "POST", "/api/lsi/search", {"query": "εκπαίδευση σχολεία", "top_k": 10}),
+    ("topic_drift", "GET", "/api/analysis/topic-drift?start_year=1989&end_year=2020", None),
+    ("party_timeline", "GET", "/api/keywords/party-timeline?party=ΝΕΑ%20ΔΗΜΟΚΡΑΤΙΑ", None),
+    ("top_pairs", "GET", "/api/similarity/top-pairs?top_k=10", None),
+    ("lsi_topics", "GET", "/api/lsi/topics", None),
+    ("cluster_groups", "GET", "/api/clustering/groups", None),
+]
+
+async def run_load(n_requests: int, concurrency: int, scenarios=SCENARIOS) -> dict:
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    schedule = itertools.islice(itertools.cycle(scenarios), n_requests)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        # Προθέρμανση: φόρτωση δεδομένων, ευρετηρίων και μοντέλων εκτός μέτρησης
+        for _, method, url, body in scenarios:
+            await client.request(method, url, json=body)
+
+        async def worker():
+            for name, method, url, body in schedule:
+                start = time.perf_counter()
+                response = await client.request(method, url, json=body)
+                latencies[name].append((time.perf_counter() - start) * 1000)
+                if response.status_code >= 400 or "error" in response.text[:20]:
+                    errors[name] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    all_latencies = [ms for samples in latencies.values() for ms in samples]
+    return {
+        "requests": len(all_latencies),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(len(all_latencies) / elapsed, 2),
+        "overall": summarize(all_latencies),
+        "endpoints": {
+            name: {**summarize(samples), "errors": errors[name]} for name, samples in latencies.items()
+        },
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load driver του ASGI app (in-process)")
+    parser.add_argument("--requests", type=int, default=400, help="συνολικό πλήθος αιτημάτων")
+    parser.add_argument("--concurrency", type=int, default=8, help="ταυτόχρονα αιτήματα")
+    parser.add_argument("--no-cache", action="store_true", help="απενεργοποίηση του cache αποκρίσεων")
+    parser.add_argument("--output", default=None, help="αρχείο JSON (προεπιλογή: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        cache = get_response_cache()
+        cache.max_bytes = 0
+        cache.disk_dir = None
+
+    try:
+        results = asyncio.run(run_load(args.requests, args.concurrency))
+    finally:
+        shutdown_executor()
+    results["response_cache"] = not args.no_cache
+
+    print(f"{results['requests']} αιτήματα, concurrency {results['concurrency']}: "
+          f"{results['throughput_rps']} req/s")
+    for name, stats in [("overall", results["overall"]), *results["endpoints"].items()]:
+        print(f"{name:<18} p50 {stats['p50_ms']:>9.2f} ms  p95 {stats['p95_ms']:>9.2f} ms  p99 {stats['p99_ms']:>9.2f} ms")
+    print(write_results("load", results, args.output))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Microbenchmarks των βασικών συναρτήσεων και των route handlers.
+
+1. Build: χρόνος δημιουργίας κάθε παραγόμενου αρχείου (snapshot, tokens, index, ...)
+2. Κείμενο: normalize και remove_stopwords σε δείγμα ομιλιών (ms και MB/s)
+3. load_df: ψυχρή φόρτωση του DataFrame (snapshot ή CSV)
+4. Routes: οι handlers καλούνται απευθείας (χωρίς HTTP και cache αποκρίσεων), repeat φορές ο καθένας
+
+Χρήση (από τον φάκελο backend):
+    PARLIAMENT_DATA_DIR=/tmp/bench python -m benchmarks.micro --repeat 5 --build
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core import data_loader
+from app.core.build import TARGETS
+from app.core.data_loader import load_df
+from app.core.jobs import shutdown_executor
+from app.core.sampling import DEFAULT_SEED
+from app.core.text_cleaner import normalize, remove_stopwords
+from app.core.token_store import get_token_store
+from app.api.routes.analysis import topic_drift
+from app.api.routes.clustering import cluster_speeches
+from app.api.routes.lsi import lsi_topics, semantic_search, SemanticSearchRequest
+from app.api.routes.search import search, SearchRequest
+from app.api.routes.similarity import top_pairs
+from benchmarks.results import summarize, write_results
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+def bench_build() -> dict:
+    results = {}
+    for name, build in TARGETS.items():
+        results[name] = {"seconds": round(timed(build) / 1000, 3)}
+        print(f"build {name:<12} {results[name]['seconds']:>9.3f}s")
+    return results
+
+def bench_text(texts: list[str], repeat: int) -> dict:
+    n_mb = sum(len(t.encode("utf-8")) for t in texts) / 1e6
+    normalized = [normalize(t) for t in texts]
+    cases = {
+        "normalize": lambda: [normalize(t) for t in texts],
+        "remove_stopwords": lambda: [remove_stopwords(t) for t in normalized],
+    }
+    results = {}
+    for name, fn in cases.items():
+        stats = summarize([timed(fn) for _ in range(repeat)])
+        stats["mb_per_s"] = round(n_mb / (stats["p50_ms"] / 1000), 2)
+        results[name] = stats
+        print(f"{name:<24} p50 {stats['p50_ms']:>10.3f} ms  {stats['mb_per_s']:>8.2f} MB/s")
+    return results
+
+def bench_load_df(repeat: int) -> dict:
+    def cold_load():
+        data_loader.DF_CACHE = None
+        load_df()
+
+    stats = summarize([timed(cold_load) for _ in range(repeat)])
+    print(f"{'load_df (cold)':<24} p50 {stats['p50_ms']:>10.3f} ms")
+    return {"load_df": stats}
+
+def route_cases(query: str) -> dict:
+    """
+    Οι handlers με όλες τις παραμέτρους τους (οι προεπιλογές Query ισχύουν μόνο μέσω HTTP).
+
+    """
+    # Χωρίς sample_size οι παράμετροι του δείγματος πρέπει να λείπουν (None)
+    full = {"seed": None, "stratify_by": None, "allocation": None, "year_range": None, "party": None}
+    sampling = {**full, "seed": DEFAULT_SEED, "allocation": "proportional"}
+    stratified = {**sampling, "seed": 7, "stratify_by": "year_party"}
+    return {
+        "search": lambda: search(SearchRequest(query=query, top_k=10)),
+        "semantic_search": lambda: semantic_search(SemanticSearchRequest(query=query, top_k=10)),
+        "topic_drift": lambda: topic_drift(start_year=1989, end_year=2020, top_n=8, background=False),
+        "top_pairs": lambda: top_pairs(metric="jaccard", top_k=5),
+        "lsi_topics": lambda: lsi_topics(sample_size=None, n_topics=5, top_terms=10, background=False, **full),
+        "lsi_topics (sample)": lambda: lsi_topics(sample_size=500, n_topics=5, top_terms=10, background=False, **sampling),
+        "lsi_topics (stratified)": lambda: lsi_topics(sample_size=500, n_topics=5, top_terms=10, background=False, **stratified),
+        "cluster_speeches": lambda: cluster_speeches(sample_size=None, n_clusters=None, top_terms=8, background=False, **full),
+        "cluster_speeches (sample)": lambda: cluster_speeches(sample_size=500, n_clusters=5, top_terms=8, background=False, **sampling),
+        "cluster_speeches (stratified)": lambda: cluster_speeches(sample_size=500, n_clusters=5, top_terms=8, background=False, **stratified),
+    }
+
+def bench_routes(repeat: int) -> dict:
+    store = get_token_store()
+    # Ερώτημα με τους δύο συχνότερους όρους λέξεις-κλειδιά του corpus
+    query = " ".join(store.keywords(range(min(store.n_docs, 1000)), 2))
+    loop = asyncio.new_event_loop()
+    results = {}
+    try:
+        for name, handler in route_cases(query).items():
+            # Η πρώτη κλήση φορτώνει ευρετήρια/μοντέλα και ξεκινάει το process pool
+            first = timed(lambda: loop.run_until_complete(handler()))
+            stats = summarize([timed(lambda: loop.run_until_complete(handler())) for _ in range(repeat)])
+            stats["first_ms"] = round(first, 3)
+            results[name] = stats
+            print(f"{name:<30} first {first:>10.3f} ms  p50 {stats['p50_ms']:>10.3f} ms  p95 {stats['p95_ms']:>10.3f} ms")
+    finally:
+        loop.close()
+        shutdown_executor()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks του backend")
+    parser.add_argument("--repeat", type=int, default=5, help="επαναλήψεις ανά μέτρηση")
+    parser.add_argument("--text-sample", type=int, default=2000, help="πλήθος ομιλιών για normalize/remove_stopwords")
+    parser.add_argument("--build", action="store_true", help="μέτρηση και της δημιουργίας όλων των παραγόμενων αρχείων")
+    parser.add_argument("--output", default=None, help="αρχείο JSON (προεπιλογή: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    results = {"repeat": args.repeat}
+    if args.build:
+        results["build"] = bench_build()
+    results["load"] = bench_load_df(args.repeat)
+    df = load_df()
+    results["n_docs"] = len(df)
+    texts = [str(t) for t in df["speech"].head(args.text_sample)]
+    results["text"] = bench_text(texts, args.repeat)
+    results["routes"] = bench_routes(args.repeat)
+
+    print(write_results("micro", results, args.output))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Αποθήκευση αποτελεσμάτων benchmarks σε JSON, μαζί με τα στοιχεία του περιβάλλοντος εκτέλεσης.
+
+Κάθε εκτέλεση γράφει ένα αρχείο benchmarks/results/<είδος>-<χρονοσφραγίδα>.json,
+ώστε διαδοχικές εκτελέσεις (commits, μεγέθη corpus) να συγκρίνονται μεταξύ τους.
+
+"""
+
+import json
+import os
+import platform
+import subprocess
+import time
+from pathlib import Path
+
+import numpy as np
+
+from app.core.data_loader import DATA_DIR, dataset_fingerprint
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def environment() -> dict:
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "data_dir": str(DATA_DIR),
+        "dataset_fingerprint": dataset_fingerprint(),
+    }
+
+def summarize(samples_ms) -> dict:
+    """
+    Στατιστικά χρόνων (ms): πλήθος, ελάχιστο, μέσος όρος και εκατοστημόρια p50/p95/p99.
+
+    """
+    samples = np.asarray(samples_ms, dtype=np.float64)
+    if len(samples) == 0:
+        return {"count": 0}
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "count": int(len(samples)),
+        "min_ms": round(float(samples.min()), 3),
+        "mean_ms": round(float(samples.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(samples.max()), 3),
+    }
+
+def write_results(kind: str, results: dict, output=None) -> Path:
+    path = Path(output) if output else RESULTS_DIR / f"{kind}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"benchmark": kind, "environment": environment(), **results}
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
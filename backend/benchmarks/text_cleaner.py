@@ -0,0 +1,85 @@
+"""
+Benchmark της κανονικοποίησης / tokenization κειμένου.
+
+Συγκρίνει τη ρυθμαπόδοση (MB/s κειμένου UTF-8) της αρχικής διαδρομής
+(Series.apply με δύο περάσματα regex ανά ομιλία) με το batch API του text_cleaner,
+σε έναν πυρήνα και σε όλους τους πυρήνες.
+
+Χρήση (από τον φάκελο backend):
+    python -m benchmarks.text_cleaner --rows 20000 --repeat 5 --workers 4
+
+"""
+
+import argparse
+import os
+import re
+import time
+
+import pandas as pd
+
+from app.core.data_loader import load_df
+from app.core.text_cleaner import (
+    ACCENTS_TABLE, STOPWORDS_NORM, UNWANTED, iter_tokenized, tokenize_many,
+)
+from benchmarks.results import write_results
+
+def legacy_tokenize(text):
+    """
+    Η αρχική υλοποίηση (lower, translate, δύο re.sub, split/filter/join) ως σημείο αναφοράς.
+
+    """
+    if not isinstance(text, str) or not text:
+        return []
+    text = text.lower().translate(ACCENTS_TABLE)
+    text = re.sub(UNWANTED, " ", text)
+    text = re.sub(r"\s+", " ", text).strip()
+    return " ".join(w for w in text.split() if w not in STOPWORDS_NORM).split()
+
+def measure(fn, texts: pd.Series, n_bytes: int, cores: int) -> dict:
+    start = time.perf_counter()
+    n_tokens = sum(len(tokens) for tokens in fn(texts))
+    seconds = time.perf_counter() - start
+    mb_per_s = n_bytes / 1e6 / seconds
+    return {
+        "seconds": round(seconds, 3),
+        "mb_per_s": round(mb_per_s, 2),
+        "mb_per_s_per_core": round(mb_per_s / cores, 2),
+        "n_tokens": n_tokens,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark κανονικοποίησης κειμένου")
+    parser.add_argument("--rows", type=int, default=None, help="πλήθος ομιλιών από το dataset (προεπιλογή: όλες)")
+    parser.add_argument("--repeat", type=int, default=1, help="επανάληψη των ομιλιών για μεγαλύτερη είσοδο")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="διεργασίες για τη μέτρηση όλων των πυρήνων")
+    parser.add_argument("--output", default=None, help="αρχείο JSON (προεπιλογή: benchmarks/results/)")
+    args = parser.parse_args(argv)
+
+    speeches = load_df()["speech"].astype(object)
+    if args.rows is not None:
+        speeches = speeches.head(args.rows)
+    texts = pd.Series(list(speeches) * args.repeat, dtype=object)
+    n_bytes = sum(len(t.encode("utf-8")) for t in texts if isinstance(t, str))
+
+    paths = {
+        "apply (legacy regex)": (lambda s: s.apply(legacy_tokenize), 1),
+        "tokenize_many (1 core)": (tokenize_many, 1),
+        f"iter_tokenized ({args.workers} cores)": (lambda s: iter_tokenized(s, workers=args.workers), args.workers),
+    }
+    results = {"n_texts": len(texts), "mb": round(n_bytes / 1e6, 2), "workers": args.workers, "paths": {}}
+    for name, (fn, cores) in paths.items():
+        results["paths"][name] = measure(fn, texts, n_bytes, cores)
+
+    baseline = results["paths"]["apply (legacy regex)"]["seconds"]
+    print(f"{results['n_texts']} ομιλίες, {results['mb']} MB")
+    for name, result in results["paths"].items():
+        result["speedup"] = round(baseline / result["seconds"], 2)
+        print(
+            f"{name:<28} {result['seconds']:>8.3f}s {result['mb_per_s']:>8.2f} MB/s "
+            f"{result['mb_per_s_per_core']:>8.2f} MB/s/core  x{result['speedup']}"
+        )
+
+    print(write_results("text_cleaner", results, args.output))
+
+if __name__ == "__main__":
+    main()
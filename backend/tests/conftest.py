@@ -0,0 +1,56 @@
+"""
+Κοινές ρυθμίσεις των tests: συνθετικό corpus σε προσωρινό DATA_DIR.
+
+Το PARLIAMENT_DATA_DIR ορίζεται πριν από κάθε import του app, ώστε τα tests να μην αγγίζουν
+τα δεδομένα του backend/data. Τα tests εκτελούνται από τον φάκελο backend:
+    python -m pytest tests
+
+"""
+
+import os
+import shutil
+import tempfile
+
+DATA_DIR = tempfile.mkdtemp(prefix="parliament-tests-")
+os.environ["PARLIAMENT_DATA_DIR"] = DATA_DIR
+os.environ["PARLIAMENT_WARMUP"] = "0"
+
+import pytest
+
+from benchmarks.generate import CorpusGenerator
+from app.core.data_loader import DATASET_PATH
+
+# Ομιλίες του βασικού corpus και των παρτίδων που εισάγονται ως segments
+BASE_ROWS = 3000
+BATCH_ROWS = 200
+BATCHES = 3
+
+def corpus_rows(n_rows: int):
+    """
+    Συνθετικές ομιλίες με σταθερό σπόρο, χωρίς κενά πεδία (όλες οι γραμμές είναι έγκυρες).
+
+    """
+    rows = CorpusGenerator(n_rows, n_members=60, vocab_size=3000, n_topics=10, seed=11).chunk(0, n_rows)
+    rows = rows[(rows["speech"] != "") & (rows["member_name"] != "")]
+    return rows.reset_index(drop=True)
+
+@pytest.fixture(scope="session")
+def full_rows():
+    """
+    Όλες οι ομιλίες: οι BASE_ROWS πρώτες είναι το βασικό corpus και οι υπόλοιπες οι παρτίδες.
+
+    """
+    n_rows = BASE_ROWS + BATCH_ROWS * BATCHES
+    return corpus_rows(n_rows + 100)[:n_rows]
+
+@pytest.fixture(scope="session")
+def batches(full_rows):
+    return [full_rows[start:start + BATCH_ROWS] for start in range(BASE_ROWS, len(full_rows), BATCH_ROWS)]
+
+@pytest.fixture(scope="session", autouse=True)
+def dataset(full_rows):
+    full_rows[:BASE_ROWS].to_csv(DATASET_PATH, index=False)
+    return DATASET_PATH
+
+def pytest_unconfigure(config):
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
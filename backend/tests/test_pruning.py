@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from app.core.pruning import maxscore_top_k, rank_top_k
+from app.core.segments import get_live_corpus
+
+def random_queries(live, n: int, seed: int = 3):
+    """
+    Ερωτήματα 1-5 όρων από το λεξιλόγιο (και επαναλαμβανόμενους όρους, δηλαδή qtf > 1).
+
+    """
+    rng = np.random.default_rng(seed)
+    vocab = list(live.term_index)
+    queries = []
+    for _ in range(n):
+        terms = [vocab[i] for i in rng.choice(len(vocab), rng.integers(1, 6), replace=False)]
+        if rng.random() < 0.3:
+            terms.append(terms[0])
+        queries.append(terms)
+    return queries
+
+@pytest.mark.parametrize("k", [1, 5, 10, 50])
+def test_maxscore_matches_exhaustive(k):
+    live = get_live_corpus()
+    for terms in random_queries(live, 100, seed=k):
+        doc_ids, scores = live.bm25(terms)
+        top = rank_top_k(doc_ids, scores, k)
+        pruned_ids, pruned_scores, _ = live.top_k(terms, k)
+        np.testing.assert_array_equal(pruned_ids, doc_ids[top])
+        np.testing.assert_array_equal(pruned_scores, scores[top])
+
+def test_maxscore_with_allowed_and_excluded_docs():
+    live = get_live_corpus()
+    rng = np.random.default_rng(5)
+    allowed = np.sort(rng.choice(live.n_docs, live.n_docs // 3, replace=False))
+    excluded = np.sort(rng.choice(live.n_docs, live.n_docs // 10, replace=False))
+    for terms in random_queries(live, 100):
+        doc_ids, scores = live.bm25(terms)
+        keep = np.isin(doc_ids, allowed) & ~np.isin(doc_ids, excluded)
+        doc_ids, scores = doc_ids[keep], scores[keep]
+        top = rank_top_k(doc_ids, scores, 10)
+        pruned_ids, pruned_scores, _ = maxscore_top_k(live.term_scorers(terms), 10, live.n_docs, allowed, excluded)
+        np.testing.assert_array_equal(pruned_ids, doc_ids[top])
+        np.testing.assert_array_equal(pruned_scores, scores[top])
+
+def test_rank_top_k_breaks_ties_by_doc_id():
+    doc_ids = np.array([9, 3, 7, 1, 5])
+    scores = np.array([2.0, 1.0, 2.0, 1.0, 1.0], dtype=np.float32)
+    np.testing.assert_array_equal(doc_ids[rank_top_k(doc_ids, scores, 3)], [7, 9, 1])
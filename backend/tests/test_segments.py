@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.core.data_loader import DATASET_PATH, prepare_frame
+from app.core.inverted_index import build_index
+from app.core.positions import parse_query
+from app.core.pruning import rank_top_k
+from app.core.segments import SEGMENTS_DIR, get_live_corpus, ingest_batch, merge_segments, read_manifest
+from app.core.token_store import build_token_store
+
+QUERIES = ["κυβέρνηση νομοσχέδιο", "υγεία νοσοκομεία εκπαίδευση", "τουρκία", "φορολογία φορολογία μισθοί", "ενέργεια περιβάλλον"]
+
+def ranked(doc_ids, scores, speech_ids, k: int = 20):
+    top = rank_top_k(doc_ids, scores, k)
+    return speech_ids[doc_ids[top]], scores[top]
+
+@pytest.fixture(scope="module")
+def rebuilt(full_rows):
+    """
+    Τα top-k κάθε ερωτήματος από ευρετήριο που δημιουργείται από την αρχή για όλες τις ομιλίες.
+
+    """
+    rows = full_rows.astype("string")
+    frame = prepare_frame(rows)
+    index = build_index(build_token_store(frame, workers=1))
+    speech_ids = frame["speech_id"].to_numpy()
+    return {query: ranked(*index.bm25(parse_query(query).terms), speech_ids) for query in QUERIES}
+
+@pytest.fixture(scope="module")
+def ingested(batches):
+    """
+    Οι παρτίδες μετά το βασικό corpus, εισαγμένες ως segments.
+
+    """
+    for batch in batches:
+        result = ingest_batch(batch, workers=1)
+        assert result["n_docs"] == len(batch)
+    return read_manifest()
+
+def assert_matches_rebuild(rebuilt, exhaustive: bool):
+    live = get_live_corpus()
+    speech_ids = live.frame()["speech_id"].to_numpy()
+    for query, (expected_ids, expected_scores) in rebuilt.items():
+        terms = parse_query(query).terms
+        if exhaustive:
+            speech, scores = ranked(*live.bm25(terms), speech_ids)
+        else:
+            doc_ids, scores, _ = live.top_k(terms, 20)
+            speech = speech_ids[doc_ids]
+        np.testing.assert_array_equal(speech, expected_ids, err_msg=query)
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-6, err_msg=query)
+
+def test_ingest_matches_full_rebuild(ingested, rebuilt, full_rows, batches):
+    assert len(ingested["segments"]) == len(batches)
+    assert get_live_corpus().n_docs == len(full_rows)
+    assert_matches_rebuild(rebuilt, exhaustive=True)
+    assert_matches_rebuild(rebuilt, exhaustive=False)
+
+def test_merge_matches_full_rebuild(ingested, rebuilt):
+    result = merge_segments(read_manifest()["segments"])
+    assert result["merged"] == ingested["segments"]
+    manifest = read_manifest()
+    assert manifest["segments"] == [result["segment"]]
+    assert not any((SEGMENTS_DIR / name).exists() for name in ingested["segments"])
+    assert_matches_rebuild(rebuilt, exhaustive=True)
+    assert_matches_rebuild(rebuilt, exhaustive=False)
+
+def test_segments_survive_dataset_fingerprint_change(ingested, rebuilt, full_rows):
+    before = read_manifest()
+    stat = DATASET_PATH.stat()
+    os.utime(DATASET_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    live = get_live_corpus()
+    manifest = read_manifest()
+    assert live.n_docs == len(full_rows)
+    assert manifest["next_segment"] > before["next_segment"]
+    assert not set(manifest["segments"]) & set(before["segments"])
+    assert_matches_rebuild(rebuilt, exhaustive=True)